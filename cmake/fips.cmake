@@ -38,6 +38,9 @@ option(FIPS_AUTO_IMPORT "Automatically include all modules from imports" ON)
 option(FIPS_CLANG_ADDRESS_SANITIZER "Enable clang address sanitizer" OFF)
 option(FIPS_CLANG_SAVE_OPTIMIZATION_RECORD "Enable clang -fsave-optimization-record option" OFF)
 option(FIPS_DYNAMIC_CRT "Use dynamically linked CRT on Windows" ON)
+option(FIPS_UNITY_BUILD "Enable unity builds for all fips targets" OFF)
+option(FIPS_PCH "Enable precompiled headers defined with fips_pch()" ON)
+set(FIPS_UNITY_BUILD_BATCH_SIZE 8 CACHE STRING "Number of source files combined into one unity source")
 
 #-------------------------------------------------------------------------------
 #   fips_setup()
@@ -217,17 +220,23 @@ macro(fips_ide_group group)
 endmacro()
 
 #-------------------------------------------------------------------------------
-#   fips_begin_lib(name)
+#   fips_begin_lib(name [UNITY|NO_UNITY] [UNITY_BATCH_SIZE n])
 #
 #   Begin defining a static link library. fips_end_module() is a backward
 #   compatibility alias for fips_begin_lib()
 #
+#   The optional UNITY/NO_UNITY args override the global FIPS_UNITY_BUILD
+#   option for this target, UNITY_BATCH_SIZE overrides the global
+#   FIPS_UNITY_BUILD_BATCH_SIZE (the same args are accepted by
+#   fips_begin_app() and fips_begin_sharedlib()).
+#
 macro(fips_begin_lib target)
     if (FIPS_CMAKE_VERBOSE)
         message("lib: name=" ${target})
     endif()
     fips_reset(${target})
     add_library(${target})
+    fips_apply_target_unity_build(${target} ${ARGN})
     fips_apply_target_ide_group(${target})
     fips_msvc_add_target_properties(${target})
     fips_add_to_targets_list(${target} "lib")
@@ -242,9 +251,10 @@ macro(fips_end_lib)
 endmacro()
 
 #-------------------------------------------------------------------------------
-#   fips_begin_app(target type)
+#   fips_begin_app(target type [UNITY|NO_UNITY] [UNITY_BATCH_SIZE n])
 #   Start defining a new app.
 #   Type can be "windowed" or "cmdline", default is "cmdline".
+#   See fips_begin_lib() for the unity build args.
 #
 macro(fips_begin_app target type)
     if (FIPS_CMAKE_VERBOSE)
@@ -271,6 +281,7 @@ macro(fips_begin_app target type)
             endif()
             target_compile_definitions(${target} PRIVATE FIPS_APP_CMDLINE=1)
         endif()
+        fips_apply_target_unity_build(${target} ${ARGN})
         fips_apply_target_ide_group(${target})
         fips_config_output_directory(${target})
         fips_config_postfixes_for_exe(${target})
@@ -293,8 +304,9 @@ macro(fips_end_app)
 endmacro()
 
 #-------------------------------------------------------------------------------
-#   fips_begin_sharedlib(name)
+#   fips_begin_sharedlib(name [UNITY|NO_UNITY] [UNITY_BATCH_SIZE n])
 #   Begin a fips shared library.
+#   See fips_begin_lib() for the unity build args.
 #
 macro(fips_begin_sharedlib target)
     if (FIPS_CMAKE_VERBOSE)
@@ -302,6 +314,7 @@ macro(fips_begin_sharedlib target)
     endif()
     fips_reset(${target})
     add_library(${target} SHARED)
+    fips_apply_target_unity_build(${target} ${ARGN})
     fips_apply_target_ide_group(${target})
     fips_msvc_add_target_properties(${target})
     fips_config_output_directory(${target})
@@ -567,3 +580,54 @@ macro(fips_generate)
     fips_add_file("${_fg_FROM}")
     fips_add_generator(${CurTargetName} "${_fg_TYPE}" ${_fg_OUT_OF_SOURCE} "${_fg_FROM}" "${_fg_SOURCE}" "${_fg_HEADER}" "${_fg_ARGS}")
 endmacro()
+
+#-------------------------------------------------------------------------------
+#   fips_pch(header ...)
+#   fips_pch(REUSE_FROM target)
+#
+#   Precompile one or more headers for the current target, the headers
+#   are force-included into each source file of the target. Headers are
+#   relative to the current fips_dir(), or can be system headers
+#   in angle brackets (e.g. <vector>).
+#
+#   With REUSE_FROM, the current target uses the precompiled header
+#   of another target instead of building its own, for instance an app
+#   which shares the precompiled header of an imported module. Both
+#   targets must be compiled with the same compile options and defines.
+#
+#   This is a no-op if the FIPS_PCH option is OFF, and on the emscripten
+#   and wasisdk platforms.
+#
+macro(fips_pch)
+    set(options)
+    set(oneValueArgs REUSE_FROM)
+    set(multiValueArgs)
+    CMAKE_PARSE_ARGUMENTS(_fp "${options}" "${oneValueArgs}" "${multiValueArgs}" ${ARGN})
+    if (_fp_REUSE_FROM AND _fp_UNPARSED_ARGUMENTS)
+        message(FATAL_ERROR "fips_pch(): REUSE_FROM can't be combined with headers")
+    endif()
+    if (NOT _fp_REUSE_FROM AND NOT _fp_UNPARSED_ARGUMENTS)
+        message(FATAL_ERROR "fips_pch(): header or REUSE_FROM arg required")
+    endif()
+    if (FIPS_PCH AND NOT (FIPS_EMSCRIPTEN OR FIPS_WASISDK))
+        if (_fp_REUSE_FROM)
+            if (NOT TARGET ${_fp_REUSE_FROM})
+                message(FATAL_ERROR "fips_pch(): REUSE_FROM target '${_fp_REUSE_FROM}' must be defined before '${CurTargetName}'")
+            endif()
+            if (FIPS_CMAKE_VERBOSE)
+                message("  pch: reuse from " ${_fp_REUSE_FROM})
+            endif()
+            target_precompile_headers(${CurTargetName} REUSE_FROM ${_fp_REUSE_FROM})
+        else()
+            foreach (_fp_header ${_fp_UNPARSED_ARGUMENTS})
+                if (NOT "${_fp_header}" MATCHES "^<.*>$")
+                    get_filename_component(_fp_header "${CurDir}${_fp_header}" ABSOLUTE)
+                endif()
+                if (FIPS_CMAKE_VERBOSE)
+                    message("  pch: " ${_fp_header})
+                endif()
+                target_precompile_headers(${CurTargetName} PRIVATE ${_fp_header})
+            endforeach()
+        endif()
+    endif()
+endmacro()
@@ -20,27 +20,45 @@
 #   - the generator script must not overwrite the output files if they
 #     are already uptodate to prevent triggering dependent targets
 #
-#   During a cmake run, one .yml file and one cmake custom target
-#   will be generated per compile target which needs code generation,
-#   the custom target will call a generated python file .fips-gen.py
-#   in the project root (created during 'fips gen') which takes
-#   a generator.yml file as input and calls the listed generator, which
-#   in turn write the generated source file (after making sure that they
-#   are actually dirty). cmake will also setup a target dependency between
-#   the generator target and the actual compile target which depends on the
-#   generated source files.
+#   During a cmake run, one .yml file and one cmake custom command
+#   will be generated per compile target which needs code generation
+#   (the .yml file is written to fips_codegen/[target].yml in the build
+#   directory), the custom command will call a generated python file
+#   fips-gen.py in the build directory (created during 'fips gen') which
+#   takes the target's .yml file as input and calls the listed generators,
+#   which in turn write the generated source files (after making sure that
+#   they are actually dirty). The custom command depends on the input files,
+#   the generator scripts and the .yml file, and lists the generated files
+#   as byproducts, so that code generation only runs when one of its inputs
+#   has changed. Additional input files reported by the generators (e.g.
+#   included files) and the helper modules imported by the generator scripts
+#   are written to a depfile which is also checked by the custom command.
+#   A custom target [target]_GENERATE wraps the custom command and is added
+#   as dependency to the compile target. The ALL_GENERATE target depends on
+#   all [target]_GENERATE targets.
 #
 
 #-------------------------------------------------------------------------------
 #   fips_init_codegen(target)
 #
-#   Called in fips_setup() to clear the fips_codegen.yml file
+#   Called in fips_setup() to reset the code generation state
 #
 macro(fips_init_codegen)
-    file(REMOVE "${CMAKE_BINARY_DIR}/fips_codegen.yml")
     set(CurProjectHasCodeGen)
 endmacro()
 
+#-------------------------------------------------------------------------------
+#   fips_reset_target_codegen()
+#
+#   Called in fips_reset() to clear the code generation items of the
+#   current target.
+#
+macro(fips_reset_target_codegen)
+    set(CurTargetCodeGen)
+    set(CurTargetCodeGenInputs)
+    set(CurTargetCodeGenOutputs)
+endmacro()
+
 #-------------------------------------------------------------------------------
 #   fips_add_generator()
 #   Add a code generator item to the current target.
@@ -54,7 +72,16 @@ macro(fips_add_generator target in_generator in_outofsource in_file out_src out_
     else()
         # add .py extension to generator type
         set(generator "${in_generator}.py")
+        # the generator script is located at build time, depend on all
+        # scripts with that name in fips-gen.py's search paths (the project
+        # dir, and the generator dirs of fips, the project and the imports)
+        foreach (gen_dir ${FIPS_GENERATOR_DIRS})
+            if (EXISTS "${gen_dir}/${generator}")
+                list(APPEND CurTargetCodeGenInputs "${gen_dir}/${generator}")
+            endif()
+        endforeach()
     endif()
+    list(APPEND CurTargetCodeGenInputs ${f_abs})
     set(yml_content "- generator: ${generator}\n  in: '${f_abs}'\n")
     if ("${out_src}" STREQUAL "")
         set(yml_content "${yml_content}  out_src: null\n")
@@ -65,8 +92,11 @@ macro(fips_add_generator target in_generator in_outofsource in_file out_src out_
             set(out_src_abs "${f_dir}/${out_src}")
         endif()
         target_sources(${CurTargetName} PRIVATE ${out_src_abs})
+        # generated sources are never merged into unity sources
+        set_source_files_properties(${out_src_abs} PROPERTIES SKIP_UNITY_BUILD_INCLUSION ON)
         source_group("${CurGroup}\\gen" FILES ${out_src_abs})
         set(yml_content "${yml_content}  out_src: '${out_src_abs}'\n")
+        list(APPEND CurTargetCodeGenOutputs ${out_src_abs})
         if (NOT EXISTS ${out_src_abs})
             file(WRITE ${out_src_abs} " ")
         endif()
@@ -82,6 +112,7 @@ macro(fips_add_generator target in_generator in_outofsource in_file out_src out_
         target_sources(${CurTargetName} PRIVATE ${out_hdr_abs})
         source_group("${CurGroup}\\gen" FILES ${out_hdr_abs})
         set(yml_content "${yml_content}  out_hdr: '${out_hdr_abs}'\n")
+        list(APPEND CurTargetCodeGenOutputs ${out_hdr_abs})
         if (NOT EXISTS ${out_hdr_abs})
             file(WRITE ${out_hdr_abs} " ")
         endif()
@@ -94,7 +125,7 @@ macro(fips_add_generator target in_generator in_outofsource in_file out_src out_
     set(yml_content "${yml_content}  env:\n")
     set(yml_content "${yml_content}    target_platform: '${FIPS_PLATFORM_NAME}'\n")
 
-    file(APPEND "${CMAKE_BINARY_DIR}/fips_codegen.yml" "${yml_content}")
+    set(CurTargetCodeGen "${CurTargetCodeGen}${yml_content}")
 
     # if generated out-of-source, add the current build dir to
     # the header search path, only for the current directory
@@ -105,20 +136,40 @@ macro(fips_add_generator target in_generator in_outofsource in_file out_src out_
 endmacro()
 
 #-------------------------------------------------------------------------------
-#   fips_handle_py_files_posttarget(target pyFiles)
-#   Create custom target for .py generator files.
+#   fips_handle_generators(target)
+#   Create the code generation custom command and target for the
+#   current target.
 #
 macro(fips_handle_generators target)
-    if (CurProjectHasCodeGen)
+    if (CurTargetCodeGen)
+        set(gen_yml "${CMAKE_BINARY_DIR}/fips_codegen/${target}.yml")
+        set(gen_stamp "${CMAKE_BINARY_DIR}/fips_codegen/${target}.stamp")
+        set(gen_depfile "${CMAKE_BINARY_DIR}/fips_codegen/${target}.d")
+        # only replace the .yml file if changed, otherwise each cmake
+        # run would trigger code generation
+        file(WRITE "${gen_yml}.tmp" "${CurTargetCodeGen}")
+        file(COPY_FILE "${gen_yml}.tmp" "${gen_yml}" ONLY_IF_DIFFERENT)
+        file(REMOVE "${gen_yml}.tmp")
+        list(REMOVE_DUPLICATES CurTargetCodeGenInputs)
+        add_custom_command(OUTPUT ${gen_stamp}
+            BYPRODUCTS ${CurTargetCodeGenOutputs}
+            COMMAND ${PYTHON} ${CMAKE_BINARY_DIR}/fips-gen.py ${gen_yml}
+            COMMAND ${CMAKE_COMMAND} -E touch ${gen_stamp}
+            DEPENDS ${CurTargetCodeGenInputs} ${gen_yml} ${CMAKE_BINARY_DIR}/fips-gen.py
+            DEPFILE ${gen_depfile}
+            WORKING_DIRECTORY ${FIPS_PROJECT_DIR}
+            COMMENT "Generating sources for ${target}"
+            VERBATIM)
+        add_custom_target(${target}_GENERATE DEPENDS ${gen_stamp})
+        fips_apply_target_ide_group(${target}_GENERATE)
+        if (CurTargetDependencies)
+            add_dependencies(${target}_GENERATE ${CurTargetDependencies})
+        endif()
+        add_dependencies(${target} ${target}_GENERATE)
         if (NOT TARGET ALL_GENERATE)
-            add_custom_target(ALL_GENERATE
-                COMMAND ${PYTHON} ${CMAKE_BINARY_DIR}/fips-gen.py ${CMAKE_BINARY_DIR}/fips_codegen.yml
-                WORKING_DIRECTORY ${FIPS_PROJECT_DIR})
-             if (CurTargetDependencies)
-                add_dependencies(ALL_GENERATE ${CurTargetDependencies})
-            endif()
+            add_custom_target(ALL_GENERATE)
         endif()
-        add_dependencies(${target} ALL_GENERATE)
+        add_dependencies(ALL_GENERATE ${target}_GENERATE)
     endif()
     if (CurTargetDependencies)
         add_dependencies(${target} ${CurTargetDependencies})
@@ -12,6 +12,7 @@ macro(fips_reset target)
     set(CurGroup "")
     set(CurTargetName ${target})
     set(FIPS_OSX_PLIST_PATH)
+    fips_reset_target_codegen()
 endmacro()
 
 #-------------------------------------------------------------------------------
@@ -24,6 +25,42 @@ macro(fips_apply_target_ide_group target)
     endif()
 endmacro()
 
+#-------------------------------------------------------------------------------
+#   fips_apply_target_unity_build(target [UNITY|NO_UNITY] [UNITY_BATCH_SIZE n])
+#   Enable or disable unity builds for a target, the defaults come from
+#   the FIPS_UNITY_BUILD and FIPS_UNITY_BUILD_BATCH_SIZE options.
+#
+function(fips_apply_target_unity_build target)
+    set(options UNITY NO_UNITY)
+    set(oneValueArgs UNITY_BATCH_SIZE)
+    set(multiValueArgs)
+    CMAKE_PARSE_ARGUMENTS(_fu "${options}" "${oneValueArgs}" "${multiValueArgs}" ${ARGN})
+    if (_fu_UNPARSED_ARGUMENTS)
+        message(WARNING "${target}: ignoring unknown target args '${_fu_UNPARSED_ARGUMENTS}'")
+    endif()
+    if (_fu_UNITY AND _fu_NO_UNITY)
+        message(FATAL_ERROR "${target}: UNITY and NO_UNITY are mutually exclusive")
+    endif()
+    set(unity ${FIPS_UNITY_BUILD})
+    if (_fu_UNITY)
+        set(unity ON)
+    elseif (_fu_NO_UNITY)
+        set(unity OFF)
+    endif()
+    set(batch_size ${FIPS_UNITY_BUILD_BATCH_SIZE})
+    if (_fu_UNITY_BATCH_SIZE)
+        set(batch_size ${_fu_UNITY_BATCH_SIZE})
+    endif()
+    if (unity)
+        if (FIPS_CMAKE_VERBOSE)
+            message("  unity build: batch size=" ${batch_size})
+        endif()
+        set_target_properties(${target} PROPERTIES UNITY_BUILD ON UNITY_BUILD_BATCH_SIZE ${batch_size})
+    else()
+        set_target_properties(${target} PROPERTIES UNITY_BUILD OFF)
+    endif()
+endfunction()
+
 #-------------------------------------------------------------------------------
 #   fips_setup_link_directories()
 #   Setup the link library search paths.
@@ -161,6 +198,11 @@ macro(fips_add_file new_file)
         endif()
     endif()
 
+    # Objective-C files are never merged into unity sources
+    if (("${f_ext}" MATCHES "\\.m$") OR ("${f_ext}" MATCHES "\\.mm$"))
+        set_source_files_properties(${cur_file} PROPERTIES SKIP_UNITY_BUILD_INCLUSION ON)
+    endif()
+
     # add to target sources
     target_sources(${CurTargetName} PRIVATE ${cur_file})
 endmacro()
@@ -1,12 +1,30 @@
 """Common utilities for generator scripts"""
 import sys
 import os
+import json
+import hashlib
 import platform
 
 FilePath = ''
 LineNumber = 0
 Env = {}
 
+# the generator state database maps each output file to the content
+# hashes of its inputs, the generator script, the generator args and the
+# generator version, it is only used when opened by fips-gen.py
+StateVersion = 1
+StateDb = None
+StateDbPath = None
+StateDbDirty = False
+# generator script hash and args of the current item (see beginItem())
+CurItem = None
+# input states of dirty outputs, committed after generation (see endItem())
+PendingState = {}
+# entries changed since beginItem(), returned by endItem()
+ChangedState = {}
+# additional input files reported by the generator of the current item
+Dependencies = []
+
 #-------------------------------------------------------------------------------
 def error(msg) :
     '''
@@ -66,6 +84,226 @@ def fileVersionDirty(filePath, version) :
     # fallthrough: no version or version doesn't match
     return True
 
+#-------------------------------------------------------------------------------
+def fileHash(filePath) :
+    '''
+    Return the SHA1 hex digest of a file's content.
+    '''
+    h = hashlib.sha1()
+    with open(filePath, 'rb') as f :
+        for chunk in iter(lambda: f.read(1 << 16), b'') :
+            h.update(chunk)
+    return h.hexdigest()
+
+#-------------------------------------------------------------------------------
+def fileState(filePath, oldState=None) :
+    '''
+    Return the state [mtime, size, hash] of a file. If the mtime and size
+    are the same as in oldState, the file isn't hashed again.
+    '''
+    st = os.stat(filePath)
+    if oldState and oldState[0] == st.st_mtime_ns and oldState[1] == st.st_size :
+        return oldState
+    return [st.st_mtime_ns, st.st_size, fileHash(filePath)]
+
+#-------------------------------------------------------------------------------
+def openStateDb(dbPath) :
+    '''
+    Load the generator state database (called by fips-gen.py), after
+    this isDirty() compares content hashes instead of time stamps.
+    '''
+    global StateDb, StateDbPath, StateDbDirty
+    StateDb = {}
+    StateDbPath = dbPath
+    StateDbDirty = False
+    if os.path.isfile(dbPath) :
+        try :
+            with open(dbPath, 'r') as f :
+                dic = json.load(f)
+            if dic.get('version') == StateVersion :
+                StateDb = dic['outputs']
+        except (OSError, ValueError, KeyError) :
+            pass
+
+#-------------------------------------------------------------------------------
+def saveStateDb() :
+    '''
+    Write the generator state database if it has changed.
+    '''
+    global StateDbDirty
+    if StateDb is not None and StateDbDirty :
+        tmpPath = '{}.{}.tmp'.format(StateDbPath, os.getpid())
+        with open(tmpPath, 'w') as f :
+            json.dump({ 'version': StateVersion, 'outputs': StateDb }, f, indent=1, sort_keys=True)
+        os.replace(tmpPath, StateDbPath)
+        StateDbDirty = False
+
+#-------------------------------------------------------------------------------
+def updateStateDb(entries) :
+    '''
+    Merge state entries (as returned by endItem()) into the database.
+    '''
+    global StateDbDirty
+    if StateDb is not None and entries :
+        StateDb.update(entries)
+        ChangedState.update(entries)
+        StateDbDirty = True
+
+#-------------------------------------------------------------------------------
+def addDependency(filePath) :
+    '''
+    Report an additional input file (e.g. an included file) of the
+    current generator item. Changing this file will run the generator
+    again, even if the main input file didn't change.
+    '''
+    path = os.path.abspath(filePath)
+    if path not in Dependencies :
+        Dependencies.append(path)
+
+#-------------------------------------------------------------------------------
+def addDependencies(filePaths) :
+    '''
+    Report a list of additional input files, see addDependency().
+    '''
+    for filePath in filePaths :
+        addDependency(filePath)
+
+#-------------------------------------------------------------------------------
+def getDependencies(outputs) :
+    '''
+    Return the recorded additional input files of a list of outputs.
+    '''
+    deps = set()
+    for output in outputs :
+        entry = (StateDb or {}).get(output)
+        if entry :
+            deps.update(entry.get('deps', {}).keys())
+    return sorted(deps)
+
+#-------------------------------------------------------------------------------
+def writeDepfile(depfilePath, target, deps) :
+    '''
+    Write a Make/Ninja compatible depfile.
+    '''
+    def escape(path) :
+        return path.replace('\\', '/').replace(' ', '\\ ').replace('#', '\\#').replace('$', '$$')
+    with open(depfilePath, 'w') as f :
+        f.write('{}:'.format(escape(target)))
+        for dep in deps :
+            f.write(' \\\n  {}'.format(escape(dep)))
+        f.write('\n')
+
+#-------------------------------------------------------------------------------
+def beginItem(generatorPath, args, outputs) :
+    '''
+    Called by fips-gen.py before a generator runs for one item.
+    '''
+    global CurItem, PendingState, ChangedState, Dependencies
+    CurItem = {
+        'generator': fileHash(generatorPath),
+        'args': json.dumps(args, sort_keys=True, default=str),
+        'outputs': outputs
+    }
+    PendingState = {}
+    ChangedState = {}
+    Dependencies = []
+
+#-------------------------------------------------------------------------------
+def endItem() :
+    '''
+    Called by fips-gen.py after a generator has run successfully, records
+    the state of all outputs which were reported dirty by isDirty(), and
+    the additional input files reported with addDependency().
+
+    :returns:   dictionary with all state database entries changed by this item
+    '''
+    global CurItem, PendingState, ChangedState, Dependencies
+    deps = { dep: fileState(dep) for dep in Dependencies if os.path.isfile(dep) }
+    entries = {}
+    for output, entry in PendingState.items() :
+        if os.path.exists(output) :
+            entry['output'] = fileState(output)
+            entry['deps'] = deps
+            entries[output] = entry
+    if deps :
+        # generators which don't call isDirty() only record their dependencies
+        for output in CurItem['outputs'] :
+            if output not in entries and os.path.exists(output) :
+                entry = dict(StateDb.get(output, {}))
+                entry['deps'] = deps
+                entries[output] = entry
+    updateStateDb(entries)
+    changed = ChangedState
+    CurItem = None
+    PendingState = {}
+    ChangedState = {}
+    Dependencies = []
+    return changed
+
+#-------------------------------------------------------------------------------
+def makeStateEntry(version, inputs, outputState=None, deps=None) :
+    '''
+    Create a state database entry for the current item.
+    '''
+    return {
+        'version': version,
+        'generator': CurItem['generator'],
+        'args': CurItem['args'],
+        'inputs': { input: fileState(input) for input in inputs },
+        'output': outputState,
+        'deps': deps or {}
+    }
+
+#-------------------------------------------------------------------------------
+def areDepsClean(entry, output) :
+    '''
+    Check the additional input files recorded in a state database entry.
+    '''
+    deps = entry.get('deps', {})
+    for dep in deps :
+        if not os.path.isfile(dep) :
+            return False
+        oldState = deps[dep]
+        newState = fileState(dep, oldState)
+        if newState[2] != oldState[2] :
+            return False
+        if newState is not oldState :
+            deps[dep] = newState
+            updateStateDb({ output: entry })
+    return True
+
+#-------------------------------------------------------------------------------
+def isStateClean(entry, version, inputs, output) :
+    '''
+    Check a state database entry against the current version, generator,
+    args, inputs and output content. Time stamps are only used to
+    avoid hashing files which haven't been touched.
+    '''
+    if entry['version'] != version :
+        return False
+    if entry['generator'] != CurItem['generator'] or entry['args'] != CurItem['args'] :
+        return False
+    if sorted(entry['inputs'].keys()) != sorted(inputs) :
+        return False
+    for input in inputs :
+        oldState = entry['inputs'][input]
+        newState = fileState(input, oldState)
+        if newState[2] != oldState[2] :
+            return False
+        if newState is not oldState :
+            # same content, but touched (e.g. by a git checkout)
+            entry['inputs'][input] = newState
+            updateStateDb({ output: entry })
+    if not areDepsClean(entry, output) :
+        return False
+    newState = fileState(output, entry['output'])
+    if newState[2] != entry['output'][2] :
+        return False
+    if newState is not entry['output'] :
+        entry['output'] = newState
+        updateStateDb({ output: entry })
+    return True
+
 #-------------------------------------------------------------------------------
 def isDirty(version, inputs, outputs) :
     '''
@@ -73,11 +311,47 @@ def isDirty(version, inputs, outputs) :
     and time stamps of a number of source files, and generated
     source and header files.
 
+    When called from fips-gen.py, the content hashes in the generator
+    state database are checked instead, so that touching files without
+    changing them doesn't trigger code generation. This includes the
+    additional input files reported by the last run of the generator
+    (see addDependency()). Outputs without a database entry fall back to
+    the time stamp check.
+
     :param version:     generator version number, or None
     :param input:       a list of absolute input file paths
     :param outputs:     a list of absolute output file paths
     :returns:           True if at least one output file is 'dirty'
     '''
+    if StateDb is None or CurItem is None :
+        return isDirtyByTime(version, inputs, outputs)
+    dirty = False
+    for output in outputs :
+        entry = StateDb.get(output)
+        if not os.path.exists(output) :
+            dirty = True
+        elif entry and entry.get('output') :
+            if not isStateClean(entry, version, inputs, output) :
+                dirty = True
+        elif isDirtyByTime(version, inputs, [output]) :
+            dirty = True
+        elif entry and not areDepsClean(entry, output) :
+            dirty = True
+        else :
+            # no entry yet but uptodate, adopt the current state
+            deps = entry.get('deps', {}) if entry else {}
+            updateStateDb({ output: makeStateEntry(version, inputs, fileState(output), deps) })
+    if dirty :
+        # the new state is committed in endItem() after generation succeeded
+        for output in outputs :
+            PendingState[output] = makeStateEntry(version, inputs)
+    return dirty
+
+#-------------------------------------------------------------------------------
+def isDirtyByTime(version, inputs, outputs) :
+    '''
+    The time stamp based dirty check (used without state database).
+    '''
     for output in outputs :
         if not os.path.exists(output):
             return True
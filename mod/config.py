@@ -4,7 +4,7 @@ import os.path
 import glob
 import yaml
 from collections import OrderedDict
-from mod import log, util, dep
+from mod import log, util, dep, toolcache
 from mod.tools import cmake, make, ninja, vscode, clion
 from mod import emsdk, android
 
@@ -171,7 +171,7 @@ def load(fips_dir, proj_dir, pattern) :
         for path in paths :
             try :
                 with open(path, 'r') as f :
-                    cfg = yaml.load(f)
+                    cfg = yaml.load(f, Loader=yaml.SafeFastLoader)
                 folder, fname = os.path.split(path)
 
                 # patch path, folder, and name
@@ -186,6 +186,12 @@ def load(fips_dir, proj_dir, pattern) :
                     cfg['generator-toolset'] = None
                 if 'defines' not in cfg :
                     cfg['defines'] = None
+                if 'compiler-cache' not in cfg :
+                    cfg['compiler-cache'] = None
+                if 'unity-build' not in cfg :
+                    cfg['unity-build'] = None
+                if 'unity-batch-size' not in cfg :
+                    cfg['unity-batch-size'] = None
 
                 # don't append multiple configs with the same name
                 for c in configs:
@@ -202,21 +208,21 @@ def missing_build_tools(fips_dir, tool_name) :
     """check if a build tool is installed"""
     missing = []
     if tool_name == 'cmake' :
-        if not cmake.check_exists(fips_dir):
+        if not toolcache.check_exists(fips_dir, cmake):
             missing.append(cmake.name)
     elif tool_name == 'make' :
-        if not make.check_exists(fips_dir):
+        if not toolcache.check_exists(fips_dir, make):
             missing.append(make.name)
     elif tool_name == 'ninja' :
-        if not ninja.check_exists(fips_dir):
+        if not toolcache.check_exists(fips_dir, ninja):
             missing.append(ninja.name)
     elif tool_name == 'vscode' :
-        if not vscode.check_exists(fips_dir):
+        if not toolcache.check_exists(fips_dir, vscode):
             missing.append(vscode.name)
-        if not ninja.check_exists(fips_dir):
+        if not toolcache.check_exists(fips_dir, ninja):
             missing.append(ninja.name)
     elif tool_name == 'clion' :
-        if not clion.check_exists(fips_dir):
+        if not toolcache.check_exists(fips_dir, clion):
             missing.append(clion.name)
     return missing
 
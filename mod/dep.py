@@ -1,12 +1,27 @@
 """functions for external dependencies"""
 
 import os
+import copy
+import json
+import time
 import filecmp
+import shutil
+import hashlib
+import threading
+import subprocess
 
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from mod import log, util, registry, template
 from mod.tools import git
 
+# version of the import graph cache file format
+imports_cache_version = 2
+# in-memory copies of import graph caches, (fips_dir, proj_dir): cache
+imports_cache_memo = {}
+imports_cache_stats = { 'hits': 0, 'misses': 0, 'memo': 0 }
+imports_cache_lock = threading.RLock()
+
 #-------------------------------------------------------------------------------
 def get_imports(fips_dir, proj_dir) :
     """get the imports from the fips.yml file in proj_dir
@@ -141,80 +156,337 @@ def _rec_get_all_imports_exports(fips_dir, proj_dir, result) :
     # done
     return success, result
 
+#-------------------------------------------------------------------------------
+def get_imports_cache_path(fips_dir, proj_dir) :
+    """get the path of the import graph cache file of a project, this
+    lives in the project's build root directory
+
+    :param fips_dir:    absolute fips directory
+    :param proj_dir:    absolute project directory
+    :returns:           absolute path of the cache file
+    """
+    proj_name = util.get_project_name_from_dir(proj_dir)
+    return '{}/{}/fips-imports-cache.json'.format(util.get_build_root_dir(fips_dir, proj_name), proj_name)
+
+#-------------------------------------------------------------------------------
+def _get_file_fingerprint(path, with_hash=True) :
+    """get the fingerprint of a file which contributes to the import
+    graph, a missing file is a valid fingerprint too
+
+    :param path:        absolute path to file
+    :param with_hash:   if True, also compute the sha1 of the content
+    :returns:           dictionary with exists, mtime, size and hash
+    """
+    if not os.path.isfile(path) :
+        return { 'exists': False }
+    stat = os.stat(path)
+    fp = { 'exists': True, 'mtime': stat.st_mtime_ns, 'size': stat.st_size }
+    if with_hash :
+        with open(path, 'rb') as f :
+            fp['hash'] = hashlib.sha1(f.read()).hexdigest()
+    return fp
+
+#-------------------------------------------------------------------------------
+def _check_fingerprints(files) :
+    """check if the files which contributed to a cached import graph are
+    unchanged, mtime and size are checked first, and only if the mtime
+    has changed, the content hash is compared (the mtime of matching
+    entries is updated in place)
+
+    :param files:   dictionary with path: fingerprint
+    :returns:       True if no file has changed
+    """
+    for path, fp in files.items() :
+        cur = _get_file_fingerprint(path, False)
+        if cur['exists'] != fp['exists'] :
+            return False
+        if cur['exists'] :
+            if cur['size'] != fp['size'] :
+                return False
+            if cur['mtime'] != fp['mtime'] :
+                if _get_file_fingerprint(path)['hash'] != fp['hash'] :
+                    return False
+                fp['mtime'] = cur['mtime']
+    return True
+
+#-------------------------------------------------------------------------------
+def load_imports_cache(path) :
+    """load the import graph cache file, returns None if the file doesn't
+    exist or is not readable
+    """
+    if os.path.isfile(path) :
+        try :
+            with open(path, 'r') as f :
+                cache = json.load(f)
+            if cache.get('version') == imports_cache_version :
+                return cache
+        except (OSError, ValueError) :
+            pass
+    return None
+
+#-------------------------------------------------------------------------------
+def is_imports_cache_valid(fips_dir, proj_dir, cache) :
+    """check if a loaded import graph cache belongs to a project and
+    none of the fips.yml files which contributed to it have changed
+
+    :param fips_dir:    absolute fips directory
+    :param proj_dir:    absolute project directory
+    :param cache:       cache dictionary from load_imports_cache()
+    :returns:           True if the cached import graph can be used
+    """
+    if cache['fips_dir'] != fips_dir or cache['proj_dir'] != proj_dir :
+        return False
+    return _check_fingerprints(cache['files'])
+
+#-------------------------------------------------------------------------------
+def _save_imports_cache(path, cache) :
+    """write the import graph cache file, the cache is only written
+    if the project's build directory already exists (so that commands
+    like 'fips fetch' don't create it), failing to write the cache
+    is not an error
+    """
+    if not os.path.isdir(os.path.dirname(path)) :
+        return
+    try :
+        tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+        with open(tmp_path, 'w') as f :
+            json.dump(cache, f, indent=1)
+        os.replace(tmp_path, path)
+    except OSError :
+        pass
+
+#-------------------------------------------------------------------------------
+def get_imports_cache_stats() :
+    """get the import graph cache counters of this process, the
+    counters are not stored in the cache file
+
+    :returns:   dictionary with 'hits' (graph loaded from cache file),
+                'misses' (graph resolved from fips.yml files) and 'memo'
+                (graph reused from memory)
+    """
+    with imports_cache_lock :
+        return dict(imports_cache_stats)
+
 #-------------------------------------------------------------------------------
 def get_all_imports_exports(fips_dir, proj_dir) :
     """recursively get all imports/exports of a project, fails if any
     dependencies haven't been fetched yet, see _rec_get_imports_exports()
     for result dictionary structure
 
+    For valid projects, the result is cached in a file in the build root
+    (see get_imports_cache_path()) together with a fingerprint of all
+    fips.yml files which contributed to it, and only resolved again
+    if any of those files has changed.
+
     :param fips_dir:    absolute fips directory
     :param proj_dir:    absolute project directory
     :returns:           succes, and result dictionary object
     """
-    result = OrderedDict()
-    return _rec_get_all_imports_exports(fips_dir, proj_dir, result)
+    if not util.is_valid_project_dir(proj_dir) :
+        return _rec_get_all_imports_exports(fips_dir, proj_dir, OrderedDict())
+
+    with imports_cache_lock :
+        # first check the in-memory copy, then the cache file
+        key = (fips_dir, proj_dir)
+        cache = imports_cache_memo.get(key)
+        if cache :
+            if _check_fingerprints(cache['files']) :
+                imports_cache_stats['memo'] += 1
+                return True, OrderedDict(copy.deepcopy(cache['result']))
+        path = get_imports_cache_path(fips_dir, proj_dir)
+        cache = load_imports_cache(path)
+        if cache and is_imports_cache_valid(fips_dir, proj_dir, cache) :
+            imports_cache_stats['hits'] += 1
+            imports_cache_memo[key] = cache
+            return True, OrderedDict(copy.deepcopy(cache['result']))
+
+        # cache miss, resolve the graph from the fips.yml files
+        imports_cache_stats['misses'] += 1
+        success, result = _rec_get_all_imports_exports(fips_dir, proj_dir, OrderedDict())
+        if success :
+            # fingerprint the fips.yml files of all visited projects, this
+            # includes imports which haven't been fetched yet
+            files = OrderedDict()
+            for proj_name in result :
+                yml_path = result[proj_name]['proj_dir'] + '/fips.yml'
+                files[yml_path] = _get_file_fingerprint(yml_path)
+            cache = {
+                'version': imports_cache_version,
+                'fips_dir': fips_dir,
+                'proj_dir': proj_dir,
+                'files': files,
+                'result': list(result.items())
+            }
+            # only cache results which survive a JSON round trip unchanged
+            try :
+                if json.loads(json.dumps(cache['result'])) == [list(item) for item in cache['result']] :
+                    cache = json.loads(json.dumps(cache))
+                    _save_imports_cache(path, cache)
+                    imports_cache_memo[key] = cache
+            except (TypeError, ValueError) :
+                pass
+        return success, result
 
 #-------------------------------------------------------------------------------
-def _rec_fetch_imports(fips_dir, proj_dir, handled) :
-    """internal recursive function to fetch project imports,
-    keeps an array of already handled dirs to break cyclic dependencies
+def get_num_jobs(proj_dir) :
+    """get the default number of parallel git jobs for fetching or
+    updating the imports of a project (the 'jobs' setting)
 
-    :param proj_dir:    current project directory
-    :param handled:     array of already handled dirs
-    :returns:           updated array of handled dirs
+    :param proj_dir:    absolute project directory
+    :returns:           number of parallel jobs
     """
-    ws_dir = util.get_workspace_dir(fips_dir)
-    proj_name = util.get_project_name_from_dir(proj_dir)
-    if proj_name not in handled :
-        handled.append(proj_name)
+    if util.is_valid_project_dir(proj_dir) :
+        from mod import settings
+        return settings.get(proj_dir, 'jobs')
+    else :
+        return util.get_num_cpucores()
 
-        imports = get_imports(fips_dir, proj_dir)
-        for dep in imports:
-            dep_proj_name = dep
-            if dep not in handled:
-                dep_proj_dir = util.get_project_dir(fips_dir, dep_proj_name)
-                log.colored(log.YELLOW, "=== dependency: '{}':".format(dep_proj_name))
-                dep_ok = False
-                if not os.path.isdir(dep_proj_dir) :
-                    # directory did not exist, do a fresh git clone
-                    dep = imports[dep_proj_name]
-                    git_commit = None if 'rev' not in dep else dep['rev']
-                    if git_commit :
-                        if 'depth' in dep :
-                            # when using rev, we may not want depth because the revision may not be reachable
-                            log.colored(log.YELLOW, "=== 'depth' was ignored because parameter 'rev' is specified.")
-                        dep['depth'] = None
-                    git_depth = git.clone_depth if not git_commit and 'depth' not in dep else dep['depth']
-                    git_url = dep['git']
-                    git_branch = dep['branch']
-                    if git.clone(git_url, git_branch, git_depth, dep_proj_name, ws_dir) :
-                        if git_commit :
-                            log.colored(log.YELLOW, "=== revision: '{}':".format(git_commit))
-                            dep_ok = git.checkout(dep_proj_dir, git_commit)
-                        else :
-                            dep_ok = True
-                    else :
-                        log.error('failed to git clone {} into {}'.format(git_url, dep_proj_dir))
-                else :
-                    # directory already exists
-                    log.info("dir '{}' exists".format(dep_proj_dir))
-                    dep_ok = True
+#-------------------------------------------------------------------------------
+def _get_import_key(dep) :
+    """get the parts of an import definition which decide how the
+    import is cloned, checked out or updated
 
-                # recurse
-                if dep_ok :
-                    handled = _rec_fetch_imports(fips_dir, dep_proj_dir, handled)
+    :param dep:     import definition from a fips.yml file
+    :returns:       tuple of git url, branch, rev and depth
+    """
+    return (dep['git'], dep['branch'], dep.get('rev'), dep.get('depth'))
 
-    # done, return the new handled array
-    return handled
+#-------------------------------------------------------------------------------
+def _walk_imports(fips_dir, proj_dir, num_jobs, handle_import) :
+    """internal function which walks the import graph of a project, and
+    calls handle_import() for the imports in a thread pool. The walk only
+    descends into imports for which handle_import() returned True.
+
+    As with a sequential depth-first walk, the first definition of an
+    import in depth-first order wins. The graph is walked in rounds:
+    each round walks the already handled part of the graph depth-first,
+    and handles all newly found imports in parallel. If a later round
+    finds a different definition of an already handled import earlier
+    in depth-first order (inside an import which wasn't known before),
+    handle_import() is called again with that definition.
+
+    :param proj_dir:        the top-level project directory
+    :param num_jobs:        max number of parallel handle_import() calls
+    :param handle_import:   function(dep_proj_name, dep) => True to descend
+    :returns:               names of all imports in depth-first order
+    """
+    proj_name = util.get_project_name_from_dir(proj_dir)
+    # dep_proj_name: (import key, result of handle_import())
+    handled = {}
+
+    def walk(cur_proj_dir, order, pending) :
+        imports = get_imports(fips_dir, cur_proj_dir)
+        for dep_proj_name in imports :
+            if dep_proj_name != proj_name and dep_proj_name not in order :
+                dep = imports[dep_proj_name]
+                order.append(dep_proj_name)
+                entry = handled.get(dep_proj_name)
+                if entry and entry[0] == _get_import_key(dep) :
+                    if entry[1] :
+                        walk(util.get_project_dir(fips_dir, dep_proj_name), order, pending)
+                else :
+                    pending[dep_proj_name] = dep
+
+    with ThreadPoolExecutor(max_workers=max(1, num_jobs)) as pool :
+        while True :
+            order = []
+            pending = OrderedDict()
+            walk(proj_dir, order, pending)
+            if not pending :
+                return order
+            futures = [(dep_proj_name, _get_import_key(dep), pool.submit(handle_import, dep_proj_name, dep))
+                for dep_proj_name, dep in pending.items()]
+            for dep_proj_name, key, future in futures :
+                handled[dep_proj_name] = (key, future.result())
 
 #-------------------------------------------------------------------------------
-def fetch_imports(fips_dir, proj_dir) :
+def fetch_imports(fips_dir, proj_dir, num_jobs=None) :
     """recursively git-clone the imports of a project, NOTE: existing
     repos will never be updated
 
     :param proj_dir:    existing project directory
+    :param num_jobs:    number of parallel git clones (default: 'jobs' setting)
     """
-    _rec_fetch_imports(fips_dir, proj_dir, [])
+    # check for git here, the workers must not exit the process
+    git.check_exists_with_error()
+    ws_dir = util.get_workspace_dir(fips_dir)
+    if num_jobs is None :
+        num_jobs = get_num_jobs(proj_dir)
+    # with parallel clones, git output is suppressed and each
+    # dependency prints its status as one block when done
+    quiet = num_jobs > 1
+    # imports cloned by this call
+    cloned = set()
+    # dep_proj_name: error message
+    failed = OrderedDict()
+
+    def fetch_import(dep_proj_name, dep) :
+        dep_proj_dir = util.get_project_dir(fips_dir, dep_proj_name)
+        failed.pop(dep_proj_name, None)
+        if dep_proj_name in cloned :
+            # cloned in an earlier round, but an import which wasn't
+            # known then defines it differently, clone it again
+            shutil.rmtree(dep_proj_dir)
+            util.invalidate_fips_yml(dep_proj_dir)
+            cloned.discard(dep_proj_name)
+            with log.lock :
+                log.colored(log.YELLOW, "=== dependency: '{}':".format(dep_proj_name))
+                log.info("cloning again, '{}' is defined differently in an import".format(dep_proj_name))
+        elif os.path.isdir(dep_proj_dir) :
+            # directory already exists
+            with log.lock :
+                log.colored(log.YELLOW, "=== dependency: '{}':".format(dep_proj_name))
+                log.info("dir '{}' exists".format(dep_proj_dir))
+            return True
+
+        # directory did not exist, do a fresh git clone
+        if not quiet :
+            log.colored(log.YELLOW, "=== dependency: '{}':".format(dep_proj_name))
+        git_commit = None if 'rev' not in dep else dep['rev']
+        git_depth = git.clone_depth if 'depth' not in dep else dep['depth']
+        depth_ignored = False
+        if git_commit :
+            # when using rev, we may not want depth because the revision may not be reachable
+            depth_ignored = 'depth' in dep
+            git_depth = None
+        git_url = dep['git']
+        git_branch = dep['branch']
+        cloned_ok = git.clone(git_url, git_branch, git_depth, dep_proj_name, ws_dir, quiet=quiet)
+        if cloned_ok :
+            cloned.add(dep_proj_name)
+        dep_ok = cloned_ok
+        if cloned_ok and git_commit :
+            dep_ok = git.checkout(dep_proj_dir, git_commit, quiet=quiet)
+        with log.lock :
+            if quiet :
+                log.colored(log.YELLOW, "=== dependency: '{}':".format(dep_proj_name))
+            if depth_ignored :
+                log.colored(log.YELLOW, "=== 'depth' was ignored because parameter 'rev' is specified.")
+            if cloned_ok :
+                if quiet :
+                    log.info("cloned '{}'".format(git_url))
+                if git_commit :
+                    log.colored(log.YELLOW, "=== revision: '{}':".format(git_commit))
+                    if not dep_ok :
+                        failed[dep_proj_name] = "failed to checkout revision '{}'".format(git_commit)
+                        log.error(failed[dep_proj_name], False)
+            else :
+                failed[dep_proj_name] = 'failed to git clone {} into {}'.format(git_url, dep_proj_dir)
+                log.error(failed[dep_proj_name], False)
+        return dep_ok
+
+    dep_proj_names = _walk_imports(fips_dir, proj_dir, num_jobs, fetch_import)
+
+    # remove clones which only an outdated import definition led to
+    for dep_proj_name in sorted(cloned) :
+        if dep_proj_name not in dep_proj_names :
+            dep_proj_dir = util.get_project_dir(fips_dir, dep_proj_name)
+            log.info("removing '{}', it is not imported".format(dep_proj_dir))
+            shutil.rmtree(dep_proj_dir)
+            util.invalidate_fips_yml(dep_proj_dir)
+    failed_names = [name for name in dep_proj_names if name in failed]
+    if failed_names :
+        log.error("failed to fetch imports: {}".format(', '.join(failed_names)))
 
 #-------------------------------------------------------------------------------
 def gather_imports(fips_dir, proj_dir) :
@@ -314,16 +586,36 @@ def gather_imports(fips_dir, proj_dir) :
         return None
 
 #-------------------------------------------------------------------------------
-def write_imports(fips_dir, proj_dir, cfg_name, imported) :
+def write_imports(fips_dir, proj_dir, cfg_names, imported) :
     """write the big imports map created with 'gather_imports'
-    to a .fips-imports.cmake file in the current project
+    to a .fips-imports.cmake file in the current project, and the
+    fips-gen.py code generator script to the build directory of
+    each config
 
     :params fips_dir:   absolute path to fips
     :params proj_dir:   absolute path to current project
+    :params cfg_names:  list of config names
     :params imported:   the imports dictionary created with 'gather_imports'
     """
 
+    # the search paths of generator scripts in fips-gen.py
+    gen_search_paths = [fips_dir, fips_dir + '/generators']
+    proj_gen_dir = util.get_generators_dir(proj_dir)
+    if proj_gen_dir:
+        gen_search_paths += [proj_dir, proj_gen_dir]
+    for imp_proj_name in imported :
+        gen_dir = util.get_generators_dir(util.get_project_dir(fips_dir, imp_proj_name))
+        if gen_dir:
+            gen_search_paths.append(gen_dir)
+
     if imported is not None:
+        # generator script directories, fips-gen.py runs in the project
+        # directory, so generator scripts are also found there
+        gen_dirs = []
+        for gen_dir in [proj_dir] + gen_search_paths :
+            if gen_dir not in gen_dirs :
+                gen_dirs.append(gen_dir)
+
         unique_hdrdirs = []
         unique_condhdrdirs = {}
         unique_libdirs = []
@@ -338,6 +630,8 @@ def write_imports(fips_dir, proj_dir, cfg_name, imported) :
         import_tmp_filename = import_filename + '.tmp'
         with open(import_tmp_filename, 'w') as f :
             f.write("#\n# generated by 'fips gen', don't edit, don't add to version control!\n#\n")
+            # generator script directories, used for the code generation dependencies
+            f.write('set(FIPS_GENERATOR_DIRS {})\n'.format(' '.join('"{}"'.format(d) for d in gen_dirs)))
 
             for imp_proj_name in imported :
                 imp_proj_dir = util.get_project_dir(fips_dir, imp_proj_name)
@@ -433,26 +727,23 @@ def write_imports(fips_dir, proj_dir, cfg_name, imported) :
             os.remove(import_tmp_filename)
 
     # write the .fips-imports.py file (copy from template)
-    gen_search_paths  = '"{}","{}/generators",\n'.format(fips_dir, fips_dir)
-    proj_gen_dir = util.get_generators_dir(proj_dir)
-    if proj_gen_dir:
-        gen_search_paths += '"{}","{}",\n'.format(proj_dir, proj_gen_dir)
-    for imp_proj_name in imported :
-        gen_dir = util.get_generators_dir(util.get_project_dir(fips_dir, imp_proj_name))
-        if gen_dir:
-            gen_search_paths += '"' + gen_dir + '",\n'
     proj_name = util.get_project_name_from_dir(proj_dir)
-    build_dir = util.get_build_dir(fips_dir, proj_name, cfg_name);
-    if not os.path.isdir(build_dir):
-        os.makedirs(build_dir)
-    template.copy_template_file(fips_dir, build_dir, 'fips-gen.py', { 'genpaths': gen_search_paths}, True)
+    gen_values = { 'genpaths': ''.join('"{}",\n'.format(path) for path in gen_search_paths) }
+    for cfg_name in cfg_names :
+        build_dir = util.get_build_dir(fips_dir, proj_name, cfg_name)
+        if not os.path.isdir(build_dir):
+            os.makedirs(build_dir)
+        template.copy_template_file(fips_dir, build_dir, 'fips-gen.py', gen_values, True)
 
 #-------------------------------------------------------------------------------
-def gather_and_write_imports(fips_dir, proj_dir, cfg_name) :
-    """first does and gather_imports, then a write_imports with the result"""
+def gather_and_write_imports(fips_dir, proj_dir, cfg_names) :
+    """first does and gather_imports, then a write_imports with the result
+
+    :params cfg_names:  list of names of the configs to generate or build
+    """
     imports = gather_imports(fips_dir, proj_dir)
     if imports is not None :
-        write_imports(fips_dir, proj_dir, cfg_name, imports)
+        write_imports(fips_dir, proj_dir, cfg_names, imports)
     else :
         log.error("project imports are incomplete, please run 'fips fetch'")
 
@@ -520,49 +811,76 @@ def check_local_changes(fips_dir, proj_dir) :
         log.info('  none')
 
 #-------------------------------------------------------------------------------
-def _rec_update_imports(fips_dir, proj_dir, handled) :
-    """same as _rec_fetch_imports() but for updating the imported projects
-    """
-    proj_name = util.get_project_name_from_dir(proj_dir)
-    if proj_name not in handled :
-        handled.append(proj_name)
-        imports = get_imports(fips_dir, proj_dir)
-        for dep in imports:
-            dep_proj_name = dep
-            if dep not in handled:
-                dep_proj_dir = util.get_project_dir(fips_dir, dep_proj_name)
-                log.colored(log.YELLOW, "=== dependency: '{}':".format(dep_proj_name))
-                dep_ok = False
-                if os.path.isdir(dep_proj_dir) :
-                    if os.path.isdir("{}/.git".format(dep_proj_dir)) :
-                        dep = imports[dep_proj_name]
-                        git_commit = None if 'rev' not in dep else dep['rev']
-                        if git.has_local_changes(dep_proj_dir) :
-                            log.warn("  '{}' has local changes, skipping...".format(dep_proj_dir))
-                        else :
-                            log.colored(log.BLUE, "  updating '{}'...".format(dep_proj_dir))
-                            git.update(dep_proj_dir)
-                            if git_commit:
-                                log.colored(log.YELLOW, "=== revision: '{}':".format(git_commit))
-                                dep_ok = git.checkout(dep_proj_dir, git_commit)
-                            else:
-                                dep_ok = True
-                    else :
-                        log.colored(log.BLUE, "  '{}' is not a git repository".format(dep_proj_dir))
-                else :
-                    log.warn("  '{}' does not exist, please run 'fips fetch'".format(dep_proj_dir))
-                # recurse
-                if dep_ok :
-                    handled = _rec_update_imports(fips_dir, dep_proj_dir, handled)
-    # done, return the new handled array
-    return handled
-
-#-------------------------------------------------------------------------------
-def update_imports(fips_dir, proj_dir):
-    """runs git.update on each import (only if the import has no local changes)
+def update_imports(fips_dir, proj_dir, num_jobs=None):
+    """runs a git pull on each import (only if the import has no local changes),
+    the imports are updated in parallel (see _walk_imports()), and a summary
+    with the status of each import is printed at the end
 
     :param fips_dir: absolute fips directory
     :param proj_dir: absolute project directory
-    :returns:   True if checks were valid
+    :param num_jobs: number of parallel updates (default: 'jobs' setting)
+    :returns:   True if no update failed
     """
-    _rec_update_imports(fips_dir, proj_dir, [])
+    # check for git here, the workers must not exit the process
+    git.check_exists_with_error()
+    if num_jobs is None :
+        num_jobs = get_num_jobs(proj_dir)
+    quiet = num_jobs > 1
+    # dep_proj_name: (status, elapsed seconds, message)
+    results = {}
+
+    def update_import(dep_proj_name, dep) :
+        start_time = time.time()
+        dep_proj_dir = util.get_project_dir(fips_dir, dep_proj_name)
+        dep_ok = False
+        msg = None
+        if not os.path.isdir(dep_proj_dir) :
+            status = 'missing'
+            msg = "'{}' does not exist, please run 'fips fetch'".format(dep_proj_dir)
+        elif not os.path.isdir("{}/.git".format(dep_proj_dir)) :
+            status = 'skipped'
+            msg = "'{}' is not a git repository".format(dep_proj_dir)
+        else :
+            if not quiet :
+                log.colored(log.YELLOW, "=== dependency: '{}':".format(dep_proj_name))
+            git_commit = None if 'rev' not in dep else dep['rev']
+            try :
+                if git.has_local_changes(dep_proj_dir) :
+                    status = 'skipped'
+                    msg = "'{}' has local changes".format(dep_proj_dir)
+                elif not git.pull(dep_proj_dir, quiet=quiet) :
+                    status = 'failed'
+                    msg = "'git pull' failed in '{}'".format(dep_proj_dir)
+                elif git_commit and not git.checkout(dep_proj_dir, git_commit, quiet=quiet) :
+                    status = 'failed'
+                    msg = "failed to checkout revision '{}'".format(git_commit)
+                else :
+                    status = 'updated'
+                    dep_ok = True
+            except subprocess.CalledProcessError as e :
+                status = 'failed'
+                msg = "'{}' failed with '{}'".format(e.cmd, e.returncode)
+        results[dep_proj_name] = (status, time.time() - start_time, msg)
+        return dep_ok
+
+    start_time = time.time()
+    dep_proj_names = _walk_imports(fips_dir, proj_dir, num_jobs, update_import)
+
+    # print the summary table
+    log.colored(log.YELLOW, '=== update summary:')
+    colors = { 'updated': log.GREEN, 'skipped': log.YELLOW, 'missing': log.YELLOW, 'failed': log.RED }
+    name_width = max([len(name) for name in dep_proj_names] + [0])
+    for dep_proj_name in dep_proj_names :
+        status, elapsed, msg = results[dep_proj_name]
+        line = '  {:<{}}  {}{:<8}{} {:6.2f}s'.format(dep_proj_name, name_width, colors[status], status, log.DEF, elapsed)
+        if msg :
+            line += '  ({})'.format(msg)
+        log.info(line)
+    if not dep_proj_names :
+        log.info('  none')
+    num = { status: 0 for status in colors }
+    for status, _, _ in results.values() :
+        num[status] += 1
+    log.info('  {} updated, {} skipped, {} failed in {:.2f}s'.format(
+        num['updated'], num['skipped'] + num['missing'], num['failed'], time.time() - start_time))
+    return num['failed'] == 0
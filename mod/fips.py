@@ -5,7 +5,7 @@ VERSION = '0.0.1'
 from colorama import init
 init()
 
-from mod import log, verb, util
+from mod import log, verb, util, profiler
 
 #-------------------------------------------------------------------------------
 def show_help(args) :
@@ -13,15 +13,19 @@ def show_help(args) :
     if len(args) > 0 :
         # show help for one verb
         verb_name = args[0]
-        if verb_name in verb.verbs :
-            verb.verbs[verb_name].help()
+        verb_module = verb.load_verb(verb_name)
+        if verb_module :
+            verb_module.help()
         else :
-            log.error("unknown verb '{}'".format(verb))
+            log.error("unknown verb '{}'".format(verb_name))
     else :
         # show generic help
         log.info("fips: the high-level, multi-platform build system wrapper\n"
                  "v{}\n"
-                 "https://www.github.com/floooh/fips\n".format(VERSION))
+                 "https://www.github.com/floooh/fips\n\n"
+                 "run 'fips --profile[=trace.json] [verb] ...' to print a timing\n"
+                 "tree of a fips command and optionally write a Chrome trace file\n".format(VERSION))
+        verb.load_all_verbs()
         for proj_name in verb.proj_verbs :
             if proj_name != 'fips' :
                 log.colored(log.BLUE, "=== imported from '{}':".format(proj_name))
@@ -35,19 +39,32 @@ def run(fips_path, proj_path, args) :
     proj_path = util.fix_path(proj_path)
     if ' ' in proj_path:
         log.warn("whitespace in project path detected, fips will not work correctly")
-    verb.import_verbs(fips_path, proj_path)
+    # 'fips --profile[=trace.json] ...' prints a timing tree at the end
+    if len(args) > 1 and (args[1] == '--profile' or args[1].startswith('--profile=')) :
+        profiler.enable(args[1][len('--profile='):] if '=' in args[1] else None)
+        args = args[:1] + args[2:]
+    try :
+        with profiler.span('fips') :
+            run_verb(fips_path, proj_path, args)
+    finally :
+        profiler.report()
+
+#-------------------------------------------------------------------------------
+def run_verb(fips_path, proj_path, args) :
     if len(args) <= 1:
         print("run 'fips help' for more info")
+    elif args[1] == '--version' :
+        log.info(VERSION)
     else :
+        verb.import_verbs(fips_path, proj_path)
         verb_name = args[1]
         verb_args = args[2:]
         if verb_name in ['help', '--help', '-help'] :
             show_help(verb_args)
-        elif verb_name == '--version' :
-            log.info(VERSION)
-        elif verb_name in verb.verbs :
-            verb.verbs[verb_name].run(fips_path, proj_path, verb_args)
         else :
-            log.error("unknown verb '{}'".format(verb_name))
-
-
+            verb_module = verb.load_verb(verb_name)
+            if verb_module :
+                with profiler.span('verb.{}.run'.format(verb_name)) :
+                    verb_module.run(fips_path, proj_path, verb_args)
+            else :
+                log.error("unknown verb '{}'".format(verb_name))
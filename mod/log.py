@@ -1,5 +1,6 @@
 """logging functions"""
 import sys
+import threading
 
 # log colors
 RED = '\033[1;31m'
@@ -8,6 +9,16 @@ YELLOW = '\033[1;33m'
 BLUE = '\033[1;36m'
 DEF = '\033[0;0m'
 
+# serializes output of worker threads, hold it to print multi-line
+# messages as one block (e.g. 'with log.lock: ...')
+lock = threading.RLock()
+
+#-------------------------------------------------------------------------------
+def _print(msg) :
+    """print a complete line, safe to call from worker threads"""
+    with lock :
+        print(msg)
+
 #-------------------------------------------------------------------------------
 def error(msg, fatal=True) :
     """
@@ -17,14 +28,14 @@ def error(msg, fatal=True) :
     :param msg:     string message
     :param fatal:   exit program with error code 10 if True (default is true)
     """
-    print('{}[ERROR]{} {}'.format(RED, DEF, msg))
+    _print('{}[ERROR]{} {}'.format(RED, DEF, msg))
     if fatal :
         sys.exit(10)
 
 #-------------------------------------------------------------------------------
 def warn(msg) :
     """print a warning message"""
-    print('{}[WARNING]{} {}'.format(YELLOW, DEF, msg))
+    _print('{}[WARNING]{} {}'.format(YELLOW, DEF, msg))
 
 #-------------------------------------------------------------------------------
 def ok(item, status) :
@@ -33,7 +44,7 @@ def ok(item, status) :
     :param item:    first part of message
     :param status:  status (colored green)
     """
-    print('{}:\t{}{}{}'.format(item, GREEN, status, DEF))
+    _print('{}:\t{}{}{}'.format(item, GREEN, status, DEF))
 
 #-------------------------------------------------------------------------------
 def failed(item, status) :
@@ -42,7 +53,7 @@ def failed(item, status) :
     :param item:    first part of message
     :param status:  status (colored red)
     """
-    print('{}:\t{}{}{}'.format(item, RED, status, DEF))
+    _print('{}:\t{}{}{}'.format(item, RED, status, DEF))
 
 #-------------------------------------------------------------------------------
 def optional(item, status) :
@@ -51,7 +62,7 @@ def optional(item, status) :
     :param item:    first part of message
     :param status:  status (colored yellow)
     """
-    print('{}:\t{}{}{}'.format(item, YELLOW, status, DEF))
+    _print('{}:\t{}{}{}'.format(item, YELLOW, status, DEF))
 
 #-------------------------------------------------------------------------------
 def info(msg) :
@@ -59,7 +70,7 @@ def info(msg) :
 
     :param msg: message
     """
-    print(msg)
+    _print(msg)
 
 #-------------------------------------------------------------------------------
 def colored(color, msg) :
@@ -68,5 +79,5 @@ def colored(color, msg) :
     :param color:   color escape sequence (e.g. log.YELLOW)
     :param msg:     text message
     """
-    print('{}{}{}'.format(color, msg, DEF))
+    _print('{}{}{}'.format(color, msg, DEF))
 
@@ -0,0 +1,231 @@
+"""startup-time profiler, enabled with 'fips --profile[=trace.json] ...'
+
+When enabled, the public functions of the dep, config, project, settings,
+verb, cmake and git modules, and all subprocess and YAML calls are wrapped
+in named timing spans. At the end of the fips run, a hierarchical timing
+tree is printed, and optionally a Chrome trace-event JSON file is written
+(open in chrome://tracing or https://ui.perfetto.dev).
+"""
+
+import os
+import time
+import json
+import inspect
+import functools
+import threading
+import subprocess
+from collections import OrderedDict
+
+import yaml
+from mod import log
+
+# True if profiling is enabled
+enabled = False
+# optional path of Chrome trace-event JSON file
+trace_path = None
+# start time of the profiling session
+start_time = None
+# recorded spans as (path, thread id, start, duration)
+spans = []
+# number of subprocess calls by executable name
+subprocess_counts = OrderedDict()
+# number of yaml.load() calls
+yaml_count = 0
+
+_lock = threading.Lock()
+_local = threading.local()
+
+#-------------------------------------------------------------------------------
+def _stack() :
+    """get the span stack of the current thread"""
+    if not hasattr(_local, 'stack') :
+        _local.stack = []
+    return _local.stack
+
+#-------------------------------------------------------------------------------
+class span(object) :
+    """context manager which records a named timing span, nested spans
+    are recorded as children, does nothing if profiling is not enabled
+
+        with profiler.span('dep.fetch_imports') :
+            ...
+    """
+    def __init__(self, name) :
+        self.name = name
+        self.active = False
+
+    def __enter__(self) :
+        self.active = enabled
+        if self.active :
+            _stack().append(self.name)
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) :
+        if self.active :
+            duration = time.perf_counter() - self.start
+            stack = _stack()
+            path = tuple(stack)
+            stack.pop()
+            with _lock :
+                spans.append((path, threading.get_ident(), self.start, duration))
+        return False
+
+#-------------------------------------------------------------------------------
+def profiled(name) :
+    """decorator which wraps a function into a named span
+
+    :param name:    name of the span
+    """
+    def wrap(func) :
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs) :
+            if not enabled :
+                return func(*args, **kwargs)
+            with span(name) :
+                return func(*args, **kwargs)
+        return wrapper
+    return wrap
+
+#-------------------------------------------------------------------------------
+def instrument_module(module, prefix) :
+    """wrap all public functions of a module into spans named
+    'prefix.func', calls through the module attribute (including
+    calls inside the module) are recorded
+
+    :param module:  a python module object
+    :param prefix:  span name prefix (e.g. 'dep')
+    """
+    for name, obj in list(vars(module).items()) :
+        if inspect.isfunction(obj) and obj.__module__ == module.__name__ and not name.startswith('_') :
+            setattr(module, name, profiled('{}.{}'.format(prefix, name))(obj))
+
+#-------------------------------------------------------------------------------
+def _exe_name(cmd) :
+    """get the executable name from a subprocess command line"""
+    if isinstance(cmd, (list, tuple)) :
+        cmd = cmd[0] if cmd else ''
+    elif cmd and not isinstance(cmd, str) :
+        cmd = str(cmd)
+    else :
+        cmd = cmd.split()[0] if cmd and cmd.split() else ''
+    return os.path.basename(cmd)
+
+#-------------------------------------------------------------------------------
+def _wrap_subprocess(func) :
+    """wrap a subprocess function into a span and count the calls, nested
+    calls (e.g. check_output() calling run()) are only counted once
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs) :
+        if getattr(_local, 'in_subprocess', False) :
+            return func(*args, **kwargs)
+        exe = _exe_name(args[0] if args else kwargs.get('args'))
+        with _lock :
+            subprocess_counts[exe] = subprocess_counts.get(exe, 0) + 1
+        _local.in_subprocess = True
+        try :
+            with span('subprocess.{}: {}'.format(func.__name__, exe)) :
+                return func(*args, **kwargs)
+        finally :
+            _local.in_subprocess = False
+    return wrapper
+
+#-------------------------------------------------------------------------------
+def _wrap_yaml_load(func) :
+    """wrap yaml.load() into a span and count the calls"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs) :
+        global yaml_count
+        with _lock :
+            yaml_count += 1
+        with span('yaml.load') :
+            return func(*args, **kwargs)
+    return wrapper
+
+#-------------------------------------------------------------------------------
+def enable(path=None) :
+    """enable profiling and instrument the fips modules, call this
+    as early as possible
+
+    :param path:    optional path of a Chrome trace-event JSON file
+    """
+    global enabled, trace_path, start_time
+    if enabled :
+        return
+    enabled = True
+    trace_path = path
+    start_time = time.perf_counter()
+    for name in ['call', 'check_call', 'check_output', 'run'] :
+        setattr(subprocess, name, _wrap_subprocess(getattr(subprocess, name)))
+    yaml.load = _wrap_yaml_load(yaml.load)
+    from mod import dep, config, project, settings, verb
+    from mod.tools import cmake, git
+    for module in [dep, config, project, settings, verb, cmake, git] :
+        instrument_module(module, module.__name__.split('.')[-1])
+
+#-------------------------------------------------------------------------------
+def write_trace(path) :
+    """write the recorded spans as Chrome trace-event JSON file
+
+    :param path:    path of the JSON file
+    """
+    pid = os.getpid()
+    events = []
+    for span_path, tid, start, duration in spans :
+        events.append({
+            'name': span_path[-1],
+            'cat': 'fips',
+            'ph': 'X',
+            'ts': round((start - start_time) * 1000000.0, 3),
+            'dur': round(duration * 1000000.0, 3),
+            'pid': pid,
+            'tid': tid
+        })
+    with open(path, 'w') as f :
+        json.dump({ 'traceEvents': events, 'displayTimeUnit': 'ms' }, f)
+
+#-------------------------------------------------------------------------------
+def report() :
+    """print the timing tree, subprocess and YAML counters, and write
+    the trace file if requested
+    """
+    if not enabled :
+        return
+    from mod import util, dep
+
+    # aggregate spans by their path, sorted by first start time
+    tree = OrderedDict()
+    for span_path, tid, start, duration in sorted(spans, key=lambda s: s[2]) :
+        if span_path not in tree :
+            tree[span_path] = [0, 0.0]
+        tree[span_path][0] += 1
+        tree[span_path][1] += duration
+
+    # print each node followed by its children
+    def print_node(path, indent) :
+        num, duration = tree[path]
+        log.info('{:10.2f}ms {:6}x  {}{}'.format(duration * 1000.0, num, '  ' * indent, path[-1]))
+        for child in tree :
+            if len(child) == len(path) + 1 and child[:-1] == path :
+                print_node(child, indent + 1)
+
+    total = time.perf_counter() - start_time
+    with log.lock :
+        log.colored(log.YELLOW, '=== profile ({:.2f}ms total):'.format(total * 1000.0))
+        log.info('{:>12} {:>7}  {}'.format('time', 'calls', 'span'))
+        for path in tree :
+            # root spans, or spans started on worker threads
+            if len(path) == 1 :
+                print_node(path, 0)
+        num_subprocesses = sum(subprocess_counts.values())
+        log.info('subprocesses: {} ({})'.format(num_subprocesses,
+            ', '.join('{}: {}'.format(exe, num) for exe, num in subprocess_counts.items())))
+        log.info('yaml parses: {} ({})'.format(yaml_count, 'libyaml' if yaml.__with_libyaml__ else 'pure Python'))
+        stats = util.get_fips_yml_stats()
+        log.info('fips.yml cache: {} parsed, {} parses avoided'.format(stats['parsed'], stats['cached']))
+        stats = dep.get_imports_cache_stats()
+        log.info('import graph cache: {} hits, {} misses, {} in-memory'.format(stats['hits'], stats['misses'], stats['memo']))
+        if trace_path :
+            write_trace(trace_path)
+            log.info("wrote Chrome trace to '{}'".format(trace_path))
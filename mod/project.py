@@ -1,11 +1,25 @@
 """project related functions"""
 
 import os
+import json
+import time
 import shutil
+import hashlib
+import threading
 import subprocess
 
-from mod import log, util, config, dep, template, settings, android, emsdk, wasisdk
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from mod import log, util, config, dep, template, settings, android, emsdk, wasisdk, toolcache
 from mod.tools import git, cmake, xcrun, ccmake, cmake_gui, vscode, clion, httpserver, wasmtime
+from mod.tools import ccache, sccache
+
+# serializes writing IDE files when generating configs in parallel
+ide_lock = threading.Lock()
+
+# supported compiler caches, in order of preference
+compiler_caches = OrderedDict([('ccache', ccache), ('sccache', sccache)])
 
 #-------------------------------------------------------------------------------
 def init(fips_dir, proj_name) :
@@ -23,6 +37,7 @@ def init(fips_dir, proj_name) :
         }
         for f in ['CMakeLists.txt', 'fips', 'fips.cmd', 'fips.yml'] :
             template.copy_template_file(fips_dir, proj_dir, f, templ_values)
+        util.invalidate_fips_yml(proj_dir)
         os.chmod(proj_dir + '/fips', 0o744)
         gitignore_entries = ['.fips-*', 'fips-files/build/', 'fips-files/deploy/', '*.pyc', '.vscode/', '.idea/', 'CMakeUserPresets.json']
         template.write_git_ignore(proj_dir, gitignore_entries)
@@ -56,8 +71,117 @@ def clone(fips_dir, url) :
         return False
 
 #-------------------------------------------------------------------------------
-def gen_project(fips_dir, proj_dir, cfg, force) :
-    """private: generate build files for one config"""
+def get_compiler_cache(fips_dir, proj_dir, cfg, warn=True) :
+    """private: get the compiler cache tool module for a config, this is
+    defined by the config's 'compiler-cache' key (ccache, sccache, on or
+    off), or if the config doesn't have this key, by the 'ccache' setting,
+    with 'on' the first compiler cache found is used
+
+    :param warn:    print a warning if the compiler cache can't be used
+    :returns:       the ccache or sccache tool module, or None
+    """
+    cache_name = cfg['compiler-cache']
+    if cache_name is None :
+        cache_name = settings.get(proj_dir, 'ccache')
+    if cache_name in [None, False, 'none', 'off'] :
+        return None
+    if cache_name in [True, 'on'] :
+        tools = list(compiler_caches.values())
+    elif cache_name in compiler_caches :
+        tools = [compiler_caches[cache_name]]
+    else :
+        if warn :
+            log.warn("unknown compiler-cache '{}' in config '{}'".format(cache_name, cfg['name']))
+        return None
+    for tool in tools :
+        if toolcache.check_exists(fips_dir, tool) :
+            return tool
+    if warn :
+        log.warn("no compiler cache found for config '{}' ({}), building without".format(
+        cfg['name'], ', '.join(tool.name for tool in tools)))
+    return None
+
+#-------------------------------------------------------------------------------
+def get_compiler_cache_stats(fips_dir, proj_dir, configs) :
+    """private: get the current hit/miss counters of all compiler caches
+    used by a list of configs, the configs must be valid, warnings
+    are printed by gen_project()
+
+    :returns:   dictionary of tool module: (hits, misses)
+    """
+    stats = OrderedDict()
+    for cfg in configs :
+        tool = get_compiler_cache(fips_dir, proj_dir, cfg, False)
+        if tool and tool not in stats :
+            stats[tool] = tool.get_stats(fips_dir)
+    return stats
+
+#-------------------------------------------------------------------------------
+def print_compiler_cache_stats(fips_dir, stats_before) :
+    """private: print the hit rate of the compiler caches since
+    get_compiler_cache_stats() was called
+    """
+    for tool, before in stats_before.items() :
+        after = tool.get_stats(fips_dir)
+        if before and after :
+            hits = after[0] - before[0]
+            misses = after[1] - before[1]
+            if hits + misses > 0 :
+                hit_rate = 100.0 * hits / (hits + misses)
+            else :
+                hit_rate = 0.0
+            log.colored(log.YELLOW, '=== {}: {} hits, {} misses ({:.1f}% hit rate)'.format(tool.name, hits, misses, hit_rate))
+
+#-------------------------------------------------------------------------------
+def get_gen_fingerprint(fips_dir, proj_dir, cfg, toolchain_path, defines, presets) :
+    """private: compute a hash over the inputs of a cmake configure run:
+    the config object, toolchain path and content, defines, the
+    .fips-imports.cmake file and the cmake presets"""
+    sha1 = hashlib.sha1()
+    sha1.update(json.dumps(cfg, sort_keys=True, default=str).encode('utf-8'))
+    sha1.update(json.dumps(defines, sort_keys=True, default=str).encode('utf-8'))
+    sha1.update(json.dumps(presets, sort_keys=True).encode('utf-8'))
+    for path in [toolchain_path, proj_dir + '/.fips-imports.cmake'] :
+        sha1.update(str(path).encode('utf-8'))
+        if path and os.path.isfile(path) :
+            with open(path, 'rb') as f :
+                sha1.update(f.read())
+    return sha1.hexdigest()
+
+#-------------------------------------------------------------------------------
+def get_cmake_inputs_mtime(fips_dir, proj_dir) :
+    """private: get the newest modification time of the CMakeLists.txt and
+    .cmake files of the project, its imports and fips, these are not
+    part of the fingerprint since hashing them would be too slow"""
+    dirs = [proj_dir, fips_dir + '/cmake', fips_dir + '/cmake-toolchains']
+    success, imported_projects = dep.get_all_imports_exports(fips_dir, proj_dir)
+    if success :
+        for imp_proj_name in imported_projects :
+            imp_proj_dir = imported_projects[imp_proj_name]['proj_dir']
+            if imp_proj_dir not in dirs :
+                dirs.append(imp_proj_dir)
+    newest = 0.0
+    for root_dir in dirs :
+        for cur_dir, sub_dirs, files in os.walk(root_dir) :
+            # skip .git and other hidden directories
+            sub_dirs[:] = [sub_dir for sub_dir in sub_dirs if not sub_dir.startswith('.')]
+            for name in files :
+                if name == 'CMakeLists.txt' or name.endswith('.cmake') :
+                    newest = max(newest, os.path.getmtime(os.path.join(cur_dir, name)))
+    return newest
+
+#-------------------------------------------------------------------------------
+def gen_project(fips_dir, proj_dir, cfg, force, prefix=None, incremental=False) :
+    """private: generate build files for one config, the optional prefix
+    is used for the cmake output when generating configs in parallel
+
+    Unless force is True, cmake is only run if there's no CMakeCache.txt
+    file in the build directory, or if incremental is True and the
+    fingerprint of the configure inputs has changed since the last
+    successful run (see get_gen_fingerprint()), or a CMakeLists.txt or
+    .cmake file was modified after that run. With incremental, the IDE
+    files are written even if cmake is skipped.
+    """
 
     proj_name = util.get_project_name_from_dir(proj_dir)
     build_dir = util.get_build_dir(fips_dir, proj_name, cfg['name'])
@@ -76,56 +200,118 @@ def gen_project(fips_dir, proj_dir, cfg, force) :
         defines['EMSCRIPTEN_ROOT'] = emsdk.get_emscripten_root(fips_dir)
     if cfg['platform'] == 'wasisdk':
         defines['WASISDK_ROOT'] = wasisdk.get_wasisdk_root(fips_dir)
+    # compiler launchers are only supported by the Makefile and Ninja generators,
+    # without a compiler cache an empty launcher clears the value in CMakeCache.txt
+    if cfg['generator'] in ['Ninja', 'Unix Makefiles'] or (cfg['generator'] is None and util.get_host_platform() != 'win'):
+        compiler_cache = get_compiler_cache(fips_dir, proj_dir, cfg)
+        launcher = compiler_cache.get_launcher(fips_dir) if compiler_cache else ''
+        langs = ['C', 'CXX']
+        if cfg['platform'] in ['osx', 'ios']:
+            langs += ['OBJC', 'OBJCXX']
+        for lang in langs:
+            key = 'CMAKE_{}_COMPILER_LAUNCHER'.format(lang)
+            if compiler_cache or not (cfg['defines'] and key in cfg['defines']):
+                defines[key] = launcher
+    # always pass the unity options (with the defaults from fips.cmake), otherwise
+    # removing the config keys would keep the old values in CMakeCache.txt
+    unity_options = [
+        ('FIPS_UNITY_BUILD', cfg['unity-build'], 'OFF'),
+        ('FIPS_UNITY_BUILD_BATCH_SIZE', cfg['unity-batch-size'], 8)
+    ]
+    for key, val, default in unity_options:
+        if val is not None:
+            if key == 'FIPS_UNITY_BUILD':
+                val = 'ON' if val else 'OFF'
+            defines[key] = val
+        elif not (cfg['defines'] and key in cfg['defines']):
+            defines[key] = default
+    toolchain_path = config.get_toolchain(fips_dir, proj_dir, cfg)
+    is_local_build = settings.get(proj_dir, 'local')
+    presets = cmake.get_presets(cfg, fips_dir, proj_dir, build_dir, is_local_build, toolchain_path, defines)
+    fingerprint = get_gen_fingerprint(fips_dir, proj_dir, cfg, toolchain_path, defines, presets)
+    fingerprint_path = build_dir + '/fips_gen_fingerprint.txt'
     do_it = force
     if not os.path.isdir(build_dir) :
         os.makedirs(build_dir)
     if not os.path.isfile(build_dir + '/CMakeCache.txt'):
         do_it = True
+    elif incremental and not os.path.isfile(fingerprint_path) :
+        do_it = True
+    elif incremental :
+        with open(fingerprint_path, 'r') as f :
+            if f.read().strip() != fingerprint :
+                do_it = True
+        if not do_it and get_cmake_inputs_mtime(fips_dir, proj_dir) > os.path.getmtime(fingerprint_path) :
+            do_it = True
+    cmake_result = True
     if do_it :
         log.colored(log.YELLOW, "=== generating: {}".format(cfg['name']))
         log.info("config file: {}".format(cfg['path']))
-        toolchain_path = config.get_toolchain(fips_dir, proj_dir, cfg)
         if toolchain_path :
             log.info("Using Toolchain File: {}".format(toolchain_path))
-        is_local_build = settings.get(proj_dir, 'local')
-        cmake_result = cmake.run_gen(cfg, fips_dir, proj_dir, build_dir, is_local_build, toolchain_path, defines)
-        if vscode.match(cfg['build_tool']):
-            vscode.write_workspace_settings(fips_dir, proj_dir, cfg, settings.get_all_settings(proj_dir))
-        if clion.match(cfg['build_tool']):
-            clion.write_workspace_settings(fips_dir, proj_dir, cfg)
-        return cmake_result
-    else :
-        return True
+        if os.path.isfile(fingerprint_path) :
+            os.remove(fingerprint_path)
+        cmake_result = cmake.run_gen(cfg, fips_dir, proj_dir, build_dir, is_local_build, toolchain_path, defines, prefix)
+        if cmake_result :
+            with open(fingerprint_path, 'w') as f :
+                f.write(fingerprint + '\n')
+    elif incremental :
+        log.colored(log.YELLOW, "=== {} is uptodate (use --force to regenerate)".format(cfg['name']))
+    # 'fips gen' always writes the IDE files, even if cmake was skipped
+    if do_it or incremental :
+        with ide_lock :
+            if vscode.match(cfg['build_tool']):
+                vscode.write_workspace_settings(fips_dir, proj_dir, cfg, settings.get_all_settings(proj_dir))
+            if clion.match(cfg['build_tool']):
+                clion.write_workspace_settings(fips_dir, proj_dir, cfg)
+    return cmake_result
 
 #-------------------------------------------------------------------------------
-def gen(fips_dir, proj_dir, cfg_name) :
+def gen(fips_dir, proj_dir, cfg_name, force=False) :
     """generate build files with cmake
 
     :param fips_dir:    absolute path to fips
     :param proj_dir:    absolute path to project
     :param cfg_name:    config name or pattern (e.g. osx-make-debug)
+    :param force:       if True, run cmake even if the configure inputs didn't change
     :returns:           True if successful
+
+    If the pattern matches multiple configs, up to 'parallel' configs are
+    generated at the same time (like in build()), with the cmake output
+    prefixed by the config name.
     """
 
     # prepare
     dep.fetch_imports(fips_dir, proj_dir)
     util.ensure_valid_project_dir(proj_dir)
-    dep.gather_and_write_imports(fips_dir, proj_dir, cfg_name)
 
     # load the config(s)
     configs = config.load(fips_dir, proj_dir, cfg_name)
+    dep.gather_and_write_imports(fips_dir, proj_dir, [cfg['name'] for cfg in configs])
     num_valid_configs = 0
     if configs :
+        gen_configs = []
         for cfg in configs :
             # check if config is valid
             config_valid, _ = config.check_config_valid(fips_dir, proj_dir, cfg, print_errors = True)
             if config_valid :
-                if gen_project(fips_dir, proj_dir, cfg, True) :
-                    num_valid_configs += 1
-                else :
-                    log.error("failed to generate build files for config '{}'".format(cfg['name']), False)
+                gen_configs.append(cfg)
             else :
                 log.error("'{}' is not a valid config".format(cfg['name']), False)
+
+        # run cmake for the valid configs in parallel
+        num_parallel = max(1, min(len(gen_configs), settings.get(proj_dir, 'parallel')))
+        def gen_config(cfg) :
+            prefix = None
+            if num_parallel > 1 :
+                prefix = '{}[{}]{} '.format(log.BLUE, cfg['name'], log.DEF)
+            if gen_project(fips_dir, proj_dir, cfg, force, prefix, incremental=True) :
+                return True
+            else :
+                log.error("failed to generate build files for config '{}'".format(cfg['name']), False)
+                return False
+        with ThreadPoolExecutor(max_workers=num_parallel) as pool :
+            num_valid_configs = sum(pool.map(gen_config, gen_configs))
     else :
         log.error("No configs found for '{}'".format(cfg_name))
 
@@ -148,12 +334,12 @@ def configure(fips_dir, proj_dir, cfg_name) :
     dep.fetch_imports(fips_dir, proj_dir)
     proj_name = util.get_project_name_from_dir(proj_dir)
     util.ensure_valid_project_dir(proj_dir)
-    dep.gather_and_write_imports(fips_dir, proj_dir, cfg_name)
 
     # load configs, if more then one, only use first one
     configs = config.load(fips_dir, proj_dir, cfg_name)
     if configs :
         cfg = configs[0]
+        dep.gather_and_write_imports(fips_dir, proj_dir, [cfg['name']])
         log.colored(log.YELLOW, '=== configuring: {}'.format(cfg['name']))
 
         # generate build files
@@ -222,10 +408,15 @@ def build(fips_dir, proj_dir, cfg_name, target=None, build_tool_args=None) :
     dep.fetch_imports(fips_dir, proj_dir)
     proj_name = util.get_project_name_from_dir(proj_dir)
     util.ensure_valid_project_dir(proj_dir)
-    dep.gather_and_write_imports(fips_dir, proj_dir, cfg_name)
 
     # load the config(s)
     configs = config.load(fips_dir, proj_dir, cfg_name)
+    dep.gather_and_write_imports(fips_dir, proj_dir, [cfg['name'] for cfg in configs])
+    num_parallel = min(len(configs), settings.get(proj_dir, 'parallel'))
+    if num_parallel > 1 :
+        return build_parallel(fips_dir, proj_dir, configs, num_parallel, target, build_tool_args)
+    valid_configs = [cfg for cfg in configs if config.check_config_valid(fips_dir, proj_dir, cfg)[0]]
+    cache_stats = get_compiler_cache_stats(fips_dir, proj_dir, valid_configs)
     num_valid_configs = 0
     if configs :
         for cfg in configs :
@@ -250,6 +441,81 @@ def build(fips_dir, proj_dir, cfg_name, target=None, build_tool_args=None) :
     else :
         log.error("No valid configs found for '{}'".format(cfg_name))
 
+    print_compiler_cache_stats(fips_dir, cache_stats)
+    if num_valid_configs != len(configs) :
+        log.error('{} out of {} configs failed!'.format(len(configs) - num_valid_configs, len(configs)))
+        return False
+    else :
+        log.colored(log.GREEN, '{} configs built'.format(num_valid_configs))
+        return True
+
+#-------------------------------------------------------------------------------
+def build_parallel(fips_dir, proj_dir, configs, num_parallel, target=None, build_tool_args=None) :
+    """private: build multiple configs in parallel, called from build()
+    when the 'parallel' setting is greater than 1
+
+    Up to num_parallel configs are generated and built at the same time,
+    and the 'jobs' setting is split between them. The cmake and build
+    output is prefixed with the config name, and a summary table is
+    printed at the end.
+
+    :param fips_dir:        absolute path of fips
+    :param proj_dir:        absolute path of project dir
+    :param configs:         list of config objects
+    :param num_parallel:    max number of configs built at the same time
+    :param target:          optional target name (build all if None)
+    :param build_tool_args: optional string array of cmdline args forwarded to the build tool
+    :returns:               True if all configs were built successfully
+    """
+    proj_name = util.get_project_name_from_dir(proj_dir)
+    num_jobs = max(1, settings.get(proj_dir, 'jobs') // num_parallel)
+    start_time = time.time()
+
+    # check configs, config name: (status, elapsed)
+    results = OrderedDict()
+    build_configs = []
+    for cfg in configs :
+        config_valid, _ = config.check_config_valid(fips_dir, proj_dir, cfg, print_errors=True)
+        if not config_valid :
+            log.error("Config '{}' not valid in this environment".format(cfg['name']), False)
+            results[cfg['name']] = ('invalid', 0.0)
+        else :
+            results[cfg['name']] = None
+            build_configs.append(cfg)
+
+    cache_stats = get_compiler_cache_stats(fips_dir, proj_dir, build_configs)
+
+    # generate build files and build the valid configs in parallel
+    def build_config(cfg) :
+        cfg_start_time = time.time()
+        build_dir = util.get_build_dir(fips_dir, proj_name, cfg['name'])
+        prefix = '{}[{}]{} '.format(log.BLUE, cfg['name'], log.DEF)
+        if not gen_project(fips_dir, proj_dir, cfg, False, prefix) :
+            log.error("Failed to generate '{}' of project '{}'".format(cfg['name'], proj_name), False)
+            return False, time.time() - cfg_start_time
+        log.colored(log.YELLOW, "=== building: {} ({} jobs)".format(cfg['name'], num_jobs))
+        result = cmake.run_build(fips_dir, target, cfg['build_type'], build_dir, num_jobs, build_tool_args, prefix)
+        if not result :
+            log.error("Failed to build config '{}' of project '{}'".format(cfg['name'], proj_name), False)
+        return result, time.time() - cfg_start_time
+    with ThreadPoolExecutor(max_workers=num_parallel) as pool :
+        futures = [(cfg, pool.submit(build_config, cfg)) for cfg in build_configs]
+        for cfg, future in futures :
+            result, elapsed = future.result()
+            results[cfg['name']] = ('ok' if result else 'failed', elapsed)
+
+    # print the summary table
+    log.colored(log.YELLOW, '=== build summary:')
+    colors = { 'ok': log.GREEN, 'failed': log.RED, 'invalid': log.RED }
+    name_width = max([len(name) for name in results])
+    for name in results :
+        status, elapsed = results[name]
+        log.info('  {:<{}}  {}{:<8}{} {:7.2f}s'.format(name, name_width, colors[status], status, log.DEF, elapsed))
+    num_valid_configs = len([status for status, _ in results.values() if status == 'ok'])
+    log.info('  {} built, {} failed in {:.2f}s'.format(
+        num_valid_configs, len(configs) - num_valid_configs, time.time() - start_time))
+
+    print_compiler_cache_stats(fips_dir, cache_stats)
     if num_valid_configs != len(configs) :
         log.error('{} out of {} configs failed!'.format(len(configs) - num_valid_configs, len(configs)))
         return False
@@ -10,7 +10,7 @@ def load(fips_dir) :
     global registry
     if registry is None :
         with open(fips_dir + '/registry.yml', 'r') as f :
-            registry = yaml.load(f)
+            registry = yaml.load(f, Loader=yaml.SafeFastLoader)
 
 #-------------------------------------------------------------------------------
 def exists(fips_dir, proj_name) :
@@ -5,13 +5,15 @@ import os.path
 
 from mod import log, util, config
 
-valid_settings = ['config', 'target', 'jobs', 'iosteam']
+valid_settings = ['config', 'target', 'jobs', 'parallel', 'ccache', 'iosteam']
 
 default_settings = {
     'config':   config.get_default_config(),
     'target':   None,
     'jobs':     util.get_num_cpucores() + 2,
+    'parallel': 1,
     'local':    False,
+    'ccache':   False,
     'iosteam':  None,
 }
 
@@ -19,7 +21,9 @@ value_help = {
     'config':  'config-name',
     'target':  'target-name',
     'jobs':    'num-build-jobs',
+    'parallel': 'num-parallel-configs',
     'local':   'on|off',
+    'ccache':  'on|off',
     'iosteam': 'apple-team-id',
 }
 
@@ -27,7 +31,9 @@ human_help = {
     'config':   'set active build config',
     'target':   'set active run target',
     'jobs':     'set number of parallel build jobs',
+    'parallel': 'set max number of configs generated and built in parallel',
     'local':    'place build files in project directory (useful for CI/CD)',
+    'ccache':   'use ccache or sccache as compiler launcher',
     'iosteam':  'Apple team id for iOS development',
 }
 
@@ -42,7 +48,7 @@ def load(proj_dir) :
     path = proj_dir + '/.fips-settings.yml'
     if os.path.isfile(path) :
         with open(path, 'r') as f :
-            settings = yaml.load(f)
+            settings = yaml.load(f, Loader=yaml.SafeFastLoader)
     if not settings :
         settings = {}
     return settings
@@ -52,7 +52,7 @@ def copy_template_file(fips_dir, proj_dir, filename, values, silent=False) :
     :param proj_dir:    absolute project directory
     :param filename:    filename to copy from fips/templates
     :param values:      template key/value dictionary
-    :param silent:      if True, overwrite existing file and don't print status
+    :param silent:      if True, overwrite existing file (if changed) and don't print status
     :returns:           True file overwritten, False on not overwritten
     """
     
@@ -72,6 +72,11 @@ def copy_template_file(fips_dir, proj_dir, filename, values, silent=False) :
     with open(src_path, 'r') as f :
         content = f.read()
     content = Template(content).substitute(values)
+    if silent and os.path.isfile(dst_path) :
+        # don't touch unchanged files, build steps may depend on them
+        with open(dst_path, 'r') as f :
+            if f.read() == content :
+                return True
     with open(dst_path, 'w') as f :
         f.write(content)
 
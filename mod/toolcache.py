@@ -0,0 +1,171 @@
+"""cache for tool-existence probes
+
+The result of a tool's check_exists() function is stored together with
+the resolved executable path and version in a small JSON file in the
+workspace directory. A cache entry is valid as long as the PATH
+environment variable, the resolved executable path and its modification
+time are unchanged, and the entry isn't older than the time-to-live.
+Only successful probes are cached, a missing tool is probed again on the
+next run, so that a tool installed in the meantime is found.
+
+Tool modules can provide an 'exe_names' list if the executable name
+differs from the tool name, a 'get_version(fips_dir)' function to record
+the tool version, and can opt out of caching with 'cache_probe = False'.
+"""
+
+import os
+import time
+import json
+import shutil
+import threading
+
+from mod import util
+
+# version of the cache file format
+cache_version = 1
+# cache entries are probed again after one day
+cache_ttl = 24 * 60 * 60
+
+# in-memory copy of the cache file
+cache = None
+cache_lock = threading.RLock()
+
+#-------------------------------------------------------------------------------
+def get_cache_path(fips_dir) :
+    """get path to the tool-probe cache file
+
+    :param fips_dir:    absolute fips directory
+    :returns:           absolute path to the cache file in the workspace
+    """
+    return '{}/.fips-tool-cache.json'.format(util.get_workspace_dir(fips_dir))
+
+#-------------------------------------------------------------------------------
+def load(fips_dir) :
+    """load the tool-probe cache file, returns an empty cache if the
+    file doesn't exist or can't be read
+
+    :param fips_dir:    absolute fips directory
+    :returns:           the cache dictionary
+    """
+    global cache
+    with cache_lock :
+        if cache is None :
+            cache = { 'version': cache_version, 'tools': {} }
+            path = get_cache_path(fips_dir)
+            if os.path.isfile(path) :
+                try :
+                    with open(path, 'r') as f :
+                        dic = json.load(f)
+                    if dic.get('version') == cache_version :
+                        cache = dic
+                except (OSError, ValueError) :
+                    pass
+        return cache
+
+#-------------------------------------------------------------------------------
+def save(fips_dir) :
+    """write the tool-probe cache file, failing to write the cache
+    is not an error
+
+    :param fips_dir:    absolute fips directory
+    """
+    with cache_lock :
+        path = get_cache_path(fips_dir)
+        try :
+            tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+            with open(tmp_path, 'w') as f :
+                json.dump(cache, f, indent=1)
+            os.replace(tmp_path, path)
+        except OSError :
+            pass
+
+#-------------------------------------------------------------------------------
+def clear(fips_dir) :
+    """remove all entries from the tool-probe cache
+
+    :param fips_dir:    absolute fips directory
+    """
+    with cache_lock :
+        load(fips_dir)['tools'] = {}
+        save(fips_dir)
+
+#-------------------------------------------------------------------------------
+def get_exe_path(tool) :
+    """get the resolved executable path of a tool module
+
+    :param tool:    a tool module from mod/tools
+    :returns:       absolute path to the executable, or None
+    """
+    for exe_name in getattr(tool, 'exe_names', [tool.name]) :
+        path = shutil.which(exe_name)
+        if path :
+            return os.path.realpath(path)
+    return None
+
+#-------------------------------------------------------------------------------
+def get_key(tool) :
+    """get the key which decides whether a cached probe is still valid
+
+    :param tool:    a tool module from mod/tools
+    :returns:       dictionary with PATH, executable path and mtime
+    """
+    exe_path = get_exe_path(tool)
+    mtime = None
+    if exe_path :
+        try :
+            mtime = os.stat(exe_path).st_mtime_ns
+        except OSError :
+            pass
+    return {
+        'env_path': os.environ.get('PATH', ''),
+        'exe_path': exe_path,
+        'mtime': mtime
+    }
+
+#-------------------------------------------------------------------------------
+def probe(fips_dir, tool) :
+    """probe a tool, returns the cached result if still valid, otherwise
+    calls the tool's check_exists() function and updates the cache, failed
+    probes are not cached
+
+    :param fips_dir:    absolute fips directory
+    :param tool:        a tool module from mod/tools
+    :returns:           dictionary with found, exe_path and version
+    """
+    if not getattr(tool, 'cache_probe', True) :
+        return { 'found': tool.check_exists(fips_dir), 'exe_path': None, 'version': None, 'cached': False }
+    key = get_key(tool)
+    with cache_lock :
+        entry = load(fips_dir)['tools'].get(tool.name)
+    if entry and entry['key'] == key and (time.time() - entry['time']) < cache_ttl :
+        return dict(entry['result'], cached=True)
+
+    # cache miss, run the actual probe outside the lock, so that
+    # multiple tools can be probed in parallel
+    found = tool.check_exists(fips_dir)
+    version = None
+    if found and hasattr(tool, 'get_version') :
+        version = tool.get_version(fips_dir)
+    result = { 'found': found, 'exe_path': key['exe_path'], 'version': version }
+    with cache_lock :
+        tools = load(fips_dir)['tools']
+        if found :
+            tools[tool.name] = {
+                'key': key,
+                'time': time.time(),
+                'result': result
+            }
+            save(fips_dir)
+        elif tools.pop(tool.name, None) is not None :
+            save(fips_dir)
+    return dict(result, cached=False)
+
+#-------------------------------------------------------------------------------
+def check_exists(fips_dir, tool) :
+    """cached version of a tool module's check_exists() function
+
+    :param fips_dir:    absolute fips directory
+    :param tool:        a tool module from mod/tools
+    :returns:           True if the tool exists
+    """
+    return probe(fips_dir, tool)['found']
@@ -0,0 +1,60 @@
+"""wrapper for the ccache compiler cache"""
+import subprocess
+import shutil
+
+name = 'ccache'
+platforms = ['linux', 'osx', 'win']
+optional = True
+not_found = "used as compiler launcher with 'fips set ccache on' or 'compiler-cache: ccache'"
+
+#------------------------------------------------------------------------------
+def check_exists(fips_dir) :
+    """test if ccache is in the path
+
+    :returns:   True if ccache is in the path
+    """
+    try :
+        subprocess.check_output(['ccache', '--version'])
+        return True
+    except (OSError, subprocess.CalledProcessError) :
+        return False
+
+#------------------------------------------------------------------------------
+def get_version(fips_dir) :
+    """get the ccache version string
+
+    :returns:   version string, or None if ccache not found
+    """
+    try :
+        out = subprocess.check_output(['ccache', '--version']).decode('utf-8')
+        return out.split()[2]
+    except (OSError, subprocess.CalledProcessError, IndexError) :
+        return None
+
+#------------------------------------------------------------------------------
+def get_launcher(fips_dir) :
+    """get the compiler launcher path for CMAKE_<LANG>_COMPILER_LAUNCHER
+
+    :returns:   absolute path to ccache executable, or None
+    """
+    return shutil.which('ccache')
+
+#------------------------------------------------------------------------------
+def get_stats(fips_dir) :
+    """get the current ccache hit and miss counters, this requires
+    ccache 4.x ('ccache --print-stats')
+
+    :returns:   (hits, misses) tuple, or None if not available
+    """
+    try :
+        out = subprocess.check_output(['ccache', '--print-stats'], stderr=subprocess.DEVNULL).decode('utf-8')
+    except (OSError, subprocess.CalledProcessError) :
+        return None
+    stats = {}
+    for line in out.splitlines() :
+        key_val = line.split('\t')
+        if len(key_val) == 2 and key_val[1].strip().isdigit() :
+            stats[key_val[0].strip()] = int(key_val[1])
+    hits = stats.get('direct_cache_hit', 0) + stats.get('preprocessed_cache_hit', 0)
+    misses = stats.get('cache_miss', 0)
+    return (hits, misses)
@@ -10,6 +10,7 @@ name = 'clion'
 platforms = ['osx','linux','win']
 optional = True
 not_found = 'used as IDE with clion configs'
+exe_names = ['clion.sh', 'clion']
 
 #------------------------------------------------------------------------------
 def check_exists(fips_dir) :
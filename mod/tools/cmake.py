@@ -1,13 +1,16 @@
 """wrapper for cmake tool"""
-import subprocess, json
+import os, subprocess, json, threading
 
-from mod import log, util
+from mod import log, util, profiler
 
 name = 'cmake'
 platforms = ['linux', 'osx', 'win']
 optional = False
 not_found = 'please install cmake 3.21 or newer'
 
+# serializes writing the shared CMakeUserPresets.json file
+presets_lock = threading.Lock()
+
 #------------------------------------------------------------------------------
 def check_exists(fips_dir, major=3, minor=21) :
     """test if cmake is in the path and has the required version
@@ -27,21 +30,82 @@ def check_exists(fips_dir, major=3, minor=21) :
         return False
 
 #------------------------------------------------------------------------------
-def run_gen(cfg, fips_dir, project_dir, build_dir, local_build, toolchain_path, defines) :
-    """run cmake tool to generate build files
+def get_version(fips_dir) :
+    """get the cmake version string
+
+    :returns:   version string (e.g. '3.28.3'), or None if cmake not found
+    """
+    try:
+        out = subprocess.check_output(['cmake', '--version']).decode("utf-8")
+        return out.split()[2]
+    except (OSError, subprocess.CalledProcessError, IndexError):
+        return None
+
+#------------------------------------------------------------------------------
+def run_gen(cfg, fips_dir, project_dir, build_dir, local_build, toolchain_path, defines, prefix=None) :
+    """run cmake tool to generate build files, the cmake arguments
+    are taken from the config's presets (which are also merged into
+    CMakeUserPresets.json), so that multiple configs can be generated
+    at the same time
 
     :param cfg:             a fips config object
     :param project_dir:     absolute path to project (must have root CMakeLists.txt file)
     :param build_dir:       absolute path to build directory (where cmake files are generated)
     :param toolchain:       toolchain path or None
+    :param prefix:          optional prefix for each output line (output is captured)
     :returns:               True if cmake returned successful
     """
-    write_presets(cfg, fips_dir, project_dir, build_dir, local_build, toolchain_path, defines)
-    res = subprocess.call('cmake --preset default', cwd=project_dir, shell=True)
+    presets = write_presets(cfg, fips_dir, project_dir, build_dir, local_build, toolchain_path, defines)
+    args = get_configure_args(project_dir, presets['configurePresets'][0])
+    if prefix is None :
+        res = subprocess.call(args, cwd=project_dir)
+    else :
+        res = call_prefixed(args, project_dir, prefix)
     return res == 0
 
 #------------------------------------------------------------------------------
-def run_build(fips_dir, target, build_type, build_dir, num_jobs=1, args=None) :
+def get_configure_args(project_dir, config_preset) :
+    """translate a cmake configure preset into cmake command line args
+
+    :param project_dir:     absolute path to project (must have root CMakeLists.txt file)
+    :param config_preset:   a configure preset dictionary (see write_presets())
+    :returns:               cmake command line as list of strings
+    """
+    args = ['cmake', '-S', project_dir, '-B', config_preset['binaryDir']]
+    if 'generator' in config_preset :
+        args += ['-G', config_preset['generator']]
+    if 'architecture' in config_preset :
+        args += ['-A', config_preset['architecture']]
+    if 'toolset' in config_preset :
+        args += ['-T', config_preset['toolset']]
+    if 'toolchainFile' in config_preset :
+        args.append('-DCMAKE_TOOLCHAIN_FILE={}'.format(config_preset['toolchainFile']))
+    for key, val in config_preset['cacheVariables'].items() :
+        if type(val) is dict :
+            args.append('-D{}:{}={}'.format(key, val['type'], val['value']))
+        else :
+            args.append('-D{}={}'.format(key, val))
+    return args
+
+#------------------------------------------------------------------------------
+def call_prefixed(cmd_line, cwd, prefix, env=None) :
+    """run a command and print its output line by line with
+    a prefix, can be called from multiple threads at once
+
+    :param cmd_line:    the command line string (run in a shell), or list of args
+    :param cwd:         working directory
+    :param prefix:      prefix string for each output line
+    :param env:         optional environment of the command
+    :returns:           the exit code of the command
+    """
+    shell = type(cmd_line) is str
+    proc = subprocess.Popen(cmd_line, cwd=cwd, shell=shell, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    for line in iter(proc.stdout.readline, b'') :
+        log.info(prefix + line.decode('utf-8', errors='replace').rstrip())
+    return proc.wait()
+
+#------------------------------------------------------------------------------
+def run_build(fips_dir, target, build_type, build_dir, num_jobs=1, args=None, prefix=None) :
     """run cmake in build mode
 
     :param target:          build target, can be None (builds all)
@@ -49,6 +113,7 @@ def run_build(fips_dir, target, build_type, build_dir, num_jobs=1, args=None) :
     :param build_dir:       path to the build directory
     :param num_jobs:        number of parallel jobs (default: 1)
     :param args:            optional string array of cmdline args forwarded to build tool
+    :param prefix:          optional prefix for each output line (output is captured)
     :returns:               True if cmake returns successful
     """
     args_str = ''
@@ -62,8 +127,18 @@ def run_build(fips_dir, target, build_type, build_dir, num_jobs=1, args=None) :
     if target :
         cmdLine += ' --target {}'.format(target)
     cmdLine += ' -- {}'.format(args_str)
-    print(cmdLine)
-    res = subprocess.call(cmdLine, cwd=build_dir, shell=True)
+    # the number of parallel code generator processes (see fips-gen.py),
+    # 'fips --profile' also prints the time spent in each generator
+    env = dict(os.environ)
+    env['FIPS_GEN_JOBS'] = str(num_jobs)
+    if profiler.enabled :
+        env['FIPS_GEN_STATS'] = '1'
+    if prefix is None :
+        print(cmdLine)
+        res = subprocess.call(cmdLine, cwd=build_dir, shell=True, env=env)
+    else :
+        log.info(prefix + cmdLine)
+        res = call_prefixed(cmdLine, build_dir, prefix, env)
     return res == 0
 
 #------------------------------------------------------------------------------
@@ -92,15 +167,16 @@ def to_cmake_preset_cache_variable_value(val):
         return val
 
 #------------------------------------------------------------------------------
-def write_presets(cfg, fips_dir, proj_dir, build_dir, local_build, toolchain_path, defines) :
-    """write a CMakeUserPresets.json file
+def get_presets(cfg, fips_dir, proj_dir, build_dir, local_build, toolchain_path, defines) :
+    """get the cmake presets of a config, this is one configure preset and
+    one build preset, both named after the config
 
     :param cfg:             a fips config object
     :param project_dir:     absolute path to project (must have root CMakeLists.txt file)
     :param build_dir:       absolute path to build directory (where cmake files are generated)
     :param toolchain_path:  toolchain path or None
     :param defines:         any additional cmake defines
-    :returns:               True if cmake returned successful
+    :returns:               the presets dictionary
     """
     cmake_presets = {
         'version': 3,
@@ -112,25 +188,15 @@ def write_presets(cfg, fips_dir, proj_dir, build_dir, local_build, toolchain_pat
         'configurePresets': [],
         'buildPresets': [
             {
-                'name': 'default',
-                'configurePreset': 'default',
+                'name': cfg['name'],
+                'configurePreset': cfg['name'],
                 'configuration': cfg['build_type'],
-            },
-            {
-                'name': 'debug',
-                'configurePreset': 'default',
-                'configuration': 'Debug',
-            },
-            {
-                'name': 'release',
-                'configurePreset': 'default',
-                'configuration': 'Release'
             }
         ]
     }
 
     config_preset = {
-        'name': 'default',
+        'name': cfg['name'],
         'displayName': cfg['name'],
         'binaryDir': build_dir,
     }
@@ -140,7 +206,7 @@ def write_presets(cfg, fips_dir, proj_dir, build_dir, local_build, toolchain_pat
     if cfg['generator-platform'] :
         config_preset['architecture'] = cfg['generator-platform']
     if cfg['generator-toolset'] :
-        config_preset['toolset'] = cfg['toolset']
+        config_preset['toolset'] = cfg['generator-toolset']
     if toolchain_path is not None:
         config_preset['toolchainFile'] = toolchain_path
     config_preset['cacheVariables'] = {
@@ -155,6 +221,74 @@ def write_presets(cfg, fips_dir, proj_dir, build_dir, local_build, toolchain_pat
         config_preset['cacheVariables'][key] = to_cmake_preset_cache_variable_value(val)
 
     cmake_presets['configurePresets'].append(config_preset)
+    return cmake_presets
+
+#------------------------------------------------------------------------------
+def merge_presets(old_presets, new_presets) :
+    """merge the presets of one config into existing presets, presets
+    of the same name are replaced, and the single 'default' preset
+    written by older fips versions is removed
+
+    :param old_presets:     existing presets dictionary (can be None)
+    :param new_presets:     presets dictionary from get_presets()
+    :returns:               merged presets dictionary, sorted by name
+    """
+    merged = dict(new_presets)
+    names = [preset['name'] for preset in new_presets['configurePresets']] + ['default']
+    for key in ['configurePresets', 'buildPresets'] :
+        presets = []
+        if old_presets and type(old_presets.get(key)) is list :
+            for preset in old_presets[key] :
+                if type(preset) is dict and preset.get('name') not in names and preset.get('configurePreset') not in names :
+                    presets.append(preset)
+        presets.extend(new_presets[key])
+        merged[key] = sorted(presets, key=lambda preset: preset.get('name', ''))
+    return merged
+
+#------------------------------------------------------------------------------
+def write_if_different(path, content) :
+    """write a text file, but only if the content is different from
+    the existing file, this prevents IDEs and cmake from picking up
+    unnecessary changes
+
+    :param path:        absolute file path
+    :param content:     new file content string
+    :returns:           True if the file was written
+    """
+    if os.path.isfile(path) :
+        with open(path, 'r') as f :
+            if f.read() == content :
+                return False
+    tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+    with open(tmp_path, 'w') as f :
+        f.write(content)
+    os.replace(tmp_path, path)
+    return True
 
-    with open('{}/CMakeUserPresets.json'.format(proj_dir), 'w') as f:
-        f.write(json.dumps(cmake_presets, indent=2))
+#------------------------------------------------------------------------------
+def write_presets(cfg, fips_dir, proj_dir, build_dir, local_build, toolchain_path, defines) :
+    """merge the cmake presets of a config into the CMakeUserPresets.json
+    file in the project directory, which has a configure and build preset
+    for each generated config (for IDEs). The file is only written if its
+    content changes.
+
+    :param cfg:             a fips config object
+    :param project_dir:     absolute path to project (must have root CMakeLists.txt file)
+    :param build_dir:       absolute path to build directory (where cmake files are generated)
+    :param toolchain_path:  toolchain path or None
+    :param defines:         any additional cmake defines
+    :returns:               the presets dictionary of the config
+    """
+    cmake_presets = get_presets(cfg, fips_dir, proj_dir, build_dir, local_build, toolchain_path, defines)
+    with presets_lock :
+        path = '{}/CMakeUserPresets.json'.format(proj_dir)
+        old_presets = None
+        if os.path.isfile(path) :
+            try :
+                with open(path, 'r') as f :
+                    old_presets = json.load(f)
+            except ValueError :
+                log.warn("failed to parse '{}', overwriting".format(path))
+        merged_presets = merge_presets(old_presets, cmake_presets)
+        write_if_different(path, json.dumps(merged_presets, indent=2))
+    return cmake_presets
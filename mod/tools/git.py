@@ -32,7 +32,7 @@ def check_exists_with_error():
         return False
 
 #-------------------------------------------------------------------------------
-def clone(url, branch, depth, name, cwd, recursive=True) :
+def clone(url, branch, depth, name, cwd, recursive=True, quiet=False) :
     """git clone a remote git repo
 
     :param url:         the git url to clone from
@@ -41,10 +41,13 @@ def clone(url, branch, depth, name, cwd, recursive=True) :
     :param name:        the directory name to clone into
     :param cwd:         the directory where to run git
     :param recursive:   whether to clone with --recursive (default: True)
+    :param quiet:       suppress git progress output (default: False)
     :returns:           True if git returns successful
     """
     check_exists_with_error()
     cmd = 'git clone'
+    if quiet:
+        cmd += ' --quiet'
     if recursive:
         cmd += ' --recursive'
     if branch:
@@ -135,25 +138,43 @@ def has_local_changes(proj_dir):
         return True
 
 #-------------------------------------------------------------------------------
-def update_submodule(proj_dir, recursive=True):
+def update_submodule(proj_dir, recursive=True, quiet=False):
     """runs a 'git submodule sync [--recursive]' followed by a
     git submodule update [--recursive]' on the provided git repo,
     unconditionally (it will *not* check for local changes)
 
     :param proj_dir:    a git repo dir
     :param recursive:   whether to add --recursive (default: True)
+    :param quiet:       suppress git progress output (default: False)
+    :returns:           True if both git commands return successful
     """
     check_exists_with_error()
     sync_cmd = 'git submodule sync'
     upd_cmd = 'git submodule update'
+    if quiet:
+        sync_cmd = 'git submodule --quiet sync'
+        upd_cmd = 'git submodule --quiet update'
     if recursive:
         sync_cmd += ' --recursive'
         upd_cmd += ' --recursive'
-    try:
-        subprocess.call(sync_cmd, cwd=proj_dir, shell=True)
-        subprocess.call(upd_cmd, cwd=proj_dir, shell=True)
-    except subprocess.CalledProcessError:
-        log.error("Failed to call 'git submodule sync/update'")
+    if subprocess.call(sync_cmd, cwd=proj_dir, shell=True) != 0 :
+        return False
+    return subprocess.call(upd_cmd, cwd=proj_dir, shell=True) == 0
+
+#-------------------------------------------------------------------------------
+def pull(proj_dir, quiet=False):
+    """runs a git pull && git submodule update [--recursive] on the
+    provided git repo, unconditionally (it will *not* check for local changes)
+
+    :param proj_dir:    a git repo dir
+    :param quiet:       suppress git progress output (default: False)
+    :returns:           True if git pull and the submodule update return successful
+    """
+    check_exists_with_error()
+    res = subprocess.call('git pull --quiet' if quiet else 'git pull', cwd=proj_dir, shell=True)
+    if res != 0 :
+        return False
+    return update_submodule(proj_dir, quiet=quiet)
 
 #-------------------------------------------------------------------------------
 def update(proj_dir):
@@ -203,20 +224,23 @@ def get_branches(proj_dir) :
     return branches;
 
 #-------------------------------------------------------------------------------
-def checkout(proj_dir, revision) :
-    """checkout a specific revision hash of a repository
+def checkout(proj_dir, revision, quiet=False) :
+    """checkout a specific revision hash of a repository, failing to
+    checkout is not a fatal error, the caller must check the result
 
     :param proj_dir:    a git repo dir
     :param revision:    SHA1 hash of the commit
+    :param quiet:       suppress git progress output (default: False)
     :returns:           True if git returns successful
     """
+    cmd = 'git checkout --quiet {}' if quiet else 'git checkout {}'
     try :
-        output = subprocess.check_output('git checkout {}'.format(revision), cwd=proj_dir, shell=True).decode("utf-8")
-        update_submodule(proj_dir)
-        return output.split(':')[0] != 'error'
+        output = subprocess.check_output(cmd.format(revision), cwd=proj_dir, shell=True).decode("utf-8")
     except subprocess.CalledProcessError :
-        log.error("failed to call 'git checkout'")
-        return None
+        return False
+    if output.split(':')[0] == 'error' :
+        return False
+    return update_submodule(proj_dir, quiet=quiet)
 
 #-------------------------------------------------------------------------------
 def has_uncommitted_files(proj_dir) :
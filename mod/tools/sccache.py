@@ -0,0 +1,57 @@
+"""wrapper for the sccache compiler cache"""
+import subprocess
+import shutil
+import json
+
+name = 'sccache'
+platforms = ['linux', 'osx', 'win']
+optional = True
+not_found = "used as compiler launcher with 'fips set ccache on' or 'compiler-cache: sccache'"
+
+#------------------------------------------------------------------------------
+def check_exists(fips_dir) :
+    """test if sccache is in the path
+
+    :returns:   True if sccache is in the path
+    """
+    try :
+        subprocess.check_output(['sccache', '--version'])
+        return True
+    except (OSError, subprocess.CalledProcessError) :
+        return False
+
+#------------------------------------------------------------------------------
+def get_version(fips_dir) :
+    """get the sccache version string
+
+    :returns:   version string, or None if sccache not found
+    """
+    try :
+        out = subprocess.check_output(['sccache', '--version']).decode('utf-8')
+        return out.split()[1]
+    except (OSError, subprocess.CalledProcessError, IndexError) :
+        return None
+
+#------------------------------------------------------------------------------
+def get_launcher(fips_dir) :
+    """get the compiler launcher path for CMAKE_<LANG>_COMPILER_LAUNCHER
+
+    :returns:   absolute path to sccache executable, or None
+    """
+    return shutil.which('sccache')
+
+#------------------------------------------------------------------------------
+def get_stats(fips_dir) :
+    """get the current sccache hit and miss counters (this also
+    starts the sccache server if it isn't running yet)
+
+    :returns:   (hits, misses) tuple, or None if not available
+    """
+    try :
+        out = subprocess.check_output(['sccache', '--show-stats', '--stats-format', 'json'], stderr=subprocess.DEVNULL).decode('utf-8')
+        stats = json.loads(out)['stats']
+        hits = sum(stats['cache_hits']['counts'].values())
+        misses = sum(stats['cache_misses']['counts'].values())
+        return (hits, misses)
+    except (OSError, subprocess.CalledProcessError, ValueError, KeyError, TypeError) :
+        return None
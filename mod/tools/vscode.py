@@ -6,6 +6,7 @@ name = 'vscode'
 platforms = ['osx','linux','win']
 optional = True
 not_found = 'used as IDE with vscode configs'
+exe_names = ['code', 'code-insiders', 'code-oss']
 
 #------------------------------------------------------------------------------
 def try_exists(exe_name):
@@ -7,6 +7,8 @@ name = 'vscode-cmaketools'
 platforms = ['osx','linux','win']
 optional = True
 not_found = 'https://marketplace.visualstudio.com/items?itemName=ms-vscode.cmake-tools'
+# installed extensions can't be detected from the 'code' executable
+cache_probe = False
 
 #------------------------------------------------------------------------------
 def check_exists(fips_dir) :
@@ -7,6 +7,8 @@ name = 'wasm-dwarf-debugging'
 platforms = ['osx','linux','win']
 optional = True
 not_found = 'https://marketplace.visualstudio.com/items?itemName=ms-vscode.wasm-dwarf-debugging'
+# installed extensions can't be detected from the 'code' executable
+cache_probe = False
 
 #------------------------------------------------------------------------------
 def check_exists(fips_dir) :
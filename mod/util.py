@@ -2,7 +2,9 @@
 
 import os.path
 import sys
+import copy
 import platform
+import threading
 import multiprocessing
 import yaml
 from mod import log
@@ -13,6 +15,11 @@ host_platforms = {
     'Windows':  'win'
 }
 
+# process-wide cache of parsed fips.yml files, path: ((mtime, size), content)
+fips_yml_cache = {}
+fips_yml_stats = { 'parsed': 0, 'cached': 0 }
+fips_yml_lock = threading.Lock()
+
 #-------------------------------------------------------------------------------
 def fix_path(path) :
     """if on Windows, replace backslashes in path with forward slashes
@@ -193,19 +200,54 @@ def get_project_name_from_dir(proj_dir) :
 
 #-------------------------------------------------------------------------------
 def load_fips_yml(proj_dir) :
-    """load the fips.yml file from project directory
+    """load the fips.yml file from project directory, the parsed content
+    is cached for the whole process and only parsed again when the
+    file's mtime or size changes (see invalidate_fips_yml())
 
     :param proj_dir:    absolute project directory
-    :returns:           dictionary object
+    :returns:           dictionary object (a copy, may be modified by caller)
     """
     dic = None
     path = proj_dir + '/fips.yml'
     if os.path.isfile(path) :
-        with open(path, 'r') as f:
-            dic = yaml.load(f)
+        stat = os.stat(path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        with fips_yml_lock :
+            entry = fips_yml_cache.get(path)
+            if entry and entry[0] == key :
+                fips_yml_stats['cached'] += 1
+                dic = entry[1]
+            else :
+                with open(path, 'r') as f:
+                    dic = yaml.load(f, Loader=yaml.SafeFastLoader)
+                fips_yml_stats['parsed'] += 1
+                fips_yml_cache[path] = (key, dic)
     if not dic :
         dic = {}
-    return dic
+    return copy.deepcopy(dic)
+
+#-------------------------------------------------------------------------------
+def invalidate_fips_yml(proj_dir=None) :
+    """drop a project's fips.yml from the process-wide cache, this must be
+    called by code which writes fips.yml files
+
+    :param proj_dir:    absolute project directory, or None to drop all
+    """
+    with fips_yml_lock :
+        if proj_dir is None :
+            fips_yml_cache.clear()
+        else :
+            fips_yml_cache.pop(proj_dir + '/fips.yml', None)
+
+#-------------------------------------------------------------------------------
+def get_fips_yml_stats() :
+    """get the fips.yml cache counters of this process
+
+    :returns:   dictionary with 'parsed' (number of YAML parses) and
+                'cached' (number of parses avoided by the cache)
+    """
+    with fips_yml_lock :
+        return dict(fips_yml_stats)
 
 #-------------------------------------------------------------------------------
 def lookup_target_cwd(proj_dir, target) :
@@ -304,7 +346,7 @@ def get_cfg_target_list(fips_dir, proj_dir, cfg):
         targets = []
         with open(targets_path) as f :
             # NOTE: targets will be None if the file is empty
-            targets = yaml.load(f)
+            targets = yaml.load(f, Loader=yaml.SafeFastLoader)
             if targets is None:
                 targets = []
         return True, targets
@@ -317,3 +359,21 @@ def get_num_cpucores():
         return multiprocessing.cpu_count()
     except NotImplementedError :
         return 2
+
+#-------------------------------------------------------------------------------
+def parse_jobs_arg(args, what) :
+    """remove an optional '-j N' arg from verb args
+
+    :param args:    list of verb args
+    :param what:    what runs in parallel, for the error message (e.g. 'git clones')
+    :returns:       number of jobs (None if no '-j' arg) and the remaining args
+    """
+    num_jobs = None
+    if '-j' in args :
+        idx = args.index('-j')
+        if idx + 1 < len(args) and args[idx + 1].isdigit() :
+            num_jobs = int(args[idx + 1])
+            args = args[:idx] + args[(idx + 2):]
+        else :
+            log.error("expected number of parallel {} after '-j'".format(what))
+    return num_jobs, args
@@ -13,64 +13,90 @@ from collections import OrderedDict
 
 from mod import log, util, dep
 
-# dictionary of "name: module"
+# dictionary of "name: module" (only contains verbs which have been loaded)
 verbs = {}
 
+# dictionary of "name: (verb_dir, path)" of all known verbs
+verb_paths = {}
+
 # dictionary of "projname: name"
 proj_verbs = OrderedDict()
 
 #-------------------------------------------------------------------------------
-def import_verbs_from(proj_name, proj_dir, verb_dir) :
-    """import all verb modules from a directory, populates the
-    verb and proj_verbs global variables
+def index_verbs_from(proj_name, proj_dir, verb_dir) :
+    """find all verb modules in a directory without importing them,
+    populates the verb_paths and proj_verbs global variables, verbs
+    with the same name override previously indexed verbs
 
     :param proj_dir:    name of project that owns verb_dir
     :param verb_dir:    directory with verb python scripts (can be None)
     """
-    global verbs, proj_verbs
+    global verb_paths, proj_verbs
 
     # make sure project-verbs find their modules
     sys.path.insert(0, proj_dir)
 
     if verb_dir and os.path.isdir(verb_dir):
         # get all .py file in verb dir
-        verb_paths = glob.glob(verb_dir + '/*.py')
-        if verb_paths :
-            for verb_path in verb_paths :
+        verb_paths_in_dir = glob.glob(verb_dir + '/*.py')
+        if verb_paths_in_dir :
+            for verb_path in verb_paths_in_dir :
                 verb_module_name = os.path.split(verb_path)[1]
                 verb_module_name = os.path.splitext(verb_module_name)[0]
                 if not verb_module_name.startswith('__') :
-                    if is_python3:
-                        spec = importlib.util.spec_from_file_location(verb_module_name, verb_path)
-                        verb_module = importlib.util.module_from_spec(spec)
-                        spec.loader.exec_module(verb_module)
-                    else:
-                        # FIXME: PYTHON2
-                        fp, pathname, desc = imp.find_module(verb_module_name, [verb_dir])
-                        verb_module = imp.load_module(verb_module_name, fp, pathname, desc)
-                    verbs[verb_module_name] = verb_module
+                    verb_paths[verb_module_name] = (verb_dir, verb_path)
                     if proj_name not in proj_verbs :
                         proj_verbs[proj_name] = []
                     proj_verbs[proj_name].append(verb_module_name)
 
 #-------------------------------------------------------------------------------
 def import_verbs(fips_dir, proj_dir) :
-    """import verbs from local and imported projects, populates
-    the 'verbs' and 'proj_verbs' dictionaries
+    """find verbs in local and imported projects, populates the
+    'verb_paths' and 'proj_verbs' dictionaries, the verb modules
+    are only imported on demand with load_verb()
 
     :param fipsdir:     absolute fips directory
     :param proj_dir:    absolute project directory
     """
 
-    # first import verbs from fips directory
-    import_verbs_from('fips', fips_dir, fips_dir + '/verbs')
+    # first find verbs in fips directory
+    index_verbs_from('fips', fips_dir, fips_dir + '/verbs')
 
     # now go through all imported projects
     if fips_dir != proj_dir :
         _, imported_projs = dep.get_all_imports_exports(fips_dir, proj_dir)
         for imported_proj_name in imported_projs :
             imported_proj_dir = imported_projs[imported_proj_name]['proj_dir']
-            import_verbs_from(imported_proj_name, imported_proj_dir, util.get_verbs_dir(imported_proj_dir))
+            index_verbs_from(imported_proj_name, imported_proj_dir, util.get_verbs_dir(imported_proj_dir))
 
+#-------------------------------------------------------------------------------
+def load_verb(verb_name) :
+    """import a verb module found by import_verbs(), and add
+    it to the 'verbs' dictionary
 
+    :param verb_name:   name of the verb
+    :returns:           the verb module, or None if verb doesn't exist
+    """
+    global verbs
+    if verb_name not in verbs :
+        if verb_name not in verb_paths :
+            return None
+        verb_dir, verb_path = verb_paths[verb_name]
+        if is_python3:
+            spec = importlib.util.spec_from_file_location(verb_name, verb_path)
+            verb_module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(verb_module)
+        else:
+            # FIXME: PYTHON2
+            fp, pathname, desc = imp.find_module(verb_name, [verb_dir])
+            verb_module = imp.load_module(verb_name, fp, pathname, desc)
+        verbs[verb_name] = verb_module
+    return verbs[verb_name]
 
+#-------------------------------------------------------------------------------
+def load_all_verbs() :
+    """import all verb modules found by import_verbs() (only needed
+    for 'fips help')
+    """
+    for verb_name in verb_paths :
+        load_verb(verb_name)
@@ -5,6 +5,11 @@
 """
 import os
 import sys
+import time
+import types
+import tempfile
+import traceback
+import multiprocessing
 # FIXME PYTHON3
 is_python3 = sys.version_info > (3,5)
 if is_python3:
@@ -16,8 +21,24 @@ else:
 # imported generator paths
 gen_paths = [ $genpaths ]
 
+# max number of generator processes, 'fips build' passes the 'jobs'
+# setting in FIPS_GEN_JOBS, otherwise (e.g. in IDE builds) the number
+# of CPU cores is used
+def getNumJobs() :
+    try :
+        return max(1, int(os.environ.get('FIPS_GEN_JOBS', '')))
+    except ValueError :
+        return multiprocessing.cpu_count()
+gen_jobs = getNumJobs()
+
+# the time spent in each generator is only printed if FIPS_GEN_STATS is set
+# ('fips --profile build' sets it)
+gen_stats = bool(os.environ.get('FIPS_GEN_STATS'))
+
 # make imported generator modules visible to python module system
 for path in gen_paths :
+    if path in sys.path :
+        sys.path.remove(path)
     sys.path.insert(0, path)
 
 # yaml module is under the fips directory
@@ -25,9 +46,97 @@ import yaml
 from mod import log
 import genutil
 
-def processFile(attrs) :
-    # dynamically load (and execute) the generator module
+# generator modules by generator path, each generator is only loaded once
+generators = {}
+# per-generator [number of items, cumulative time in seconds]
+generator_stats = {}
+# modules imported while loading a generator, by generator path
+generator_imports = {}
+# helper module files by generator path
+generator_helpers = {}
+
+def loadGenerator(attrs) :
+    # dynamically load the generator module, or return the already loaded module
     absPyPath = attrs['generator']
+    if absPyPath in generators :
+        return generators[absPyPath]
+    path, script = os.path.split(absPyPath)
+    if path not in sys.path :
+        sys.path.insert(0, path)
+    moduleName, ext = os.path.splitext(script)
+    loaded = set(sys.modules)
+    if is_python3:
+        module = importlib.import_module(moduleName)
+    else:
+        # FIXME PYTHON2
+        fp, pathname, description = imp.find_module(moduleName)
+        module = imp.load_module(moduleName, fp, pathname, description)
+    generators[absPyPath] = module
+    generator_imports[absPyPath] = [sys.modules[name] for name in set(sys.modules) - loaded]
+    return module
+
+def isHelperModule(module) :
+    # check if a module was found in one of the generator paths,
+    # fips' own modules (mod, yaml) are not considered helpers
+    top = sys.modules.get(module.__name__.partition('.')[0])
+    path = getattr(top, '__file__', None)
+    if not path :
+        return False
+    root = os.path.dirname(path)
+    if hasattr(top, '__path__') :
+        # a package, the search path is the parent directory
+        root = os.path.dirname(root)
+    root = os.path.normpath(root)
+    fips_dir = os.path.normpath(os.path.dirname(os.path.dirname(log.__file__)))
+    return root != fips_dir and root in [os.path.normpath(p) for p in gen_paths]
+
+def getHelperFiles(attrs) :
+    # return the files of the helper modules used by a generator, these
+    # are the modules imported while loading the generator, and the
+    # modules, functions and classes referenced by the generator module
+    absPyPath = attrs['generator']
+    if absPyPath in generator_helpers :
+        return generator_helpers[absPyPath]
+    module = loadGenerator(attrs)
+    seen = set([module])
+    seen.update(dep for dep in generator_imports[absPyPath] if isHelperModule(dep))
+    stack = list(seen)
+    while stack :
+        for value in list(vars(stack.pop()).values()) :
+            if isinstance(value, types.ModuleType) :
+                dep = value
+            else :
+                name = getattr(value, '__module__', None)
+                dep = sys.modules.get(name) if isinstance(name, str) else None
+            if dep is not None and dep not in seen and isHelperModule(dep) :
+                seen.add(dep)
+                stack.append(dep)
+    files = sorted(os.path.abspath(dep.__file__) for dep in seen
+        if dep is not module and getattr(dep, '__file__', None))
+    generator_helpers[absPyPath] = files
+    return files
+
+def mergeStats(stats) :
+    for name, (num, duration) in stats.items() :
+        if name not in generator_stats :
+            generator_stats[name] = [0, 0.0]
+        generator_stats[name][0] += num
+        generator_stats[name][1] += duration
+
+def printStats() :
+    for name in sorted(generator_stats) :
+        num, duration = generator_stats[name]
+        print('fips-gen: {}: {} item(s), {:.3f}s'.format(name, num, duration))
+
+def getOutputs(attrs) :
+    return [path for path in [attrs['out_src'], attrs['out_hdr']] if path]
+
+def isParallel(attrs) :
+    # generators can opt out of parallel processing with 'parallel = False'
+    return getattr(loadGenerator(attrs), 'parallel', True)
+
+def processFile(attrs) :
+    # load and execute the generator module
     input = attrs['in']
     out_src = attrs['out_src']
     out_hdr = attrs['out_hdr']
@@ -40,26 +149,114 @@ def processFile(attrs) :
     else :
         env = None
     genutil.setEnv(env)
-    path, script = os.path.split(absPyPath)
-    sys.path.insert(0, path)
-    moduleName, ext = os.path.splitext(script)
-    if is_python3:
-        module = importlib.import_module(moduleName)
-    else:
-        # FIXME PYTHON2
-        fp, pathname, description = imp.find_module(moduleName)
-        module = imp.load_module(moduleName, fp, pathname, description)
-    if args :
-        module.generate(input, out_src, out_hdr, args)
-    else :
-        module.generate(input, out_src, out_hdr)
+    module = loadGenerator(attrs)
+    start = time.time()
+    try :
+        genutil.beginItem(module.__file__, args, getOutputs(attrs))
+        # changing the generator script or a helper module runs the generator
+        # again, the script is listed in the depfile because it may be found
+        # in a directory which isn't in the cmake dependencies
+        genutil.addDependencies([os.path.abspath(module.__file__)] + getHelperFiles(attrs))
+        if args :
+            deps = module.generate(input, out_src, out_hdr, args)
+        else :
+            deps = module.generate(input, out_src, out_hdr)
+        # generate() can return a list of additional input files
+        if isinstance(deps, (list, tuple)) :
+            genutil.addDependencies(deps)
+        return genutil.endItem()
+    finally :
+        mergeStats({ module.__name__: (1, time.time() - start) })
 
-#=== entry point
-if len(sys.argv) == 2 :
-    with open(sys.argv[1], 'r') as f :
-        items = yaml.load(f)
-        for attrs in items :
+def initWorker(dbPath) :
+    genutil.openStateDb(dbPath)
+
+def processFileInWorker(attrs) :
+    # run one item in a worker process, the output is captured and
+    # printed by the main process so that error messages don't interleave,
+    # stdout and stderr are redirected at the file descriptor level so that
+    # the output of subprocesses started by the generator is captured too,
+    # returns (exit code, output, state entries, generator stats)
+    generator_stats.clear()
+    code = 0
+    entries = {}
+    with tempfile.TemporaryFile() as out :
+        sys.stdout.flush()
+        sys.stderr.flush()
+        saved_fds = [os.dup(1), os.dup(2)]
+        os.dup2(out.fileno(), 1)
+        os.dup2(out.fileno(), 2)
+        try :
+            entries = processFile(attrs)
+        except SystemExit as e :
+            if e.code is None or isinstance(e.code, int) :
+                code = e.code or 0
+            else :
+                print(e.code)
+                code = 1
+        except Exception :
+            traceback.print_exc(file=sys.stdout)
+            code = 1
+        finally :
+            sys.stdout.flush()
+            sys.stderr.flush()
+            for fd, saved_fd in enumerate(saved_fds, 1) :
+                os.dup2(saved_fd, fd)
+                os.close(saved_fd)
+        out.seek(0)
+        output = out.read().decode(sys.stdout.encoding or 'utf-8', 'replace')
+    return code, output, entries, dict(generator_stats)
+
+def processFiles(items, dbPath) :
+    # generators which opted out run one after another in this process,
+    # all others in a process pool
+    parallel_items = []
+    for attrs in items :
+        if isParallel(attrs) :
+            parallel_items.append(attrs)
+        else :
             processFile(attrs)
-else :
-    print('Needs full path to a generator .yml file!')
-    exit(10)
+    num_procs = min(gen_jobs, len(parallel_items))
+    if num_procs <= 1 :
+        for attrs in parallel_items :
+            processFile(attrs)
+        return 0
+    result = 0
+    pool = multiprocessing.Pool(num_procs, initWorker, (dbPath,))
+    try :
+        for code, output, entries, stats in pool.imap(processFileInWorker, parallel_items) :
+            if output :
+                sys.stdout.write(output)
+                sys.stdout.flush()
+            genutil.updateStateDb(entries)
+            mergeStats(stats)
+            if code != 0 and result == 0 :
+                result = code
+    finally :
+        pool.close()
+        pool.join()
+    return result
+
+#=== entry point
+if __name__ == '__main__' :
+    if len(sys.argv) == 2 :
+        with open(sys.argv[1], 'r') as f :
+            items = yaml.load(f, Loader=yaml.SafeFastLoader)
+        # the generator state database and the depfile for the cmake
+        # custom command live next to the .yml file
+        basePath = os.path.splitext(sys.argv[1])[0]
+        dbPath = basePath + '.state.json'
+        genutil.openStateDb(dbPath)
+        try :
+            result = processFiles(items, dbPath)
+        finally :
+            genutil.saveStateDb()
+            outputs = [output for attrs in items for output in getOutputs(attrs)]
+            genutil.writeDepfile(basePath + '.d', basePath + '.stamp', genutil.getDependencies(outputs))
+            if gen_stats :
+                printStats()
+        if result != 0 :
+            sys.exit(result)
+    else :
+        print('Needs full path to a generator .yml file!')
+        exit(10)
@@ -0,0 +1,9 @@
+"""pytest setup, makes the fips modules and the vendored yaml package
+importable from the tests
+"""
+
+import os
+import sys
+
+fips_dir = os.path.normpath(os.path.dirname(os.path.abspath(__file__)) + '/..')
+sys.path.insert(0, fips_dir)
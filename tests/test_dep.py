@@ -0,0 +1,208 @@
+"""tests for fetching and updating project imports (mod/dep.py)"""
+
+import os
+import subprocess
+
+import pytest
+
+from mod import dep, util
+
+#-------------------------------------------------------------------------------
+def git(cwd, *args) :
+    """run a git command with a fixed identity"""
+    subprocess.check_output(['git', '-c', 'user.name=fips', '-c', 'user.email=fips@localhost'] + list(args),
+        cwd=cwd, stderr=subprocess.STDOUT)
+
+#-------------------------------------------------------------------------------
+def make_repo(path, fips_yml, files=None) :
+    """create a git repo with a fips.yml file and optional extra files"""
+    os.makedirs(path)
+    with open(path + '/fips.yml', 'w') as f :
+        f.write(fips_yml)
+    for name, content in (files or {}).items() :
+        with open(path + '/' + name, 'w') as f :
+            f.write(content)
+    git(path, 'init', '--quiet')
+    git(path, 'add', '.')
+    git(path, 'commit', '--quiet', '-m', 'initial')
+    return path
+
+#-------------------------------------------------------------------------------
+def imports_yml(imports) :
+    """create the content of a fips.yml file with imports as
+    (name, git-url, extra-lines) tuples
+    """
+    lines = ['imports:\n']
+    for name, url, extra in imports :
+        lines.append('    {}:\n'.format(name))
+        lines.append('        git: {}\n'.format(url))
+        for key, value in extra.items() :
+            lines.append('        {}: {}\n'.format(key, value))
+    return ''.join(lines)
+
+#-------------------------------------------------------------------------------
+@pytest.fixture
+def workspace(tmp_path) :
+    """a workspace with a (fake) fips directory, and a directory for
+    remote repositories
+    """
+    ws_dir = str(tmp_path / 'ws')
+    os.makedirs(ws_dir + '/fips')
+    remotes_dir = str(tmp_path / 'remotes')
+    os.makedirs(remotes_dir)
+    util.invalidate_fips_yml()
+    yield ws_dir, ws_dir + '/fips', remotes_dir
+    util.invalidate_fips_yml()
+
+#-------------------------------------------------------------------------------
+def read_marker(path) :
+    with open(path + '/marker.txt', 'r') as f :
+        return f.read()
+
+#-------------------------------------------------------------------------------
+@pytest.mark.parametrize('num_jobs', [1, 4])
+def test_fetch_nested_definition_wins(workspace, num_jobs) :
+    # proj imports depa and depb, and depa imports another depb, as
+    # in a depth-first walk, the definition inside depa wins
+    ws_dir, fips_dir, remotes_dir = workspace
+    make_repo(remotes_dir + '/depb1', '', { 'marker.txt': 'depb1' })
+    make_repo(remotes_dir + '/depb2', '', { 'marker.txt': 'depb2' })
+    make_repo(remotes_dir + '/depa', imports_yml([('depb', 'file://' + remotes_dir + '/depb2', {})]))
+    proj_dir = make_repo(ws_dir + '/proj', imports_yml([
+        ('depa', 'file://' + remotes_dir + '/depa', {}),
+        ('depb', 'file://' + remotes_dir + '/depb1', {})
+    ]))
+    dep.fetch_imports(fips_dir, proj_dir, num_jobs)
+    assert read_marker(ws_dir + '/depb') == 'depb2'
+    assert list(dep.get_all_imports_exports(fips_dir, proj_dir)[1]) == ['depb', 'depa', 'proj']
+
+#-------------------------------------------------------------------------------
+@pytest.mark.parametrize('num_jobs', [1, 4])
+def test_fetch_top_level_definition_wins(workspace, num_jobs) :
+    # proj imports depb before depa, the top-level definition wins
+    ws_dir, fips_dir, remotes_dir = workspace
+    make_repo(remotes_dir + '/depb1', '', { 'marker.txt': 'depb1' })
+    make_repo(remotes_dir + '/depb2', '', { 'marker.txt': 'depb2' })
+    make_repo(remotes_dir + '/depa', imports_yml([('depb', 'file://' + remotes_dir + '/depb2', {})]))
+    proj_dir = make_repo(ws_dir + '/proj', imports_yml([
+        ('depb', 'file://' + remotes_dir + '/depb1', {}),
+        ('depa', 'file://' + remotes_dir + '/depa', {})
+    ]))
+    dep.fetch_imports(fips_dir, proj_dir, num_jobs)
+    assert read_marker(ws_dir + '/depb') == 'depb1'
+
+#-------------------------------------------------------------------------------
+@pytest.mark.parametrize('num_jobs', [1, 4])
+def test_fetch_deep_definition_wins(workspace, num_jobs) :
+    # the winning definition of depb is only found after depa and depx
+    # have been cloned, at that point depb has already been cloned with
+    # the top-level definition, and depc which only the top-level depb
+    # imports has been cloned too
+    ws_dir, fips_dir, remotes_dir = workspace
+    make_repo(remotes_dir + '/depc', '', { 'marker.txt': 'depc' })
+    make_repo(remotes_dir + '/depb1', imports_yml([('depc', 'file://' + remotes_dir + '/depc', {})]), { 'marker.txt': 'depb1' })
+    make_repo(remotes_dir + '/depb2', '', { 'marker.txt': 'depb2' })
+    make_repo(remotes_dir + '/depx', imports_yml([('depb', 'file://' + remotes_dir + '/depb2', {})]))
+    make_repo(remotes_dir + '/depa', imports_yml([('depx', 'file://' + remotes_dir + '/depx', {})]))
+    proj_dir = make_repo(ws_dir + '/proj', imports_yml([
+        ('depa', 'file://' + remotes_dir + '/depa', {}),
+        ('depb', 'file://' + remotes_dir + '/depb1', {})
+    ]))
+    dep.fetch_imports(fips_dir, proj_dir, num_jobs)
+    assert read_marker(ws_dir + '/depb') == 'depb2'
+    assert not os.path.exists(ws_dir + '/depc')
+    assert sorted(dep.get_all_imports_exports(fips_dir, proj_dir)[1]) == ['depa', 'depb', 'depx', 'proj']
+
+#-------------------------------------------------------------------------------
+def test_fetch_existing_dir_is_kept(workspace) :
+    ws_dir, fips_dir, remotes_dir = workspace
+    make_repo(remotes_dir + '/depb2', '', { 'marker.txt': 'depb2' })
+    make_repo(remotes_dir + '/depa', imports_yml([('depb', 'file://' + remotes_dir + '/depb2', {})]))
+    make_repo(ws_dir + '/depb', '', { 'marker.txt': 'local' })
+    proj_dir = make_repo(ws_dir + '/proj', imports_yml([
+        ('depa', 'file://' + remotes_dir + '/depa', {}),
+        ('depb', 'file://' + remotes_dir + '/depb1', {})
+    ]))
+    dep.fetch_imports(fips_dir, proj_dir, 4)
+    assert read_marker(ws_dir + '/depb') == 'local'
+
+#-------------------------------------------------------------------------------
+def test_fetch_failure(workspace, capsys) :
+    # a failed checkout doesn't stop the other clones, the failed
+    # imports are listed at the end
+    ws_dir, fips_dir, remotes_dir = workspace
+    make_repo(remotes_dir + '/depa', '')
+    make_repo(remotes_dir + '/depb', '')
+    proj_dir = make_repo(ws_dir + '/proj', imports_yml([
+        ('depa', 'file://' + remotes_dir + '/depa', { 'rev': 'deadbeefdeadbeef' }),
+        ('depb', 'file://' + remotes_dir + '/depb', {}),
+        ('depc', 'file://' + remotes_dir + '/depc', {})
+    ]))
+    with pytest.raises(SystemExit) :
+        dep.fetch_imports(fips_dir, proj_dir, 4)
+    out = capsys.readouterr().out
+    assert os.path.isdir(ws_dir + '/depb/.git')
+    assert "failed to checkout revision 'deadbeefdeadbeef'" in out
+    assert 'failed to fetch imports: depa, depc' in out
+
+#-------------------------------------------------------------------------------
+def test_update_failure_summary(workspace, capsys) :
+    ws_dir, fips_dir, remotes_dir = workspace
+    make_repo(remotes_dir + '/depa', '')
+    make_repo(remotes_dir + '/depb', '')
+    git(ws_dir, 'clone', '--quiet', remotes_dir + '/depa', 'depa')
+    git(ws_dir, 'clone', '--quiet', remotes_dir + '/depb', 'depb')
+    proj_dir = make_repo(ws_dir + '/proj', imports_yml([
+        ('depa', 'file://' + remotes_dir + '/depa', { 'rev': 'deadbeefdeadbeef' }),
+        ('depb', 'file://' + remotes_dir + '/depb', {})
+    ]))
+
+    # a failed checkout must not exit the process, but show up in the summary
+    assert dep.update_imports(fips_dir, proj_dir, 2) == False
+    out = capsys.readouterr().out
+    assert '=== update summary:' in out
+    lines = [line for line in out.splitlines() if line.startswith('  dep')]
+    assert len(lines) == 2
+    assert 'failed' in lines[0] and "failed to checkout revision 'deadbeefdeadbeef'" in lines[0]
+    assert 'updated' in lines[1]
+    assert '1 updated, 0 skipped, 1 failed' in out
+
+#-------------------------------------------------------------------------------
+def test_update_pull_failure(workspace, capsys) :
+    ws_dir, fips_dir, remotes_dir = workspace
+    make_repo(remotes_dir + '/depa', '')
+    git(ws_dir, 'clone', '--quiet', remotes_dir + '/depa', 'depa')
+    proj_dir = make_repo(ws_dir + '/proj', imports_yml([
+        ('depa', 'file://' + remotes_dir + '/depa', {})
+    ]))
+    git(ws_dir + '/depa', 'remote', 'set-url', 'origin', remotes_dir + '/missing')
+
+    assert dep.update_imports(fips_dir, proj_dir, 1) == False
+    out = capsys.readouterr().out
+    assert "'git pull' failed" in out
+    assert '0 updated, 0 skipped, 1 failed' in out
+
+#-------------------------------------------------------------------------------
+def test_imports_cache_is_read_only_on_hit(workspace) :
+    ws_dir, fips_dir, remotes_dir = workspace
+    proj_dir = make_repo(ws_dir + '/proj', '')
+    path = dep.get_imports_cache_path(fips_dir, proj_dir)
+
+    # the cache doesn't create the build directory
+    dep.imports_cache_memo.clear()
+    assert dep.get_all_imports_exports(fips_dir, proj_dir)[0]
+    assert not os.path.exists(ws_dir + '/fips-build')
+
+    # ...but is written once it exists
+    os.makedirs(os.path.dirname(path))
+    dep.imports_cache_memo.clear()
+    assert dep.get_all_imports_exports(fips_dir, proj_dir)[0]
+    assert os.path.isfile(path)
+    mtime = os.stat(path).st_mtime_ns
+
+    # a cache hit doesn't write the cache file
+    dep.imports_cache_memo.clear()
+    hits = dep.get_imports_cache_stats()['hits']
+    assert list(dep.get_all_imports_exports(fips_dir, proj_dir)[1]) == ['proj']
+    assert dep.get_imports_cache_stats()['hits'] == hits + 1
+    assert os.stat(path).st_mtime_ns == mtime
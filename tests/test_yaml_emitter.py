@@ -0,0 +1,143 @@
+"""tests for the simple document fast path of the Emitter in the vendored
+yaml package, yaml.dump() must produce the same output with and without
+the fast path
+"""
+
+import io
+import random
+
+import pytest
+
+import yaml
+
+#-------------------------------------------------------------------------------
+def without_fast_path(dumper) :
+    """return a subclass of dumper which always takes the regular path"""
+    class SlowDumper(dumper) :
+        def emit_simple_document(self, data) :
+            return False
+    return SlowDumper
+
+#-------------------------------------------------------------------------------
+def with_counter(dumper, counter) :
+    """return a subclass of dumper which counts the documents written
+    by the fast path
+    """
+    class CountingDumper(dumper) :
+        def emit_simple_document(self, data) :
+            result = super().emit_simple_document(data)
+            counter[result] += 1
+            return result
+    return CountingDumper
+
+dumpers = [yaml.Dumper, yaml.SafeDumper]
+
+options = [
+    {},
+    { 'width': 20 },
+    { 'width': 1 },
+    { 'indent': 4 },
+    { 'indent': 7, 'width': 30 },
+    { 'line_break': '\r\n' },
+    { 'line_break': '\r' },
+    { 'encoding': 'utf-8' },
+    { 'encoding': 'utf-16-le' },
+    { 'allow_unicode': True },
+    { 'explicit_start': True },
+    { 'explicit_end': True },
+    { 'canonical': True },
+    { 'default_flow_style': False },
+    { 'default_style': '"' },
+    { 'version': (1, 1) },
+]
+
+# strings which may be written by the fast path, and strings which are not
+simple_words = ['a', 'abc', 'a_b/c.d', 'A-1', '/path/to/file.cc', 'x+y', '_',
+    '1e3', '0o7', '1.2.3', 'k' * 200]
+other_words = ['yes', 'No', 'on', 'OFF', 'null', 'Null', '1', '0x10', '1.5',
+    '1_0', '2001-01-01', '-', '.', '~', '', '-1', '.inf', '12:30', 'a b',
+    'a: b', '#c', '\xe9', 'a\nb', ' a', 'a ', '!a', '&a', '*a', "'a'", '"a"',
+    '=', '<<']
+
+#-------------------------------------------------------------------------------
+def random_scalar(rnd, simple) :
+    """a random scalar, simple scalars are written by the fast path"""
+    kind = rnd.randint(0, 9)
+    if kind < 2 :
+        return rnd.choice([None, True, False])
+    elif kind < 4 :
+        return rnd.randint(-10**20, 10**20)
+    elif simple or kind < 6 :
+        return rnd.choice(simple_words)
+    elif kind < 7 :
+        return rnd.choice([0.5, -1.0, float('inf'), 1e20])
+    else :
+        return rnd.choice(other_words)
+
+#-------------------------------------------------------------------------------
+def random_document(rnd) :
+    """random documents, the simple ones qualify for the fast path"""
+    simple = rnd.random() < 0.6
+    kind = rnd.randint(0, 9)
+    if kind == 0 :
+        return random_scalar(rnd, simple)
+    elif kind <= 3 :
+        return [random_scalar(rnd, simple) for i in range(rnd.randint(0, 30))]
+    else :
+        doc = {}
+        shared = [random_scalar(rnd, simple)]
+        for i in range(rnd.randint(0, 12)) :
+            key = rnd.choice(simple_words if simple else other_words) if rnd.random() < 0.95 else random_scalar(rnd, simple)
+            value_kind = rnd.randint(0, 17 if simple else 19)
+            if value_kind <= 11 :
+                doc[key] = random_scalar(rnd, simple)
+            elif value_kind <= 17 :
+                doc[key] = [random_scalar(rnd, simple) for j in range(rnd.randint(0, 10))]
+            elif value_kind == 18 :
+                doc[key] = shared
+            else :
+                doc[key] = { 'x': [random_scalar(rnd, simple)] }
+        return doc
+
+#-------------------------------------------------------------------------------
+@pytest.mark.parametrize('dumper', dumpers)
+def test_documents(dumper) :
+    slow_dumper = without_fast_path(dumper)
+    docs = [[], {}, [1, 2], {'a': []}, {'a': 1, 'b': [1, 'x']}, ['a' * 100] * 3,
+        {'k{}'.format(i): list(range(i)) for i in range(20)}, {'a': [[1]]}]
+    for doc in docs :
+        for kwargs in options :
+            assert yaml.dump(doc, Dumper=dumper, **kwargs) == yaml.dump(doc, Dumper=slow_dumper, **kwargs), (doc, kwargs)
+
+#-------------------------------------------------------------------------------
+@pytest.mark.parametrize('dumper', dumpers)
+def test_random_documents(dumper) :
+    rnd = random.Random(1)
+    counter = { True: 0, False: 0 }
+    fast_dumper = with_counter(dumper, counter)
+    slow_dumper = without_fast_path(dumper)
+    for i in range(3000) :
+        doc = random_document(rnd)
+        kwargs = options[i % len(options)] if rnd.random() < 0.5 else {}
+        text = yaml.dump(doc, Dumper=fast_dumper, **kwargs)
+        assert text == yaml.dump(doc, Dumper=slow_dumper, **kwargs), (doc, kwargs)
+    # make sure that the fast path was actually tested
+    assert counter[True] > 500
+
+#-------------------------------------------------------------------------------
+@pytest.mark.parametrize('dumper', dumpers)
+def test_dump_all(dumper) :
+    rnd = random.Random(2)
+    slow_dumper = without_fast_path(dumper)
+    for i in range(300) :
+        docs = [random_document(rnd) for j in range(rnd.randint(0, 4))]
+        for kwargs in [{}, { 'explicit_start': True }, { 'width': 10, 'indent': 3 }] :
+            assert yaml.dump_all(docs, Dumper=dumper, **kwargs) == yaml.dump_all(docs, Dumper=slow_dumper, **kwargs), (docs, kwargs)
+
+#-------------------------------------------------------------------------------
+def test_stream() :
+    doc = { 'a': 1, 'b': ['x', 'y'] }
+    fast, slow = io.StringIO(), io.StringIO()
+    yaml.dump(doc, fast)
+    yaml.dump(doc, slow, Dumper=without_fast_path(yaml.Dumper))
+    assert fast.getvalue() == slow.getvalue() == 'a: 1\nb: [x, y]\n'
@@ -0,0 +1,127 @@
+"""tests for the SafeFastLoader of the vendored yaml package, which
+must load the same data as the SafeLoader
+"""
+
+import os
+import glob
+import math
+import random
+
+import pytest
+
+import yaml
+from yaml.yaml3.loader import SafeLoader, SafeFastLoader
+
+fips_dir = os.path.normpath(os.path.dirname(os.path.abspath(__file__)) + '/..')
+
+# the pure Python and (if available) the libyaml-based SafeFastLoader,
+# each compared with the SafeLoader which uses the same parser
+loaders = [(SafeFastLoader, SafeLoader)]
+if yaml.__with_libyaml__ :
+    loaders.append((yaml.CSafeFastLoader, yaml.CSafeLoader))
+
+documents = [
+    # merge keys
+    'x: &x {b: 1, c: 2}\nc: {<<: *x, d: 2}\n',
+    'x: &x {b: 1}\ny: &y {b: 2, e: 3}\nc: {<<: [*x, *y], b: 4}\n',
+    'base: &base\n  a: 1\n  b: [1, 2]\nderived:\n  <<: *base\n  a: 2\n',
+    'c: {<<: 1}\n',
+    'c: {<<: [1]}\n',
+    # value keys
+    'c: {=: 1}\n',
+    'c: =\n',
+    'c: <<\n',
+    # timestamps
+    'a: 2001-12-14\nb: 2001-12-14t21:59:43.10-05:00\nc: 2001-12-14 21:59:43.10\n',
+    # aliases and recursion
+    'a: &a [1, 2]\nb: *a\n',
+    '&a [*a]\n',
+    '&a {x: *a}\n',
+    # explicit tags
+    'a: !!str 12\nb: !!int "12"\nc: !!float 1\nd: !!bool yes\ne: !!null ""\n',
+    'a: !!set {x, y}\n',
+    'a: !!omap [x: 1, y: 2]\n',
+    'a: !!pairs [x: 1, x: 2]\n',
+    'a: !!binary aGVsbG8=\n',
+    'a: !!map x\n',
+    'a: !!seq x\n',
+    'a: !!str [x]\n',
+    'a: !!python/name:os.system\n',
+    'a: !!python/object/apply:os.system [ls]\n',
+    'a: !local x\n',
+    # unhashable keys
+    '? [a]\n: b\n',
+    '? {a: b}\n: c\n',
+    # empty documents
+    '',
+    '---\n',
+    '~\n',
+]
+
+scalars = ['yes', 'No', 'ON', 'off', 'true', 'FALSE', 'y', 'n', '0', '007',
+    '0x1F', '-0b101', '1_000', '190:20:30', '-1.5', '1e3', '1.0e+3', '.5',
+    '.inf', '-.Inf', '.NaN', '~', 'null', 'NULL', '', '0.', '3:25:45.5',
+    '+12', 'abc', '0o7', '1.2.3', '12:30', '.', '0_', '08', '2001-01-01',
+    '2001-1-1', '!', '&', '*', '"quoted"', "'single'", '"1"']
+
+#-------------------------------------------------------------------------------
+def load(doc, loader) :
+    """load a document, returns the data or the type of the error (if a
+    document has several errors, the loaders may report a different one)
+    """
+    try :
+        return yaml.load(doc, Loader=loader)
+    except yaml.YAMLError as e :
+        return type(e)
+
+#-------------------------------------------------------------------------------
+def same(a, b) :
+    """compare loaded data, NaN compares equal to NaN"""
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b) :
+        return True
+    return repr(a) == repr(b) and type(a) == type(b)
+
+#-------------------------------------------------------------------------------
+@pytest.mark.parametrize('loader, ref_loader', loaders)
+@pytest.mark.parametrize('doc', documents)
+def test_documents(loader, ref_loader, doc) :
+    assert same(load(doc, loader), load(doc, ref_loader))
+
+#-------------------------------------------------------------------------------
+@pytest.mark.parametrize('loader, ref_loader', loaders)
+@pytest.mark.parametrize('scalar', scalars)
+def test_scalars(loader, ref_loader, scalar) :
+    for doc in ['k: {}\n'.format(scalar), '- {}\n'.format(scalar), '{}\n'.format(scalar), '{}: k\n'.format(scalar)] :
+        assert same(load(doc, loader), load(doc, ref_loader))
+
+#-------------------------------------------------------------------------------
+@pytest.mark.parametrize('loader, ref_loader', loaders)
+def test_merge_keys(loader, ref_loader) :
+    assert yaml.load('x: &x {b: 1}\nc: {<<: *x, d: 2}\n', Loader=loader)['c'] == { 'b': 1, 'd': 2 }
+
+#-------------------------------------------------------------------------------
+@pytest.mark.parametrize('loader, ref_loader', loaders)
+def test_fips_yml_files(loader, ref_loader) :
+    paths = glob.glob(fips_dir + '/**/*.yml', recursive=True)
+    assert paths
+    for path in paths :
+        with open(path, 'r') as f :
+            doc = f.read()
+        assert same(load(doc, loader), load(doc, ref_loader)), path
+
+#-------------------------------------------------------------------------------
+@pytest.mark.parametrize('loader, ref_loader', loaders)
+def test_random_documents(loader, ref_loader) :
+    rnd = random.Random(1)
+    words = scalars + ['a b', 'x: y', '- z', '<<', '=', 'x # y', '"a\\tb"', '[1, 2]', '{a: 1}', '*a']
+    def make_value(depth) :
+        kind = rnd.randint(0, 5 if depth < 3 else 2)
+        if kind <= 2 :
+            return rnd.choice(words)
+        elif kind == 3 :
+            return '[' + ', '.join(make_value(depth + 1) for i in range(rnd.randint(0, 3))) + ']'
+        else :
+            return '{' + ', '.join('{}: {}'.format(rnd.choice(words), make_value(depth + 1)) for i in range(rnd.randint(0, 3))) + '}'
+    for i in range(2000) :
+        doc = 'a: &a {}\nb: {}\n'.format(make_value(0), rnd.choice(['*a', make_value(0), '{<<: *a, x: 1}']))
+        assert same(load(doc, loader), load(doc, ref_loader)), doc
@@ -0,0 +1,155 @@
+"""tests for the Reader of the vendored yaml package, the index, line
+and column of the reader and the checks for non-printable characters
+are compared with a naive reference implementation
+"""
+
+import re
+import codecs
+import random
+
+import pytest
+
+from yaml.yaml3.reader import Reader, ReaderError
+
+line_breaks = '\n\x85\u2028\u2029'
+non_printable = re.compile('[^\x09\x0A\x0D\x20-\x7E\x85\xA0-\uD7FF\uE000-\uFFFD]')
+
+#-------------------------------------------------------------------------------
+class ChunkedStream(object) :
+    """a file-like object which returns at most chunk_size items per read"""
+    def __init__(self, data, chunk_size) :
+        self.data = data
+        self.pos = 0
+        self.chunk_size = chunk_size
+
+    def read(self, size) :
+        size = min(size, self.chunk_size)
+        data = self.data[self.pos:self.pos + size]
+        self.pos += len(data)
+        return data
+
+#-------------------------------------------------------------------------------
+def short_repr(text) :
+    """test id of a text parameter"""
+    return repr(text) if len(text) < 20 else '{}...({} chars)'.format(repr(text[:8]), len(text))
+
+#-------------------------------------------------------------------------------
+def reference_marks(text) :
+    """return the (index, line, column) of each position in text,
+    '\\r\\n' is one line break, a BOM doesn't advance the column
+    """
+    marks = [(0, 0, 0)]
+    line = column = 0
+    for i, ch in enumerate(text) :
+        next_ch = text[i + 1] if i + 1 < len(text) else '\0'
+        if ch in line_breaks or (ch == '\r' and next_ch != '\n') :
+            line += 1
+            column = 0
+        elif ch != '\uFEFF' :
+            column += 1
+        marks.append((i + 1, line, column))
+    return marks
+
+#-------------------------------------------------------------------------------
+def make_streams(text) :
+    """return (name, stream, decoded text) tuples for text, the BOM of
+    UTF-16 data is kept by the reader
+    """
+    utf8 = text.encode('utf-8')
+    utf16 = codecs.BOM_UTF16_LE + text.encode('utf-16-le')
+    return [
+        ('str', text, text),
+        ('bytes', utf8, text),
+        ('utf-16-le', utf16, '\uFEFF' + text),
+        ('str file', ChunkedStream(text, 7), text),
+        ('bytes file', ChunkedStream(utf8, 5), text),
+        ('utf-16 file', ChunkedStream(utf16, 3), '\uFEFF' + text),
+    ]
+
+#-------------------------------------------------------------------------------
+def walk(reader, text, rnd) :
+    """move the reader through text in random steps and check the
+    characters and marks at each step
+    """
+    marks = reference_marks(text)
+    pos = 0
+    while pos < len(text) :
+        assert reader.peek() == text[pos]
+        length = min(rnd.choice([1, 1, 2, 3, 5, 8, 13, 40]), len(text) - pos)
+        assert reader.prefix(length) == text[pos:pos + length]
+        reader.forward(length)
+        pos += length
+        mark = reader.get_mark()
+        assert (reader.index, reader.line, reader.column) == marks[pos]
+        assert (mark.index, mark.line, mark.column) == marks[pos]
+    assert reader.peek() == '\0'
+
+#-------------------------------------------------------------------------------
+def random_text(rnd, alphabet, max_len=300) :
+    return ''.join(rnd.choice(alphabet) for i in range(rnd.randint(0, max_len)))
+
+#-------------------------------------------------------------------------------
+@pytest.mark.parametrize('text', ['', 'a', '\r', '\r\n', '\n\r', 'a\r\nb\rc\nd',
+    '\uFEFFa: b\n', 'a\x85b\u2028c\u2029d', '\r' * 10, 'x' * 70000 + '\r\ny'], ids=short_repr)
+def test_marks(text) :
+    for name, stream, decoded in make_streams(text) :
+        walk(Reader(stream), decoded, random.Random(0))
+
+#-------------------------------------------------------------------------------
+def test_random_marks() :
+    rnd = random.Random(1)
+    alphabet = 'ab :-\t\n\r\r\x85\u2028\u2029\uFEFF\xe9\u4e2d'
+    for i in range(300) :
+        text = random_text(rnd, alphabet)
+        for name, stream, decoded in make_streams(text) :
+            walk(Reader(stream), decoded, rnd)
+
+#-------------------------------------------------------------------------------
+def read_all(stream, text, rnd) :
+    """read the whole stream, returns the ReaderError or None"""
+    try :
+        walk(Reader(stream), text, rnd)
+    except ReaderError as e :
+        return e
+    return None
+
+#-------------------------------------------------------------------------------
+@pytest.mark.parametrize('text', ['\x00', 'abc\x01', 'a\x7f', '\x1b[0m', 'a\n\x0b',
+    '\uFFFE', '\uFFFF', 'ok \x9f', 'abc' * 30000 + '\x08'], ids=short_repr)
+def test_non_printable(text) :
+    for name, stream, decoded in make_streams(text) :
+        match = non_printable.search(decoded)
+        error = read_all(stream, decoded, random.Random(0))
+        assert error is not None, name
+        assert (error.position, error.character) == (match.start(), ord(match.group())), name
+
+#-------------------------------------------------------------------------------
+def test_random_printable() :
+    rnd = random.Random(2)
+    alphabets = [
+        # pure ASCII, takes the fast path of check_printable()
+        'ab \t\n\r~\x00\x01\x1f\x7f',
+        'ab \t\n\r\xe9\x85\xa0\x80\x9f\uFEFF\uFFFE\uFFFD\U0001F600',
+    ]
+    for i in range(400) :
+        text = random_text(rnd, alphabets[i % 2], 100)
+        if rnd.random() < 0.5 :
+            # mostly printable texts with at most one error
+            text = non_printable.sub('', text)
+            if rnd.random() < 0.5 :
+                pos = rnd.randint(0, len(text))
+                text = text[:pos] + rnd.choice('\x00\x01\x7f\x9f\uFFFE') + text[pos:]
+        for name, stream, decoded in make_streams(text) :
+            match = non_printable.search(decoded)
+            error = read_all(stream, decoded, rnd)
+            if match :
+                assert error is not None, (name, text)
+                assert (error.position, error.character) == (match.start(), ord(match.group())), (name, text)
+            else :
+                assert error is None, (name, text)
+
+#-------------------------------------------------------------------------------
+def test_surrogates() :
+    # lone surrogates can only be passed in a str
+    error = read_all('ab\ud800', 'ab\ud800', random.Random(0))
+    assert (error.position, error.character) == (2, 0xd800)
@@ -0,0 +1,233 @@
+"""tests for the Scanner of the vendored yaml package, the tokens, marks
+and errors are compared with the output of the original PyYAML 3.11
+scanner (stored in data/yaml_scanner_tokens.json), and random data must
+survive dump/load and json/load round trips
+"""
+
+import os
+import json
+import random
+import hashlib
+
+import yaml
+
+data_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'yaml_scanner_tokens.json')
+
+documents = [
+    # plain scalars
+    'a: b c\n',
+    'a: b:c d\n',
+    'a: b #c\n',
+    'a: b#c\n',
+    'a: b\n  c\n\n  d\n',
+    'a:b\n',
+    'a: -b\n- c\n',
+    'a: http://x.y/z?a=b#c\n',
+    'a : b\n',
+    'a:  \tb \t\n',
+    '- a\n-  b\n- - c\n  - d\n',
+    '? a\n: b\n',
+    'a: b\n c\n',
+    'a: 1:2\n',
+    'key with spaces: value with spaces   \n',
+    'a: b \t# comment\n# another\n',
+    # flow context
+    '[a, b c, {d: e}]\n',
+    '{a: b, c: [d, e], ? f}\n',
+    '[a:b, c: d, e :f]\n',
+    '{a:1, "b":2}\n',
+    '[a\n  b, c]\n',
+    '{a: [b, {c: d}], e: f}\n',
+    '[a?b, c,d]\n',
+    '[a, ]\n',
+    '{ }\n',
+    # quoted scalars
+    'a: "b\\tc\\x41\\u00e9\\U0001F600"\n',
+    'a: "b\n  c\n\n  d"\n',
+    "a: 'b''c'\n",
+    "a: 'b\n\n   c  '\n",
+    'a: "b\\\n  c"\n',
+    'a: "\\e\\a\\0\\N\\_\\L\\P"\n',
+    'a: "b  \t\n  c"\n',
+    'a: "b c \\"d\\" e  \t"\n',
+    "a: 'b c ''d'' e \"f\" \\g  '\n",
+    'a: " b  c\t\\\n  d \\ e"\n',
+    "a: 'b  \n  \n c '\n",
+    # block scalars
+    'a: |\n  b\n   c\n\n  d\n',
+    'a: >\n  b\n  c\n\n  d\n   e\n',
+    'a: |+\n  b\n\n',
+    'a: >-\n  b\n\n',
+    'a: |2\n    b\n  c\n',
+    'a: | # comment\n  b\n',
+    '- |\n b\n- >\n c\n',
+    # anchors, aliases, tags, directives, documents
+    'a: &x b\nc: *x\n',
+    'a: !!str b\nc: !local d\ne: !<tag:yaml.org,2002:str> f\ng: !e!x h\n',
+    '%YAML 1.1\n%TAG !e! tag:example.com,2000:\n--- !e!x a\n',
+    '--- a\n...\n--- b\n',
+    '---\n- a\n---\n- b\n...\n',
+    '# only a comment\n',
+    '\uFEFFa: b\n',
+    # line breaks
+    'a: b\r\nc: d\r\n',
+    'a: b\rc: d\r',
+    'a: b\x85c: d\u2028e: f\u2029',
+    'a: |\r\n  b\r\n  c\r\n',
+    'a: "b\r\n c"\r\n',
+    # long lines
+    'a: ' + ' '.join(['word'] * 500) + '\n',
+    'a: "' + 'x' * 5000 + '"\n',
+    # errors
+    'a: b: c\n',
+    'a: "b\n',
+    "a: 'b\n",
+    'a: [b\n',
+    'a: {b\n',
+    'a:\n\t- b\n',
+    'a: @b\n',
+    'a: `b\n',
+    'a: *\n',
+    'a: &\n',
+    'a: !<x\n',
+    'a: "\\q"\n',
+    'a: "\\x4"\n',
+    'a: |0\n',
+    'a: |++\n',
+    '%YAML 1\n--- a\n',
+    '%TAG !x tag:x\n--- a\n',
+    '- a\nb: c\n',
+    '? a\n? b\n: c\n',
+    'a: b\n- c\n',
+    '[a, b]: c\n',
+    '{a: b}}\n',
+    'a: ---\n--- ...\n',
+]
+
+fragments = [
+    'a', 'b c', 'd:e', 'f: g', '-', '- h', '? i', ': j', '[k, l]', '{m: n}',
+    '"o\\tp"', "'q''r'", '&s t', '*s', '!!str u', '!v w', '# x', ' #y',
+    '|', '>-', '  z', '\t', '...', '---', ',', ']', '}', 'aa:bb', 'http://c',
+    '"d\n e"', "'f\n\n g'", 'h #i', '1.5', '-2', '~', 'true', '@', '%TAG', '\\',
+]
+
+#-------------------------------------------------------------------------------
+def random_documents(seed, num) :
+    """generate random documents from fragments, most of them are valid"""
+    rnd = random.Random(seed)
+    docs = []
+    for i in range(num) :
+        lines = []
+        for j in range(rnd.randint(1, 6)) :
+            indent = ' ' * rnd.choice([0, 0, 1, 2, 4])
+            line = ' '.join(rnd.choice(fragments) for k in range(rnd.randint(1, 4)))
+            lines.append(indent + line)
+        docs.append(rnd.choice(['\n', '\r\n', '\n', '\u2028']).join(lines) + '\n')
+    return docs
+
+#-------------------------------------------------------------------------------
+def mark(m) :
+    return '{}:{}:{}'.format(m.index, m.line, m.column)
+
+#-------------------------------------------------------------------------------
+def scan(doc) :
+    """return the tokens of a document as list of strings, ending with the
+    error if the document can't be scanned
+    """
+    result = []
+    try :
+        for token in yaml.scan(doc) :
+            args = [repr(getattr(token, attr)) for attr in ['name', 'value', 'plain', 'style'] if hasattr(token, attr)]
+            result.append(' '.join([type(token).__name__] + args + [mark(token.start_mark), mark(token.end_mark)]))
+    except yaml.YAMLError as e :
+        result.append(' '.join([type(e).__name__, repr(e.context), repr(e.problem),
+            mark(e.context_mark) if e.context_mark else '-', mark(e.problem_mark) if e.problem_mark else '-']))
+    return result
+
+#-------------------------------------------------------------------------------
+def digest(tokens) :
+    return hashlib.sha1('\n'.join(tokens).encode('utf-8')).hexdigest()[:16]
+
+#-------------------------------------------------------------------------------
+def make_golden() :
+    """create the content of the golden data file with the current scanner"""
+    return {
+        'documents': { doc: scan(doc) for doc in documents },
+        'random': [digest(scan(doc)) for doc in random_documents(1, 1000)],
+    }
+
+#-------------------------------------------------------------------------------
+def load_golden() :
+    with open(data_path, 'r', encoding='utf-8') as f :
+        return json.load(f)
+
+#-------------------------------------------------------------------------------
+def test_documents() :
+    golden = load_golden()['documents']
+    assert sorted(golden) == sorted(documents)
+    for doc in documents :
+        assert scan(doc) == golden[doc], doc
+
+#-------------------------------------------------------------------------------
+def test_random_documents() :
+    golden = load_golden()['random']
+    docs = random_documents(1, 1000)
+    assert len(golden) == len(docs)
+    for doc, expected in zip(docs, golden) :
+        assert digest(scan(doc)) == expected, (doc, scan(doc))
+
+#-------------------------------------------------------------------------------
+def random_data(rnd, depth=0) :
+    """random data which can be represented in JSON and YAML"""
+    kind = rnd.randint(0, 7 if depth < 3 else 4)
+    if kind == 0 :
+        return rnd.choice([None, True, False])
+    elif kind == 1 :
+        return rnd.randint(-10**6, 10**6)
+    elif kind == 2 :
+        return rnd.randint(-1000, 1000) / 8.0
+    elif kind in [3, 4] :
+        chars = 'ab :#-?,[]{}"\'\\\t\n \xe9\u4e2d&*!|>%@`'
+        return ''.join(rnd.choice(chars) for i in range(rnd.randint(0, 12)))
+    elif kind == 5 :
+        return [random_data(rnd, depth + 1) for i in range(rnd.randint(0, 4))]
+    else :
+        return { random_data(rnd, 3) if rnd.random() < 0.2 else 'k{}'.format(i): random_data(rnd, depth + 1)
+                 for i in range(rnd.randint(0, 4)) }
+
+#-------------------------------------------------------------------------------
+def json_keys(data) :
+    """JSON only has string keys"""
+    if isinstance(data, dict) :
+        return { str(key): json_keys(value) for key, value in data.items() if isinstance(key, str) }
+    elif isinstance(data, list) :
+        return [json_keys(value) for value in data]
+    return data
+
+#-------------------------------------------------------------------------------
+def test_dump_load() :
+    rnd = random.Random(2)
+    options = [
+        {},
+        { 'default_flow_style': False },
+        { 'default_flow_style': True, 'width': 20 },
+        { 'default_style': '"' },
+        { 'default_style': "'", 'indent': 4 },
+        { 'allow_unicode': True, 'width': 10 },
+        { 'canonical': True },
+        { 'line_break': '\r\n', 'explicit_start': True },
+    ]
+    for i in range(1000) :
+        data = random_data(rnd)
+        kwargs = options[i % len(options)]
+        text = yaml.dump(data, Dumper=yaml.SafeDumper, **kwargs)
+        assert yaml.load(text, Loader=yaml.SafeLoader) == data, (data, kwargs, text)
+
+#-------------------------------------------------------------------------------
+def test_json_load() :
+    rnd = random.Random(3)
+    for i in range(1000) :
+        data = json_keys(random_data(rnd))
+        for kwargs in [{}, { 'separators': (',', ':') }, { 'indent': 2 }, { 'ensure_ascii': False }] :
+            text = json.dumps(data, **kwargs)
+            assert yaml.load(text, Loader=yaml.SafeLoader) == data, (data, kwargs, text)
@@ -0,0 +1,220 @@
+#-------------------------------------------------------------------------------
+#   yaml-bench.py
+#
+#   Benchmark for fips' vendored yaml package, compares the parse times
+#   of the pure Python loaders and the libyaml-based loaders (if available)
+#   for synthetic fips_codegen.yml and registry.yml files of different
+#   sizes, and for any YAML files given on the command line. The speedup
+#   column is the ratio between the slowest and the fastest loader.
+#
+#   The reader micro-benchmark feeds multi-megabyte inputs as str, bytes
+#   and file objects through the yaml Reader alone, the scanner benchmark
+#   measures the tokenization throughput of the pure Python scanner, and
+#   the dump benchmark compares yaml.dump() of .fips-settings.yml-like
+#   documents with and without the emitter's simple document fast path.
+#
+#   Arguments:
+#
+#   --items     number of entries in the synthetic files (default: 10000)
+#   --repeat    number of timed runs per file and loader, the best run
+#               is reported (default: 5)
+#   --mb        size of the largest reader benchmark input in MB (default: 4)
+#   files       optional YAML files to benchmark
+#
+#   The libyaml-based loaders of an installed PyYAML package are included
+#   unless FIPS_YAML_NO_LIBYAML=1 is set.
+#
+import sys
+import os
+import io
+import time
+import argparse
+
+fips_dir = os.path.normpath(os.path.dirname(os.path.abspath(__file__)) + '/..')
+sys.path.insert(0, fips_dir)
+import yaml
+
+#-------------------------------------------------------------------------------
+def make_codegen_yml(num_items) :
+    """create the content of a fips_codegen.yml file with num_items entries"""
+    lines = []
+    for i in range(num_items) :
+        lines.append("- generator: shader.py\n")
+        lines.append("  in: '/work/proj/src/shaders/shader{}.glsl'\n".format(i))
+        lines.append("  out_src: '/work/proj/src/shaders/shader{}.cc'\n".format(i))
+        lines.append("  out_hdr: '/work/proj/src/shaders/shader{}.h'\n".format(i))
+        lines.append("  args: {{slang: 'glsl330:hlsl5', defines: [DEBUG, LEVEL_{}]}}\n".format(i % 4))
+        lines.append("  env:\n")
+        lines.append("    target_platform: 'linux'\n")
+    return ''.join(lines)
+
+#-------------------------------------------------------------------------------
+def make_registry_yml(num_items) :
+    """create the content of a registry.yml file with num_items entries"""
+    lines = ["# fips project registry\n", "#\n", "\n"]
+    for i in range(num_items) :
+        lines.append("project{}:{}https://github.com/someone/project{}.git\n".format(i, ' ' * 8, i))
+    return ''.join(lines)
+
+#-------------------------------------------------------------------------------
+def make_text_yml(num_items) :
+    """create a YAML file with num_items commented entries with long
+    plain and quoted scalars
+    """
+    lines = []
+    for i in range(num_items) :
+        lines.append("# entry {}: {}\n".format(i, 'a comment which describes the entry ' * 3))
+        lines.append("entry{}:\n".format(i))
+        lines.append("  desc: {}\n".format('a long plain scalar with several words in it ' * 2))
+        lines.append("  path: '/work/proj/src/some/deeply/nested/directory/file{}.glsl'\n".format(i))
+        lines.append('  title: "{}"\n'.format('a double quoted scalar with several words ' * 2))
+    return ''.join(lines)
+
+#-------------------------------------------------------------------------------
+def get_loaders() :
+    """get the loaders to compare as (name, loader class) tuples"""
+    loaders = [('Loader', yaml.Loader), ('SafeFastLoader', yaml.loader.SafeFastLoader)]
+    if yaml.__with_libyaml__ :
+        loaders.append(('CLoader', yaml.CLoader))
+        loaders.append(('CSafeFastLoader', yaml.CSafeFastLoader))
+    return loaders
+
+#-------------------------------------------------------------------------------
+def bench(content, loader, repeat) :
+    """parse content repeat times, returns the best time in seconds"""
+    best = None
+    for i in range(repeat) :
+        start = time.perf_counter()
+        yaml.load(content, Loader=loader)
+        duration = time.perf_counter() - start
+        if best is None or duration < best :
+            best = duration
+    return best
+
+#-------------------------------------------------------------------------------
+def run(name, content, repeat) :
+    """benchmark all loaders for one YAML document"""
+    loaders = get_loaders()
+    results = [bench(content, loader, repeat) for _, loader in loaders]
+    line = '{:<32} {:>9.1f}KB'.format(name, len(content) / 1024.0)
+    for duration in results :
+        line += ' {:>14.2f}ms'.format(duration * 1000.0)
+    line += ' {:>8.1f}x'.format(results[0] / results[-1])
+    print(line)
+
+#-------------------------------------------------------------------------------
+def walk_reader(stream) :
+    """consume a stream with the yaml Reader in the same access pattern
+    as the scanner, runs of non-blank characters are skipped with a single
+    forward() call, everything else one character at a time
+    """
+    reader = yaml.reader.Reader(stream)
+    while reader.peek() != '\0' :
+        length = 0
+        while reader.peek(length) not in '\0 \t\r\n' :
+            length += 1
+        reader.forward(length or 1)
+
+#-------------------------------------------------------------------------------
+def run_reader(name, content, repeat) :
+    """benchmark the Reader with str, bytes and file input"""
+    data = content.encode('utf-8')
+    inputs = [
+        ('str', lambda: content),
+        ('bytes', lambda: data),
+        ('file', lambda: io.StringIO(content)),
+        ('binary file', lambda: io.BytesIO(data))
+    ]
+    line = '{:<32} {:>9.1f}MB'.format(name, len(data) / (1024.0 * 1024.0))
+    for _, make_stream in inputs :
+        best = None
+        for i in range(repeat) :
+            stream = make_stream()
+            start = time.perf_counter()
+            walk_reader(stream)
+            duration = time.perf_counter() - start
+            if best is None or duration < best :
+                best = duration
+        line += ' {:>9.2f}MB/s'.format(len(data) / (1024.0 * 1024.0) / best)
+    print(line)
+
+#-------------------------------------------------------------------------------
+def run_scanner(name, content, repeat) :
+    """benchmark tokenization with the pure Python scanner"""
+    best = None
+    for i in range(repeat) :
+        start = time.perf_counter()
+        for token in yaml.scan(content, Loader=yaml.SafeLoader) :
+            pass
+        duration = time.perf_counter() - start
+        if best is None or duration < best :
+            best = duration
+    size = len(content) / (1024.0 * 1024.0)
+    print('{:<32} {:>9.1f}MB {:>9.2f}MB/s'.format(name, size, size / best))
+
+#-------------------------------------------------------------------------------
+class FullDumper(yaml.Dumper) :
+    """a Dumper which always goes through the representer, serializer
+    and event-based emitter
+    """
+    def emit_simple_document(self, data) :
+        return False
+
+#-------------------------------------------------------------------------------
+def run_dumper(name, data, repeat) :
+    """benchmark yaml.dump() with and without the simple document fast path"""
+    results = []
+    for dumper in [FullDumper, yaml.Dumper] :
+        best = None
+        for i in range(repeat) :
+            start = time.perf_counter()
+            for j in range(100) :
+                yaml.dump(data, Dumper=dumper)
+            duration = (time.perf_counter() - start) / 100
+            if best is None or duration < best :
+                best = duration
+        results.append(best)
+    print('{:<32} {:>10.1f}us {:>10.1f}us {:>8.1f}x'.format(name,
+        results[0] * 1000000.0, results[1] * 1000000.0, results[0] / results[1]))
+
+#=== entry point
+parser = argparse.ArgumentParser(description="benchmark fips' vendored yaml package")
+parser.add_argument('--items', type=int, default=10000, help='number of entries in synthetic files')
+parser.add_argument('--repeat', type=int, default=5, help='number of timed runs')
+parser.add_argument('--mb', type=float, default=4, help='size of largest reader benchmark input in MB')
+parser.add_argument('files', nargs='*', help='optional YAML files to benchmark')
+args = parser.parse_args()
+
+print('libyaml: {}'.format('yes' if yaml.__with_libyaml__ else 'no'))
+header = '{:<32} {:>11}'.format('file', 'size')
+for name, _ in get_loaders() :
+    header += ' {:>16}'.format(name)
+header += ' {:>9}'.format('speedup')
+print(header)
+for num_items in [args.items // 100, args.items // 10, args.items] :
+    run('fips_codegen.yml ({} items)'.format(num_items), make_codegen_yml(num_items), args.repeat)
+    run('registry.yml ({} items)'.format(num_items), make_registry_yml(num_items), args.repeat)
+for path in args.files :
+    with open(path, 'r') as f :
+        run(os.path.basename(path), f.read(), args.repeat)
+
+print()
+print('{:<32} {:>11} {:>13} {:>13} {:>13} {:>13}'.format('reader', 'size', 'str', 'bytes', 'file', 'binary file'))
+entry_size = len(make_codegen_yml(1))
+for mb in [args.mb / 4, args.mb] :
+    num_items = max(1, int(mb * 1024 * 1024 / entry_size))
+    run_reader('fips_codegen.yml ({} items)'.format(num_items), make_codegen_yml(num_items), args.repeat)
+
+print()
+print('{:<32} {:>11} {:>13}'.format('scanner', 'size', 'tokenize'))
+num_items = args.items // 10
+run_scanner('fips_codegen.yml ({} items)'.format(num_items), make_codegen_yml(num_items), args.repeat)
+run_scanner('registry.yml ({} items)'.format(num_items), make_registry_yml(num_items), args.repeat)
+run_scanner('text.yml ({} items)'.format(num_items), make_text_yml(num_items), args.repeat)
+
+print()
+print('{:<32} {:>12} {:>12} {:>9}'.format('dump', 'full', 'fast path', 'speedup'))
+settings = { 'config': 'linux-make-debug', 'target': 'hello', 'jobs': 8, 'ccache': False, 'local': True }
+run_dumper('.fips-settings.yml', settings, args.repeat)
+targets = { 'app': ['target{}'.format(i) for i in range(num_items)], 'lib': ['lib{}'.format(i) for i in range(num_items)] }
+run_dumper('targets ({} items)'.format(num_items), targets, args.repeat)
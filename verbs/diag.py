@@ -4,14 +4,21 @@ diag all        -- run all diagnosis functions
 diag tools      -- check if required tools can be found
 diag configs    -- check all configs
 diag imports    -- check all imports
+diag cache      -- show import graph cache statistics
 diag            -- same as 'diag all'
 """
 
+import time
+import threading
+
 from mod.tools import git, cmake, ccmake, cmake_gui, clion
 from mod.tools import vscode, vscode_cpptools, vscode_cmaketools, vscode_codelldb, vscode_wasmdwarf
 from mod.tools import make, ninja, xcrun, java, javac, node, wasmtime
-from mod.tools import httpserver
-from mod import config, util, log, dep
+from mod.tools import httpserver, ccache, sccache
+from mod import config, util, log, dep, toolcache
+
+# max time in seconds to wait for tool probes in 'fips diag tools'
+tool_timeout = 10
 
 #-------------------------------------------------------------------------------
 def check_fips(fips_dir) :
@@ -24,23 +31,49 @@ def check_fips(fips_dir) :
 
 #-------------------------------------------------------------------------------
 def check_tools(fips_dir) :
-    """check whether required command line tools can be found"""
+    """check whether required command line tools can be found, the tools
+    are probed in parallel, each probe which takes longer than
+    tool_timeout seconds is reported as timed out, and a probe which
+    raises an exception is reported as failed
+    """
     log.colored(log.YELLOW, '=== tools:')
     tools = [
         git, cmake,ccmake, cmake_gui, make, ninja, xcrun, javac, java, node,
         vscode, vscode_cpptools, vscode_cmaketools, vscode_codelldb, vscode_wasmdwarf,
-        clion, httpserver, wasmtime
+        clion, httpserver, wasmtime, ccache, sccache
     ]
     platform = util.get_host_platform()
-    for tool in tools:
-        if platform in tool.platforms :
-            if tool.check_exists(fips_dir) :
-                log.ok(tool.name, 'found')
+    tools = [tool for tool in tools if platform in tool.platforms]
+
+    # NOTE: use daemon threads instead of a ThreadPoolExecutor, a hanging
+    # probe would otherwise block the interpreter from exiting
+    results = {}
+    errors = {}
+    def probe(tool) :
+        try :
+            results[tool.name] = toolcache.check_exists(fips_dir, tool)
+        except Exception as e :
+            errors[tool.name] = e
+    threads = []
+    for tool in tools :
+        thread = threading.Thread(target=probe, args=(tool,), daemon=True)
+        thread.start()
+        threads.append((thread, time.time() + tool_timeout))
+
+    # print results in original order
+    for tool, (thread, deadline) in zip(tools, threads) :
+        thread.join(max(0.0, deadline - time.time()))
+        if tool.name in errors :
+            log.failed(tool.name, 'PROBE FAILED ({})'.format(errors[tool.name]))
+        elif tool.name not in results :
+            log.failed(tool.name, 'TIMED OUT (no response after {} seconds)'.format(tool_timeout))
+        elif results[tool.name] :
+            log.ok(tool.name, 'found')
+        else :
+            if tool.optional :
+                log.optional(tool.name, 'OPTIONAL, NOT FOUND ({})'.format(tool.not_found))
             else :
-                if tool.optional :
-                    log.optional(tool.name, 'OPTIONAL, NOT FOUND ({})'.format(tool.not_found))
-                else :
-                    log.failed(tool.name, 'NOT FOUND ({})'.format(tool.not_found))
+                log.failed(tool.name, 'NOT FOUND ({})'.format(tool.not_found))
 
 #-------------------------------------------------------------------------------
 def check_configs(fips_dir, proj_dir) :
@@ -80,6 +113,30 @@ def check_local_changes(fips_dir, proj_dir) :
     else:
         log.warn('currently not in a project directory')
 
+#-------------------------------------------------------------------------------
+def check_cache(fips_dir, proj_dir) :
+    """show the state of the import graph cache, and the cache counters
+    of this process (the import graph is resolved once at startup to
+    find the verbs of imported projects)
+    """
+    log.colored(log.YELLOW, '=== cache:')
+    if util.is_valid_project_dir(proj_dir) :
+        path = dep.get_imports_cache_path(fips_dir, proj_dir)
+        cache = dep.load_imports_cache(path)
+        if cache :
+            log.info('  file:         {}'.format(path))
+            log.info('  projects:     {}'.format(len(cache['result'])))
+            log.info('  fingerprints: {}'.format(len(cache['files'])))
+            log.info('  state:        {}'.format('valid' if dep.is_imports_cache_valid(fips_dir, proj_dir, cache) else 'outdated'))
+        else :
+            log.warn("no import graph cache in '{}' (written once the build directory exists)".format(path))
+        stats = dep.get_imports_cache_stats()
+        log.info('  import graph hits: {}, misses: {}, in-memory: {} (this process)'.format(stats['hits'], stats['misses'], stats['memo']))
+        stats = util.get_fips_yml_stats()
+        log.info('  fips.yml parsed: {}, parses avoided: {} (this process)'.format(stats['parsed'], stats['cached']))
+    else :
+        log.warn('currently not in a project directory')
+
 #-------------------------------------------------------------------------------
 def run(fips_dir, proj_dir, args) :
     """run diagnostics
@@ -107,6 +164,9 @@ def run(fips_dir, proj_dir, args) :
     if noun in ['all', 'fips'] :
         check_fips(fips_dir)
         ok = True
+    if noun in ['all', 'cache'] :
+        check_cache(fips_dir, proj_dir)
+        ok = True
     if not ok :
         log.error("invalid noun '{}'".format(noun))
 
@@ -121,5 +181,6 @@ def help() :
              "fips diag configs\n"
              "fips diag imports\n"
              "fips diag local-changes\n"
+             "fips diag cache\n"
              + log.DEF +
              "    run diagnostics and check for errors")
@@ -2,6 +2,7 @@
 
 fetch
 fetch [project]
+fetch [project] [-j jobs]
 """
 
 from mod import log, util, dep
@@ -14,15 +15,18 @@ def run(fips_dir, proj_dir, args) :
     :param proj_dir:    absolute project directory
     :args:              additional args
     """
+    num_jobs, args = util.parse_jobs_arg(args, 'git clones')
     if len(args) > 0 :
         proj_name = args[0]
         proj_dir = util.get_project_dir(fips_dir, proj_name)
-    dep.fetch_imports(fips_dir, proj_dir)
+    dep.fetch_imports(fips_dir, proj_dir, num_jobs)
 
 #-------------------------------------------------------------------------------
 def help() :
     """print fetch help"""
     log.info(log.YELLOW +
             "fips fetch\n"
-            "fips fetch [proj]\n" + log.DEF +
-            "    fetch external dependencies for current or named project")
+            "fips fetch [proj]\n"
+            "fips fetch [proj] [-j jobs]\n" + log.DEF +
+            "    fetch external dependencies for current or named project,\n"
+            "    -j sets the number of parallel git clones (default: 'jobs' setting)")
@@ -2,6 +2,7 @@
 
 gen
 gen [config]
+gen [config] --force
 """
 
 from mod import log, util, project, settings
@@ -12,16 +13,23 @@ def run(fips_dir, proj_dir, args) :
     if not util.is_valid_project_dir(proj_dir) :
         log.error('must be run in a project directory')
     cfg_name = None
+    force = False
+    if '--force' in args :
+        force = True
+        args = [arg for arg in args if arg != '--force']
     if len(args) > 0 :
         cfg_name = args[0]
     if cfg_name == None :
         cfg_name = settings.get(proj_dir, 'config')
-    project.gen(fips_dir, proj_dir, cfg_name)
+    project.gen(fips_dir, proj_dir, cfg_name, force)
 
 #-------------------------------------------------------------------------------
 def help() :
     """print gen help"""
     log.info(log.YELLOW +
             "fips gen\n"
-            "fips gen [config]\n" + log.DEF +
-            "    generate build files for current or named config")
+            "fips gen [config]\n"
+            "fips gen [config] --force\n" + log.DEF +
+            "    generate build files for current or named config, cmake is\n"
+            "    skipped if the config, toolchain, defines and imports haven't\n"
+            "    changed since the last run, unless --force is given")
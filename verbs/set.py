@@ -25,24 +25,24 @@ def run(fips_dir, proj_dir, args) :
                 settings.set(proj_dir, 'target', target_name)
             else :
                 log.error('expected target name')
-        elif noun == 'jobs' :
+        elif noun in ['jobs', 'parallel'] :
             if len(args) > 1 :
                 num_jobs = args[1]
                 if num_jobs.isdigit() :
-                    settings.set(proj_dir, 'jobs', int(num_jobs))
+                    settings.set(proj_dir, noun, int(num_jobs))
                 else :
-                    log.error("value for setting 'jobs' must be a number")
+                    log.error("value for setting '{}' must be a number".format(noun))
             else :
-                log.error('expected number of build jobs value')
-        elif noun == 'local':
+                log.error("expected number for setting '{}'".format(noun))
+        elif noun in ['local', 'ccache']:
             if len(args) > 1:
-                is_local = args[1]
-                if is_local == 'on':
-                    settings.set(proj_dir, 'local', True)
-                elif is_local == 'off':
-                    settings.set(proj_dir, 'local', False)
+                is_on = args[1]
+                if is_on == 'on':
+                    settings.set(proj_dir, noun, True)
+                elif is_on == 'off':
+                    settings.set(proj_dir, noun, False)
                 else:
-                    log.error("value for setting 'local' must be 'on' or 'off'")
+                    log.error("value for setting '{}' must be 'on' or 'off'".format(noun))
         else :
             settings.set(proj_dir, noun, args[1])
     else :
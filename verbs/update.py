@@ -10,6 +10,7 @@ from mod.tools import git
 
 #-------------------------------------------------------------------------------
 def run(fips_dir, proj_dir, args) :
+    num_jobs, args = util.parse_jobs_arg(args, 'updates')
     if len(args) > 0 and args[0] == 'fips' :
         if git.has_local_changes(fips_dir) :
             log.warn("  '{}' has local changes, skipping...".format(fips_dir))
@@ -20,12 +21,13 @@ def run(fips_dir, proj_dir, args) :
         if len(args) > 0 :
             proj_name = args[0]
             proj_dir = util.get_project_dir(fips_dir, proj_name)
-        dep.update_imports(fips_dir, proj_dir)
+        if not dep.update_imports(fips_dir, proj_dir, num_jobs) :
+            log.error('failed to update imports')
 
 #-------------------------------------------------------------------------------
 def help() :
     log.info(log.YELLOW +
             "fips update\n"
-            "fips update [proj|fips]\n" + log.DEF +
+            "fips update [proj|fips] [-j jobs]\n" + log.DEF +
             "    update external dependencies for current or named project,\n"
-            "    or update fips itself")
+            "    or update fips itself, -j sets the number of parallel updates")
@@ -3,3 +3,4 @@ if version_info[0] < 3:
     from yaml.yaml2 import *
 else:
     from yaml.yaml3 import *
+    from yaml.yaml3 import __with_libyaml__
@@ -15,6 +15,11 @@ try:
 except ImportError:
     __with_libyaml__ = False
 
+# the fastest available safe loader, loads the same data as SafeLoader,
+# but is optimized for plain configuration files
+if __with_libyaml__:
+    SafeFastLoader = CSafeFastLoader
+
 import io
 
 def scan(stream, Loader=Loader):
@@ -62,10 +67,12 @@ def compose_all(stream, Loader=Loader):
     finally:
         loader.dispose()
 
-def load(stream, Loader=Loader):
+def load(stream, Loader=SafeLoader):
     """
     Parse the first YAML document in a stream
     and produce the corresponding Python object.
+    Resolve only basic YAML tags, unless another
+    Loader is given.
     """
     loader = Loader(stream)
     try:
@@ -73,10 +80,12 @@ def load(stream, Loader=Loader):
     finally:
         loader.dispose()
 
-def load_all(stream, Loader=Loader):
+def load_all(stream, Loader=SafeLoader):
     """
     Parse all YAML documents in a stream
     and produce corresponding Python objects.
+    Resolve only basic YAML tags, unless another
+    Loader is given.
     """
     loader = Loader(stream)
     try:
@@ -184,8 +193,12 @@ def dump_all(documents, stream=None, Dumper=Dumper,
             explicit_start=explicit_start, explicit_end=explicit_end)
     try:
         dumper.open()
+        # Simple documents are written directly by the emitter, see
+        # Emitter.emit_simple_document().
+        emit_simple_document = getattr(dumper, 'emit_simple_document', None)
         for data in documents:
-            dumper.represent(data)
+            if not (emit_simple_document and emit_simple_document(data)):
+                dumper.represent(data)
         dumper.close()
     finally:
         dumper.dispose()
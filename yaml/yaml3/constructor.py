@@ -1,6 +1,6 @@
 
-__all__ = ['BaseConstructor', 'SafeConstructor', 'Constructor',
-    'ConstructorError']
+__all__ = ['BaseConstructor', 'SafeConstructor', 'SafeFastConstructor',
+    'Constructor', 'ConstructorError']
 
 from .error import *
 from .nodes import *
@@ -464,6 +464,66 @@ SafeConstructor.add_constructor(
 SafeConstructor.add_constructor(None,
         SafeConstructor.construct_undefined)
 
+class SafeFastConstructor(SafeConstructor):
+    """
+    Faster SafeConstructor for plain configuration files. Maps, sequences,
+    strings, integers, floats, booleans and null are constructed in a
+    single recursive pass instead of going through construct_object()
+    and the generator-based state machinery, merge keys are resolved
+    with flatten_mapping(). All other tags are constructed by the
+    SafeConstructor constructors, so the result is the same as with
+    SafeConstructor.
+    """
+
+    fast_constructors = {}
+
+    def construct_document(self, node):
+        try:
+            return self.construct_fast_object(node)
+        finally:
+            self.constructed_objects = {}
+            self.recursive_objects = {}
+            self.state_generators = []
+            self.deep_construct = False
+
+    def construct_fast_object(self, node):
+        if node in self.constructed_objects:
+            return self.constructed_objects[node]
+        tag = node.tag
+        if tag == 'tag:yaml.org,2002:map' and isinstance(node, MappingNode):
+            data = {}
+            self.constructed_objects[node] = data
+            self.flatten_mapping(node)
+            for key_node, value_node in node.value:
+                key = self.construct_fast_object(key_node)
+                if not isinstance(key, collections.abc.Hashable):
+                    raise ConstructorError("while constructing a mapping", node.start_mark,
+                            "found unhashable key", key_node.start_mark)
+                data[key] = self.construct_fast_object(value_node)
+            return data
+        elif tag == 'tag:yaml.org,2002:seq' and isinstance(node, SequenceNode):
+            data = []
+            self.constructed_objects[node] = data
+            for child in node.value:
+                data.append(self.construct_fast_object(child))
+            return data
+        elif tag == 'tag:yaml.org,2002:str' and isinstance(node, ScalarNode):
+            data = node.value
+        elif tag in self.fast_constructors and isinstance(node, ScalarNode):
+            data = self.fast_constructors[tag](self, node)
+        else:
+            # everything else, including errors, is left to SafeConstructor
+            return self.construct_object(node, deep=True)
+        self.constructed_objects[node] = data
+        return data
+
+SafeFastConstructor.fast_constructors = {
+    'tag:yaml.org,2002:null': SafeConstructor.construct_yaml_null,
+    'tag:yaml.org,2002:bool': SafeConstructor.construct_yaml_bool,
+    'tag:yaml.org,2002:int': SafeConstructor.construct_yaml_int,
+    'tag:yaml.org,2002:float': SafeConstructor.construct_yaml_float,
+}
+
 class Constructor(SafeConstructor):
 
     def construct_python_str(self, node):
@@ -1,8 +1,67 @@
 
-__all__ = ['CBaseLoader', 'CSafeLoader', 'CLoader',
+__all__ = ['CBaseLoader', 'CSafeLoader', 'CSafeFastLoader', 'CLoader',
         'CBaseDumper', 'CSafeDumper', 'CDumper']
 
-from ._yaml import CParser, CEmitter
+def _load_libyaml():
+    """
+    Load the libyaml-based _yaml extension module of an installed PyYAML
+    package. The vendored yaml package doesn't include a compiled
+    extension, and the extension of the installed package can't be
+    imported by name, because the vendored yaml package shadows the
+    installed one. Only extensions of PyYAML versions which work with the
+    vendored Python modules, built for the running Python interpreter, are
+    accepted. Set FIPS_YAML_NO_LIBYAML=1 to use the pure Python modules.
+    """
+    import os, re, sys, types, importlib.util, importlib.machinery
+    if os.environ.get('FIPS_YAML_NO_LIBYAML'):
+        raise ImportError('libyaml disabled with FIPS_YAML_NO_LIBYAML')
+    try:
+        from importlib import metadata
+        dist = metadata.distribution('PyYAML')
+    except Exception:
+        raise ImportError('No installed PyYAML package')
+    version = tuple(int(v) for v in re.findall(r'\d+', dist.version)[:2])
+    if not ((3, 11) <= version < (7, 0)):
+        raise ImportError('PyYAML %s is not supported' % dist.version)
+    filenames = ['_yaml' + suffix for suffix in importlib.machinery.EXTENSION_SUFFIXES]
+    paths = [dist.locate_file(file) for file in (dist.files or [])
+             if file.parts[0] == 'yaml' and file.name in filenames]
+    if not paths:
+        raise ImportError('No _yaml extension module in PyYAML %s' % dist.version)
+
+    # the extension looks up the yaml submodules as attributes of the
+    # 'yaml' module while it is loaded, the vendored yaml package isn't
+    # fully initialized at this point, so it gets a separate module
+    # object with the vendored submodules instead
+    package = sys.modules[__name__.rsplit('.', 1)[0]]
+    yaml_module = types.ModuleType('yaml')
+    for submodule in ['error', 'tokens', 'events', 'nodes', 'reader', 'scanner',
+                      'parser', 'composer', 'constructor', 'resolver',
+                      'emitter', 'serializer', 'representer']:
+        setattr(yaml_module, submodule, getattr(package, submodule))
+    name = package.__name__ + '._yaml'
+    spec = importlib.util.spec_from_file_location(name, str(paths[0]))
+    module = importlib.util.module_from_spec(spec)
+    prev_yaml_module = sys.modules.get('yaml')
+    sys.modules['yaml'] = yaml_module
+    try:
+        spec.loader.exec_module(module)
+    except Exception as exc:
+        # libyaml is optional, fall back to the pure Python modules
+        raise ImportError('Failed to load %s: %s' % (paths[0], exc))
+    finally:
+        if prev_yaml_module is None:
+            del sys.modules['yaml']
+        else:
+            sys.modules['yaml'] = prev_yaml_module
+    sys.modules[name] = module
+    return module
+
+try:
+    from ._yaml import CParser, CEmitter
+except ImportError:
+    _libyaml = _load_libyaml()
+    CParser, CEmitter = _libyaml.CParser, _libyaml.CEmitter
 
 from .constructor import *
 
@@ -25,6 +84,13 @@ class CSafeLoader(CParser, SafeConstructor, Resolver):
         SafeConstructor.__init__(self)
         Resolver.__init__(self)
 
+class CSafeFastLoader(CParser, SafeFastConstructor, FastResolver):
+
+    def __init__(self, stream):
+        CParser.__init__(self, stream)
+        SafeFastConstructor.__init__(self)
+        FastResolver.__init__(self)
+
 class CLoader(CParser, Constructor, Resolver):
 
     def __init__(self, stream):
@@ -10,6 +10,10 @@ __all__ = ['Emitter', 'EmitterError']
 
 from .error import YAMLError
 from .events import *
+from .nodes import ScalarNode
+from .representer import SafeRepresenter
+
+import re
 
 class EmitterError(YAMLError):
     pass
@@ -417,6 +421,174 @@ class Emitter:
         self.states.append(self.expect_block_mapping_key)
         self.expect_node(mapping=True)
 
+    # Simple documents.
+
+    # Strings which are always written as plain scalars, unless the
+    # resolver detects a non-string tag like int or bool.
+    SIMPLE_PLAIN = re.compile('[0-9A-Za-z_/][0-9A-Za-z_./+-]*')
+
+    def emit_simple_document(self, data):
+        # A fast path of `represent(data)` for documents which are a list
+        # of scalars, or a dict with string keys and scalar or list of
+        # scalars values. Scalars are None, bools, ints and strings in
+        # SIMPLE_PLAIN. The output is written directly, without nodes,
+        # events and scalar analysis, and is the same as the output of
+        # the state machine. Returns False without writing anything if
+        # the document or the dumper settings don't qualify.
+        if self.state != self.expect_first_document_start or self.events    \
+                or not self.check_simple_dumper():
+            return False
+        if type(data) is list:
+            items = self.prepare_simple_sequence(data)
+            if items is None:
+                return False
+            flow = True
+        elif type(data) is dict:
+            items = []
+            lists = []
+            for key, value in data.items():
+                if type(key) is not str or len(key) >= 128:
+                    return False
+                key_text = self.prepare_simple_scalar(key)
+                if type(value) is list:
+                    value_text = self.prepare_simple_sequence(value)
+                    lists.append(id(value))
+                else:
+                    value_text = self.prepare_simple_scalar(value)
+                if key_text is None or value_text is None:
+                    return False
+                items.append((key_text, value_text))
+            # the same list twice would be written with an anchor and alias
+            if len(set(lists)) != len(lists):
+                return False
+            items.sort()
+            flow = not lists
+        else:
+            return False
+
+        # Mirror the writers: `column` is the current column, `whitespace`
+        # is True after a whitespace, a line break or an opening bracket.
+        chunks = []
+        column = self.column
+        whitespace = self.whitespace
+        line_break = self.best_line_break
+
+        def write_flow(open, items, close, indent):
+            # expect_flow_sequence() and expect_flow_mapping()
+            nonlocal column, whitespace
+            data = open if whitespace else ' '+open
+            chunks.append(data)
+            column += len(data)
+            whitespace = True
+            for index, item in enumerate(items):
+                if index:
+                    chunks.append(',')
+                    column += 1
+                    whitespace = False
+                if column > self.best_width:
+                    chunks.append(line_break+' '*indent)
+                    self.line += 1
+                    column = indent
+                    whitespace = True
+                write_item(item)
+            chunks.append(close)
+            column += 1
+            whitespace = False
+
+        def write_item(item):
+            nonlocal column, whitespace
+            if isinstance(item, tuple):
+                key, value = item
+                write_plain(key)
+                chunks.append(':')
+                column += 1
+                whitespace = False
+                write_plain(value)
+            else:
+                write_plain(item)
+
+        def write_plain(text):
+            nonlocal column, whitespace
+            if not whitespace:
+                text = ' '+text
+            chunks.append(text)
+            column += len(text)
+            whitespace = False
+
+        if flow:
+            write_flow('{' if type(data) is dict else '[', items,
+                    '}' if type(data) is dict else ']', self.best_indent)
+        else:
+            # expect_block_mapping() at the root level, indent is 0
+            for index, (key, value) in enumerate(items):
+                if index:
+                    chunks.append(line_break)
+                    self.line += 1
+                    column = 0
+                    whitespace = True
+                write_plain(key)
+                chunks.append(':')
+                column += 1
+                whitespace = False
+                if type(value) is list:
+                    write_flow('[', value, ']', self.best_indent)
+                else:
+                    write_plain(value)
+        # expect_document_end()
+        chunks.append(line_break)
+        self.line += 1
+        self.column = 0
+        self.whitespace = True
+        self.indention = True
+        data = ''.join(chunks)
+        if self.encoding:
+            data = data.encode(self.encoding)
+        self.stream.write(data)
+        self.flush_stream()
+        self.state = self.expect_document_start
+        return True
+
+    def check_simple_dumper(self):
+        # The emitter must be part of a Dumper with the standard
+        # representers for the simple types and default settings.
+        if self.canonical or self.default_style    \
+                or self.default_flow_style is not None  \
+                or self.use_explicit_start or self.use_explicit_end \
+                or self.use_version or self.use_tags  \
+                or self.yaml_path_resolvers:
+            return False
+        for data_type in [type(None), bool, int, str, list, dict]:
+            if self.yaml_representers.get(data_type)  \
+                    is not SafeRepresenter.yaml_representers[data_type]:
+                return False
+        return True
+
+    def prepare_simple_sequence(self, data):
+        items = []
+        for item in data:
+            text = self.prepare_simple_scalar(item)
+            if text is None:
+                return None
+            items.append(text)
+        return items
+
+    def prepare_simple_scalar(self, data):
+        # Return the text of a scalar if it is written as an untagged plain
+        # scalar, otherwise None.
+        if data is None:
+            text, tag = 'null', 'tag:yaml.org,2002:null'
+        elif type(data) is bool:
+            text, tag = ('true' if data else 'false'), 'tag:yaml.org,2002:bool'
+        elif type(data) is int:
+            text, tag = str(data), 'tag:yaml.org,2002:int'
+        elif type(data) is str and self.SIMPLE_PLAIN.fullmatch(data):
+            text, tag = data, 'tag:yaml.org,2002:str'
+        else:
+            return None
+        if self.resolve(ScalarNode, text, (True, False)) != tag:
+            return None
+        return text
+
     # Checkers.
 
     def check_empty_sequence(self):
@@ -54,7 +54,8 @@ class Reader(object):
     #  - a file-like object with its `read` method returning `str`,
     #  - a file-like object with its `read` method returning `unicode`.
 
-    # Yeah, it's ugly and slow.
+    # The buffer is consumed by advancing `pointer`, the consumed part is
+    # only dropped when update() decodes the next chunk of the stream.
 
     def __init__(self, stream):
         self.name = None
@@ -99,7 +100,8 @@ class Reader(object):
     def forward(self, length=1):
         if self.pointer+length+1 >= len(self.buffer):
             self.update(length+1)
-        while length:
+        if length == 1:
+            # the common case, same as the original per-character loop
             ch = self.buffer[self.pointer]
             self.pointer += 1
             self.index += 1
@@ -109,7 +111,29 @@ class Reader(object):
                 self.column = 0
             elif ch != '\uFEFF':
                 self.column += 1
-            length -= 1
+            return
+        buffer = self.buffer
+        pointer = self.pointer
+        end = pointer+length
+        self.pointer = end
+        self.index += length
+        if self.LINE_BREAK_OR_BOM.search(buffer, pointer, end) is None:
+            # no line breaks in the skipped characters, only the column moves
+            self.column += length
+        else:
+            line = self.line
+            column = self.column
+            while pointer < end:
+                ch = buffer[pointer]
+                pointer += 1
+                if ch in '\n\x85\u2028\u2029'  \
+                        or (ch == '\r' and buffer[pointer] != '\n'):
+                    line += 1
+                    column = 0
+                elif ch != '\uFEFF':
+                    column += 1
+            self.line = line
+            self.column = column
 
     def get_mark(self):
         if self.stream is None:
@@ -134,21 +158,29 @@ class Reader(object):
                 self.encoding = 'utf-8'
         self.update(1)
 
+    LINE_BREAK_OR_BOM = re.compile('[\n\r\x85\u2028\u2029\uFEFF]')
     NON_PRINTABLE = re.compile('[^\x09\x0A\x0D\x20-\x7E\x85\xA0-\uD7FF\uE000-\uFFFD]')
-    def check_printable(self, data):
+    PRINTABLE_ASCII = b'\x09\x0A\x0D' + bytes(range(0x20, 0x7F))
+    def check_printable(self, data, offset=0):
+        # Fast path for pure ASCII data: deleting all printable characters
+        # with bytes.translate() is much cheaper than the regex search.
+        if data.isascii() and not data.encode('ascii').translate(None, self.PRINTABLE_ASCII):
+            return
         match = self.NON_PRINTABLE.search(data)
         if match:
             character = match.group()
-            position = self.index+(len(self.buffer)-self.pointer)+match.start()
+            position = self.index+offset+match.start()
             raise ReaderError(self.name, position, ord(character),
                     'unicode', "special characters are not allowed")
 
     def update(self, length):
         if self.raw_buffer is None:
             return
-        self.buffer = self.buffer[self.pointer:]
-        self.pointer = 0
-        while len(self.buffer) < length:
+        # The buffer is only compacted here, the consumed characters and
+        # the newly decoded data are joined with a single copy.
+        chunks = []
+        size = len(self.buffer)-self.pointer
+        while size < length:
             if not self.eof:
                 self.update_raw()
             if self.raw_decode is not None:
@@ -166,15 +198,20 @@ class Reader(object):
             else:
                 data = self.raw_buffer
                 converted = len(data)
-            self.check_printable(data)
-            self.buffer += data
+            self.check_printable(data, size)
+            chunks.append(data)
+            size += len(data)
             self.raw_buffer = self.raw_buffer[converted:]
             if self.eof:
-                self.buffer += '\0'
+                chunks.append('\0')
                 self.raw_buffer = None
                 break
+        if chunks:
+            chunks.insert(0, self.buffer[self.pointer:])
+            self.buffer = ''.join(chunks)
+            self.pointer = 0
 
-    def update_raw(self, size=4096):
+    def update_raw(self, size=65536):
         data = self.stream.read(size)
         if self.raw_buffer is None:
             self.raw_buffer = data
@@ -1,5 +1,5 @@
 
-__all__ = ['BaseResolver', 'Resolver']
+__all__ = ['BaseResolver', 'Resolver', 'FastResolver']
 
 from .error import *
 from .nodes import *
@@ -222,3 +222,65 @@ Resolver.add_implicit_resolver(
         re.compile(r'^(?:!|&|\*)$'),
         list('!&*'))
 
+class FastResolver(BaseResolver):
+    """
+    Faster Resolver for plain configuration files, resolves the same
+    implicit tags as Resolver. The implicit resolvers of Resolver are
+    precompiled into a single regular expression per first character,
+    resolved tags are cached by scalar value, and path resolvers are not
+    supported.
+    """
+
+    fast_implicit_resolvers = {}
+    fast_implicit_cache = {}
+    fast_implicit_cache_size = 4096
+
+    @classmethod
+    def compile_implicit_resolvers(cls, implicit_resolvers):
+        # All resolvers are compiled with re.X, the first matching
+        # alternative wins, as in BaseResolver.resolve().
+        cls.fast_implicit_resolvers = {}
+        cls.fast_implicit_cache = {}
+        for first, resolvers in implicit_resolvers.items():
+            if first is None:
+                continue
+            resolvers = resolvers + implicit_resolvers.get(None, [])
+            patterns = []
+            tags = {}
+            for tag, regexp in resolvers:
+                name = 't%d' % len(patterns)
+                patterns.append('(?P<%s>%s)' % (name, regexp.pattern))
+                tags[name] = tag
+            if patterns:
+                cls.fast_implicit_resolvers[first] = \
+                        (re.compile('|'.join(patterns), re.X), tags)
+
+    def descend_resolver(self, current_node, current_index):
+        pass
+
+    def ascend_resolver(self):
+        pass
+
+    def resolve(self, kind, value, implicit):
+        if kind is ScalarNode:
+            if not implicit[0]:
+                return self.DEFAULT_SCALAR_TAG
+            cache = self.fast_implicit_cache
+            tag = cache.get(value)
+            if tag is None:
+                tag = self.DEFAULT_SCALAR_TAG
+                resolver = self.fast_implicit_resolvers.get(value[:1])
+                if resolver is not None:
+                    match = resolver[0].match(value)
+                    if match:
+                        tag = resolver[1][match.lastgroup]
+                if len(cache) >= self.fast_implicit_cache_size:
+                    cache.clear()
+                cache[value] = tag
+            return tag
+        elif kind is SequenceNode:
+            return self.DEFAULT_SEQUENCE_TAG
+        elif kind is MappingNode:
+            return self.DEFAULT_MAPPING_TAG
+
+FastResolver.compile_implicit_resolvers(Resolver.yaml_implicit_resolvers)
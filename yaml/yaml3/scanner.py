@@ -29,6 +29,32 @@ __all__ = ['Scanner', 'ScannerError']
 from .error import MarkedYAMLError
 from .tokens import *
 
+import re
+
+# Character classes of the checkers, precomputed as sets.
+BLANK_OR_BREAK = frozenset('\0 \t\r\n\x85\u2028\u2029')
+NOT_PLAIN_START = frozenset('\0 \t\r\n\x85\u2028\u2029-?:,[]{}#&*!|>\'\"%@`')
+
+# Runs of characters which the scanners skip or consume in bulk, see
+# Scanner.match_run(). None of them matches the terminating '\0'.
+SPACES = re.compile(' *')
+SPACES_OR_TABS = re.compile('[ \t]*')
+NON_BREAKS = re.compile('[^\0\r\n\x85\u2028\u2029]*')
+# Quoted scalars are consumed up to the next quote, escape or line break,
+# spaces before a line break are left to scan_flow_scalar_spaces().
+SINGLE_QUOTED_LINE = re.compile('(?:[ \t]*[^\'\0 \t\r\n\x85\u2028\u2029])*')
+DOUBLE_QUOTED_LINE = re.compile('(?:[ \t]*[^\"\\\\\0 \t\r\n\x85\u2028\u2029])*')
+# Plain scalars are consumed up to the end of the line at once: words
+# separated by spaces, but not by ' #' which starts a comment. A word in
+# the block context ends with a blank, a break, or a ':' followed by a
+# blank or a break, in the flow context also with ',', ':', '?' or brackets.
+BLOCK_PLAIN_WORD = '[^\0 \t\r\n\x85\u2028\u2029:]*(?::(?![\0 \t\r\n\x85\u2028\u2029])[^\0 \t\r\n\x85\u2028\u2029:]*)*'
+BLOCK_PLAIN_LINE = re.compile(BLOCK_PLAIN_WORD +
+        '(?: +(?=[^#\0 \t\r\n\x85\u2028\u2029:]|:(?![\0 \t\r\n\x85\u2028\u2029]))' + BLOCK_PLAIN_WORD + ')*')
+FLOW_PLAIN_WORD = '[^\0 \t\r\n\x85\u2028\u2029,:?\\[\\]{}]*'
+FLOW_PLAIN_LINE = re.compile(FLOW_PLAIN_WORD +
+        '(?: +(?=[^#\0 \t\r\n\x85\u2028\u2029,:?\\[\\]{}])' + FLOW_PLAIN_WORD + ')*')
+
 class ScannerError(MarkedYAMLError):
     pass
 
@@ -139,6 +165,17 @@ class Scanner:
 
     # Private methods.
 
+    def match_run(self, regexp, index=0):
+        # Return the length of the run of characters matched by `regexp`
+        # starting at `self.peek(index)`. The run is matched directly in the
+        # reader buffer, which is extended if the run reaches its end.
+        while True:
+            start = self.pointer+index
+            end = regexp.match(self.buffer, start).end()
+            if end < len(self.buffer):
+                return end-start
+            self.update(end-self.pointer+1)
+
     def need_more_tokens(self):
         if self.done:
             return False
@@ -181,6 +218,11 @@ class Scanner:
         if ch == '.' and self.check_document_end():
             return self.fetch_document_end()
 
+        # Plain scalars are the most common tokens, and most of them start
+        # with a character which can't start any other token.
+        if ch not in NOT_PLAIN_START:
+            return self.fetch_plain()
+
         # TODO: support for BOM within a stream.
         #if ch == '\uFEFF':
         #    return self.fetch_bom()    <-- issue BOMToken
@@ -267,8 +309,7 @@ class Scanner:
         #   return self.possible_simple_keys[
         #           min(self.possible_simple_keys.keys())].token_number
         min_token_number = None
-        for level in self.possible_simple_keys:
-            key = self.possible_simple_keys[level]
+        for key in self.possible_simple_keys.values():
             if min_token_number is None or key.token_number < min_token_number:
                 min_token_number = key.token_number
         return min_token_number
@@ -280,6 +321,8 @@ class Scanner:
         # - should be no longer than 1024 characters.
         # Disabling this procedure will allow simple keys of any length and
         # height (may cause problems if indentation is broken though).
+        if not self.possible_simple_keys:
+            return
         for level in list(self.possible_simple_keys):
             key = self.possible_simple_keys[level]
             if key.line != self.line  \
@@ -693,7 +736,7 @@ class Scanner:
         # DOCUMENT-START:   ^ '---' (' '|'\n')
         if self.column == 0:
             if self.prefix(3) == '---'  \
-                    and self.peek(3) in '\0 \t\r\n\x85\u2028\u2029':
+                    and self.peek(3) in BLANK_OR_BREAK:
                 return True
 
     def check_document_end(self):
@@ -701,13 +744,13 @@ class Scanner:
         # DOCUMENT-END:     ^ '...' (' '|'\n')
         if self.column == 0:
             if self.prefix(3) == '...'  \
-                    and self.peek(3) in '\0 \t\r\n\x85\u2028\u2029':
+                    and self.peek(3) in BLANK_OR_BREAK:
                 return True
 
     def check_block_entry(self):
 
         # BLOCK-ENTRY:      '-' (' '|'\n')
-        return self.peek(1) in '\0 \t\r\n\x85\u2028\u2029'
+        return self.peek(1) in BLANK_OR_BREAK
 
     def check_key(self):
 
@@ -717,7 +760,7 @@ class Scanner:
 
         # KEY(block context):   '?' (' '|'\n')
         else:
-            return self.peek(1) in '\0 \t\r\n\x85\u2028\u2029'
+            return self.peek(1) in BLANK_OR_BREAK
 
     def check_value(self):
 
@@ -727,7 +770,7 @@ class Scanner:
 
         # VALUE(block context): ':' (' '|'\n')
         else:
-            return self.peek(1) in '\0 \t\r\n\x85\u2028\u2029'
+            return self.peek(1) in BLANK_OR_BREAK
 
     def check_plain(self):
 
@@ -744,8 +787,8 @@ class Scanner:
         # '-' character) because we want the flow context to be space
         # independent.
         ch = self.peek()
-        return ch not in '\0 \t\r\n\x85\u2028\u2029-?:,[]{}#&*!|>\'\"%@`'  \
-                or (self.peek(1) not in '\0 \t\r\n\x85\u2028\u2029'
+        return ch not in NOT_PLAIN_START  \
+                or (self.peek(1) not in BLANK_OR_BREAK
                         and (ch == '-' or (not self.flow_level and ch in '?:')))
 
     # Scanners.
@@ -774,11 +817,10 @@ class Scanner:
             self.forward()
         found = False
         while not found:
-            while self.peek() == ' ':
-                self.forward()
+            if self.peek() == ' ':
+                self.forward(self.match_run(SPACES))
             if self.peek() == '#':
-                while self.peek() not in '\0\r\n\x85\u2028\u2029':
-                    self.forward()
+                self.forward(self.match_run(NON_BREAKS))
             if self.scan_line_break():
                 if not self.flow_level:
                     self.allow_simple_key = True
@@ -1185,10 +1227,12 @@ class Scanner:
     def scan_flow_scalar_non_spaces(self, double, start_mark):
         # See the specification for details.
         chunks = []
+        if double:
+            quoted_line = DOUBLE_QUOTED_LINE
+        else:
+            quoted_line = SINGLE_QUOTED_LINE
         while True:
-            length = 0
-            while self.peek(length) not in '\'\"\\\0 \t\r\n\x85\u2028\u2029':
-                length += 1
+            length = self.match_run(quoted_line)
             if length:
                 chunks.append(self.prefix(length))
                 self.forward(length)
@@ -1228,9 +1272,7 @@ class Scanner:
     def scan_flow_scalar_spaces(self, double, start_mark):
         # See the specification for details.
         chunks = []
-        length = 0
-        while self.peek(length) in ' \t':
-            length += 1
+        length = self.match_run(SPACES_OR_TABS)
         whitespaces = self.prefix(length)
         self.forward(length)
         ch = self.peek()
@@ -1260,8 +1302,8 @@ class Scanner:
                     and self.peek(3) in '\0 \t\r\n\x85\u2028\u2029':
                 raise ScannerError("while scanning a quoted scalar", start_mark,
                         "found unexpected document separator", self.get_mark())
-            while self.peek() in ' \t':
-                self.forward()
+            if self.peek() in ' \t':
+                self.forward(self.match_run(SPACES_OR_TABS))
             if self.peek() in '\r\n\x85\u2028\u2029':
                 chunks.append(self.scan_line_break())
             else:
@@ -1282,18 +1324,15 @@ class Scanner:
         #if indent == 0:
         #    indent = 1
         spaces = []
+        if self.flow_level:
+            plain_line = FLOW_PLAIN_LINE
+        else:
+            plain_line = BLOCK_PLAIN_LINE
         while True:
-            length = 0
             if self.peek() == '#':
                 break
-            while True:
-                ch = self.peek(length)
-                if ch in '\0 \t\r\n\x85\u2028\u2029'    \
-                        or (not self.flow_level and ch == ':' and
-                                self.peek(length+1) in '\0 \t\r\n\x85\u2028\u2029') \
-                        or (self.flow_level and ch in ',:?[]{}'):
-                    break
-                length += 1
+            length = self.match_run(plain_line)
+            ch = self.peek(length)
             # It's not clear what we should do with ':' in the flow context.
             if (self.flow_level and ch == ':'
                     and self.peek(length+1) not in '\0 \t\r\n\x85\u2028\u2029,[]{}'):
@@ -1320,8 +1359,8 @@ class Scanner:
         # We just forbid them completely. Do not use tabs in YAML!
         chunks = []
         length = 0
-        while self.peek(length) in ' ':
-            length += 1
+        if self.peek() == ' ':
+            length = self.match_run(SPACES)
         whitespaces = self.prefix(length)
         self.forward(length)
         ch = self.peek()
@@ -1335,7 +1374,7 @@ class Scanner:
             breaks = []
             while self.peek() in ' \r\n\x85\u2028\u2029':
                 if self.peek() == ' ':
-                    self.forward()
+                    self.forward(self.match_run(SPACES))
                 else:
                     breaks.append(self.scan_line_break())
                     prefix = self.prefix(3)